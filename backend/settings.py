@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,7 +45,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "tasks.middleware.ProfilingMiddleware",
+    "tasks.middleware.RequestTimingMiddleware",
+    "tasks.middleware.CompressionMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "tasks.middleware.QueryProfilerMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -136,3 +142,64 @@ CORS_ALLOWED_ORIGINS = [
 
 # Allow credentials (cookies, authorization headers)
 CORS_ALLOW_CREDENTIALS = True
+
+# X-Workspace selects the workspace a request works in (tasks.workspaces)
+CORS_ALLOW_HEADERS = (*default_headers, 'x-workspace')
+
+# Per-request phase timings (Server-Timing header + Prometheus histograms at /metrics).
+# Opt-in: the header exposes internal timings to every client. When False the
+# timing middleware removes itself, view hooks become no-ops and /metrics is a 404.
+TASKS_METRICS_ENABLED = False
+# Client addresses allowed to scrape /metrics (REMOTE_ADDR; list the proxy's
+# address when the scraper connects through one).
+TASKS_METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]
+
+# Query profiler: X-Query-Count / X-Query-Time-Ms / X-Query-N-Plus-One headers,
+# slow-query logging with the originating line and N+1 detection. Opt-in.
+TASKS_QUERY_PROFILER_ENABLED = False
+TASKS_SLOW_QUERY_MS = 100
+TASKS_N_PLUS_ONE_THRESHOLD = 5
+
+# On-demand request profiling: send "X-Profile: cpu|memory|all" with
+# "X-Profile-Token: <token>" to capture one request. Disabled while unset.
+# Memory captures (process-wide tracemalloc) only run with DEBUG = True.
+TASKS_PROFILING_TOKEN = None
+TASKS_PROFILE_DIR = BASE_DIR / "profiles"
+TASKS_PROFILE_KEEP = 50
+
+# Response compression (gzip, or zstd when a zstd module is installed) negotiated
+# from Accept-Encoding, and gzip request bodies (Content-Encoding: gzip).
+# Decompressed request bodies above the cap are rejected with 413.
+TASKS_COMPRESSION_ENABLED = True
+TASKS_COMPRESS_MIN_BYTES = 1024
+TASKS_GZIP_LEVEL = 6
+TASKS_ZSTD_LEVEL = 3
+TASKS_MAX_DECOMPRESSED_BYTES = 50 * 1024 * 1024
+
+# Seconds a /plan/ result stays cached. Plans are keyed by the task table
+# version, so any write makes a fresh plan; this only bounds memory use.
+TASKS_PLAN_CACHE_TIMEOUT = 3600
+
+# Most operations one /batch/ request may carry.
+TASKS_BATCH_MAX_OPERATIONS = 100
+
+# Most task IDs one /bulk-delete/ request may carry.
+TASKS_BULK_DELETE_MAX_IDS = 10000
+
+# The task admin counts changelist rows exactly up to this many; above it, it
+# shows an estimate instead of running COUNT(*) over the whole table.
+TASKS_ADMIN_EXACT_COUNT_LIMIT = 10000
+
+# /search/ ranks at most this many title matches (bm25 is computed per match,
+# so this bounds the cost of very common words and one-letter prefixes).
+TASKS_SEARCH_MAX_CANDIDATES = 1000
+
+# Duplicate detection (tasks.dedupe). /save-analysis/ saves duplicates of
+# stored or earlier tasks and reports them; requests may send "merge" to skip
+# them or "off". The threshold is the trigram Jaccard similarity for near mode.
+TASKS_DEDUPE_ON_SAVE = "flag"
+TASKS_DEDUPE_THRESHOLD = 0.8
+
+# Most workspaces whose task snapshots stay in memory per process; the least
+# recently used one is dropped (and reloaded on its next request) past this.
+TASKS_SNAPSHOT_MAX_WORKSPACES = 32
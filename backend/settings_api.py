@@ -0,0 +1,48 @@
+"""
+API-only settings profile for production workers.
+
+Serves only the /api/tasks/ endpoints and /metrics. Admin, sessions,
+messages, auth, CSRF and the template engine are left out: the API views
+don't use them, and each one adds import time at worker boot and a
+middleware hop to every request.
+
+Use it with:
+    DJANGO_SETTINGS_MODULE=backend.settings_api gunicorn backend.wsgi
+
+The admin site and browsable API remain available under the default
+`backend.settings`.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    "corsheaders",
+    "rest_framework",
+    "tasks",
+]
+
+MIDDLEWARE = [
+    "tasks.middleware.ProfilingMiddleware",
+    "tasks.middleware.RequestTimingMiddleware",
+    "tasks.middleware.CompressionMiddleware",
+    "tasks.middleware.QueryProfilerMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+ROOT_URLCONF = "backend.urls_api"
+
+# No HTML is rendered: DRF only speaks JSON and errors use Django's built-in pages
+TEMPLATES = []
+
+AUTH_PASSWORD_VALIDATORS = []
+
+REST_FRAMEWORK = {
+    # JSON only, so the browsable API (and its templates) is never loaded
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+    "DEFAULT_PARSER_CLASSES": ["rest_framework.parsers.JSONParser"],
+    # No auth app: skip session/basic authentication and the AnonymousUser model
+    "DEFAULT_AUTHENTICATION_CLASSES": [],
+    "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.AllowAny"],
+    "UNAUTHENTICATED_USER": None,
+}
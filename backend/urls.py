@@ -16,8 +16,10 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from tasks.views import metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/tasks/", include("tasks.urls")),
+    path("metrics", metrics, name="metrics"),
 ]
@@ -0,0 +1,12 @@
+"""
+URL configuration for the API-only settings profile (backend.settings_api).
+
+Same routes as backend.urls, minus the admin site.
+"""
+from django.urls import path, include
+from tasks.views import metrics
+
+urlpatterns = [
+    path("api/tasks/", include("tasks.urls")),
+    path("metrics", metrics, name="metrics"),
+]
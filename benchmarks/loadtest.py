@@ -0,0 +1,243 @@
+#!/usr/bin/env python
+"""
+Task Analyzer - Load Generator
+Drives the API with concurrent clients to measure capacity of a deployment.
+
+Usage:
+    python benchmarks/loadtest.py
+    python benchmarks/loadtest.py --concurrency 32 --duration 60 --payload-size 200
+    python benchmarks/loadtest.py --mix analyze=5,suggest=3,list=1 --output load.json
+
+Each worker thread keeps one persistent HTTP/1.1 connection and picks
+endpoints according to --mix. Throughput, latency percentiles and error
+rates are printed every --interval seconds and summarised per endpoint at
+the end. Only the standard library is used.
+"""
+
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+DEFAULT_MIX = "analyze=4,suggest=3,list=1,save=1,stored=1"
+
+
+def print_header(title):
+    print(f"\n{'=' * 72}")
+    print(f"{title:^72}")
+    print(f"{'=' * 72}\n")
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
+
+
+def parse_mix(value):
+    """Parses "analyze=4,suggest=3" into {"analyze": 4, "suggest": 3}."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def make_tasks(count, rng):
+    today = date.today()
+    return [
+        {
+            "title": f"Load test task {i}",
+            "due_date": str(today + timedelta(days=rng.randint(-10, 30))),
+            "importance": rng.randint(1, 10),
+            "estimated_hours": rng.randint(1, 8),
+            "dependencies": [],
+        }
+        for i in range(count)
+    ]
+
+
+# Endpoint name -> (method, path, body factory)
+ENDPOINTS = {
+    "analyze": ("POST", "/analyze/", lambda tasks: {"tasks": tasks}),
+    "stored": ("POST", "/analyze/", lambda tasks: {"filter": {"min_importance": 7}}),
+    "suggest": ("GET", "/suggest/", None),
+    "list": ("GET", "/list/", None),
+    "save": ("POST", "/save-analysis/", lambda tasks: {"tasks": tasks}),
+}
+
+
+class Recorder:
+    """Collects (endpoint, latency, ok) samples from all workers."""
+
+    def __init__(self):
+        self.interval = deque()
+        self.samples = []
+        self.lock = threading.Lock()
+
+    def record(self, endpoint, latency, ok):
+        # deque.append is atomic, so workers never block on each other here
+        self.interval.append((endpoint, latency, ok))
+
+    def drain(self):
+        batch = []
+        while self.interval:
+            batch.append(self.interval.popleft())
+        with self.lock:
+            self.samples.extend(batch)
+        return batch
+
+
+def worker(base, mix, bodies, recorder, stop, timeout, seed):
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    connection = None
+
+    while not stop.is_set():
+        name = rng.choices(names, weights)[0]
+        method, path, _ = ENDPOINTS[name]
+        body = bodies.get(name)
+        headers = {"Content-Type": "application/json"} if body else {}
+
+        start = time.perf_counter()
+        try:
+            if connection is None:
+                connection = base["connection_class"](base["host"], base["port"], timeout=timeout)
+            connection.request(method, base["prefix"] + path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            ok = response.status < 400
+            if response.getheader("Connection", "").lower() == "close":
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException):
+            ok = False
+            if connection is not None:
+                connection.close()
+            connection = None
+        recorder.record(name, time.perf_counter() - start, ok)
+
+    if connection is not None:
+        connection.close()
+
+
+def report_interval(elapsed, batch, interval):
+    latencies = [latency for _, latency, _ in batch]
+    errors = sum(1 for _, _, ok in batch if not ok)
+    rate = len(batch) / interval if interval else 0
+    print(f"  {elapsed:>6.0f}s  {rate:>9.1f} req/s   p50 {percentile(latencies, 50) * 1000:>8.2f} ms   "
+          f"p95 {percentile(latencies, 95) * 1000:>8.2f} ms   p99 {percentile(latencies, 99) * 1000:>8.2f} ms   "
+          f"errors {errors / len(batch) * 100 if batch else 0:>5.1f}%")
+
+
+def summarize(samples, duration):
+    summary = {}
+    for name in sorted({name for name, _, _ in samples}):
+        latencies = [latency for n, latency, _ in samples if n == name]
+        errors = sum(1 for n, _, ok in samples if n == name and not ok)
+        summary[name] = {
+            "requests": len(latencies),
+            "throughput": len(latencies) / duration,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "error_rate": errors / len(latencies),
+        }
+    latencies = [latency for _, latency, _ in samples]
+    summary["total"] = {
+        "requests": len(samples),
+        "throughput": len(samples) / duration,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "error_rate": (sum(1 for _, _, ok in samples if not ok) / len(samples)) if samples else 0.0,
+    }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task Analyzer load generator")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000/api/tasks")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client threads")
+    parser.add_argument("--duration", type=float, default=30.0, help="Test length in seconds")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Weighted endpoint mix (default {DEFAULT_MIX})")
+    parser.add_argument("--payload-size", type=int, default=50, help="Tasks per analyze/save request")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between progress lines")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the final summary as JSON to this file")
+    args = parser.parse_args()
+
+    url = urlsplit(args.base_url)
+    base = {
+        "connection_class": http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection,
+        "host": url.hostname,
+        "port": url.port,
+        "prefix": url.path.rstrip("/"),
+    }
+    tasks = make_tasks(args.payload_size, random.Random(args.seed))
+    bodies = {
+        name: json.dumps(factory(tasks)).encode()
+        for name, (_, _, factory) in ENDPOINTS.items() if factory
+    }
+
+    print_header(f"Load test: {args.concurrency} clients for {args.duration:.0f}s against {args.base_url}")
+    recorder = Recorder()
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(base, args.mix, bodies, recorder, stop, args.timeout, args.seed + i),
+            daemon=True,
+        )
+        for i in range(args.concurrency)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    try:
+        deadline = started + args.duration
+        while time.perf_counter() < deadline:
+            time.sleep(min(args.interval, max(0.0, deadline - time.perf_counter())))
+            report_interval(time.perf_counter() - started, recorder.drain(), args.interval)
+    except KeyboardInterrupt:
+        print("\n  Interrupted, stopping clients...")
+    stop.set()
+    for thread in threads:
+        thread.join()
+    recorder.drain()
+    duration = time.perf_counter() - started
+
+    summary = summarize(recorder.samples, duration)
+    print_header("Summary")
+    for name, stats in summary.items():
+        print(f"  {name:<8} {stats['requests']:>8} req  {stats['throughput']:>9.1f} req/s   "
+              f"p50 {stats['p50_ms']:>8.2f} ms   p95 {stats['p95_ms']:>8.2f} ms   "
+              f"p99 {stats['p99_ms']:>8.2f} ms   errors {stats['error_rate'] * 100:>5.1f}%")
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump({"config": {k: v for k, v in vars(args).items() if k != "mix"} | {"mix": args.mix},
+                       "summary": summary}, handle, indent=2)
+        print(f"\nSummary written to {args.output}")
+
+    return summary["total"]["error_rate"] == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
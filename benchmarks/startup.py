@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Task Analyzer - Startup & Request Overhead Benchmark
+Compares worker boot time and per-request framework overhead between
+settings profiles (by default backend.settings and backend.settings_api).
+
+Usage:
+    python benchmarks/startup.py
+    python benchmarks/startup.py --boots 20 --requests 2000
+    python benchmarks/startup.py --settings backend.settings_api
+
+Boot time is measured in a fresh interpreter per run: django.setup(), WSGI
+application creation and the first request (which loads middleware and
+URLconf). Per-request overhead is the mean latency of a cheap request
+(GET /api/tasks/suggest/ on an empty table) through the full middleware stack.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PROFILES = ["backend.settings", "backend.settings_api"]
+
+# Runs inside a fresh interpreter; prints one JSON line
+BOOT_PROBE = """
+import json, os, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+setup_done = time.perf_counter()
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.conf import settings
+settings.ALLOWED_HOSTS = ["*"]
+setup_test_environment()
+connection.creation.create_test_db(verbosity=0)
+
+client = Client()
+first = time.perf_counter()
+client.get("/api/tasks/suggest/")
+first_done = time.perf_counter()
+
+requests = int(sys.argv[1])
+latencies = []
+for _ in range(requests):
+    t = time.perf_counter()
+    client.get("/api/tasks/suggest/")
+    latencies.append(time.perf_counter() - t)
+
+print(json.dumps({
+    "setup_ms": (setup_done - start) * 1000,
+    "first_request_ms": (first_done - first) * 1000,
+    "modules": len(sys.modules),
+    "request_us": [l * 1e6 for l in latencies],
+}))
+"""
+
+
+def print_header(title):
+    print(f"\n{'=' * 72}")
+    print(f"{title:^72}")
+    print(f"{'=' * 72}\n")
+
+
+def run_probe(settings_module, requests):
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+    result = subprocess.run(
+        [sys.executable, "-c", BOOT_PROBE, str(requests)],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def bench_profile(settings_module, boots, requests):
+    boot = [run_probe(settings_module, 0) for _ in range(boots)]
+    overhead = run_probe(settings_module, requests)
+    setup_ms = [run["setup_ms"] for run in boot]
+    first_ms = [run["first_request_ms"] for run in boot]
+    request_us = overhead["request_us"]
+    return {
+        "settings": settings_module,
+        "setup_ms_median": statistics.median(setup_ms),
+        "first_request_ms_median": statistics.median(first_ms),
+        "boot_ms_median": statistics.median(s + f for s, f in zip(setup_ms, first_ms)),
+        "modules_loaded": boot[0]["modules"],
+        "request_us_mean": statistics.fmean(request_us) if request_us else None,
+        "request_us_median": statistics.median(request_us) if request_us else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare worker boot time and request overhead")
+    parser.add_argument("--settings", nargs="+", default=DEFAULT_PROFILES,
+                        help="Settings modules to compare")
+    parser.add_argument("--boots", type=int, default=10, help="Fresh-interpreter boots per profile")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests timed per profile")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    print_header("Startup & Request Overhead")
+    results = []
+    for settings_module in args.settings:
+        result = bench_profile(settings_module, args.boots, args.requests)
+        results.append(result)
+        print(f"  {settings_module:<24} boot {result['boot_ms_median']:>7.1f} ms "
+              f"(setup {result['setup_ms_median']:.1f} + first request {result['first_request_ms_median']:.1f})   "
+              f"{result['modules_loaded']:>4} modules   "
+              f"request {result['request_us_median'] or 0:>7.1f} us median")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Frontend build step for the Task Analyzer
+
+Minifies frontend/scripts.js and frontend/styles.css, writes them under
+content-hashed names (scripts.<hash>.js) to frontend/dist/, rewrites the
+references in index.html and emits dist/manifest.json:
+
+    {"scripts.js": "scripts.1a2b3c4d5e.js", "styles.css": "styles.6f7a8b9c0d.css"}
+
+serve_frontend.py serves frontend/dist/ when it exists and marks every
+hashed file from the manifest as immutable, so repeat page loads only
+revalidate index.html.
+
+Usage:
+    python build_frontend.py
+    python build_frontend.py --out /tmp/dist
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent
+FRONTEND_DIR = REPO_DIR / "frontend"
+DIST_DIR = FRONTEND_DIR / "dist"
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 10
+
+# Characters after which a "/" starts a regular expression rather than a division
+REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_KEYWORDS = ("return", "typeof", "case", "do", "else", "in", "of", "void", "throw", "new", "delete")
+
+
+def minify_js(source):
+    """
+    Conservative JavaScript minifier.
+
+    Strips comments and indentation and drops blank lines, but keeps line
+    breaks so automatic semicolon insertion behaves exactly as before.
+    Strings, template literals and regular expression literals are copied
+    untouched.
+    """
+    out = []
+    i = 0
+    length = len(source)
+    template_depth = []  # brace depth of each open ${ ... } inside template literals
+    brace_depth = 0
+
+    def last_significant():
+        return "".join(out[-40:]).rstrip()
+
+    while i < length:
+        char = source[i]
+        nxt = source[i + 1] if i + 1 < length else ""
+
+        if char in "'\"":
+            end = i + 1
+            while end < length and source[end] != char:
+                end += 2 if source[end] == "\\" else 1
+            out.append(source[i:end + 1])
+            i = end + 1
+        elif char == "`" or (char == "}" and template_depth and template_depth[-1] == brace_depth):
+            # Start of a template literal, or the end of a ${ ... } inside one
+            if char == "}":
+                template_depth.pop()
+            end = i + 1
+            while end < length and source[end] != "`":
+                if source[end] == "\\":
+                    end += 2
+                    continue
+                if source.startswith("${", end):
+                    template_depth.append(brace_depth)
+                    end += 2
+                    break
+                end += 1
+            else:
+                end += 1
+            out.append(source[i:end])
+            i = end
+        elif char == "/" and nxt == "/":
+            while i < length and source[i] != "\n":
+                i += 1
+        elif char == "/" and nxt == "*":
+            end = source.find("*/", i + 2)
+            i = length if end == -1 else end + 2
+        elif char == "/" and _starts_regex(last_significant()):
+            end = i + 1
+            in_class = False
+            while end < length and source[end] != "\n":
+                if source[end] == "\\":
+                    end += 2
+                    continue
+                if source[end] == "[":
+                    in_class = True
+                elif source[end] == "]":
+                    in_class = False
+                elif source[end] == "/" and not in_class:
+                    break
+                end += 1
+            end += 1
+            while end < length and source[end].isalpha():
+                end += 1  # flags
+            out.append(source[i:end])
+            i = end
+        else:
+            if char == "{":
+                brace_depth += 1
+            elif char == "}":
+                brace_depth -= 1
+            out.append(char)
+            i += 1
+
+    lines = (line.strip() for line in "".join(out).splitlines())
+    return "\n".join(line for line in lines if line) + "\n"
+
+
+def _starts_regex(previous):
+    if not previous:
+        return True
+    if previous[-1] in REGEX_PRECEDERS:
+        return True
+    return any(previous.endswith(keyword) and not (previous[:-len(keyword)][-1:].isalnum())
+               for keyword in REGEX_KEYWORDS)
+
+
+def minify_css(source):
+    """Removes comments and redundant whitespace from a stylesheet."""
+    source = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
+    source = re.sub(r"\s+", " ", source)
+    source = re.sub(r"\s*([{};,>])\s*", r"\1", source)
+    source = re.sub(r":\s+", ":", source)
+    source = source.replace(";}", "}")
+    return source.strip() + "\n"
+
+
+MINIFIERS = {
+    ".js": minify_js,
+    ".css": minify_css,
+}
+
+
+def hashed_name(name, content):
+    digest = hashlib.sha256(content.encode()).hexdigest()[:HASH_LENGTH]
+    stem, suffix = name.rsplit(".", 1)
+    return f"{stem}.{digest}.{suffix}"
+
+
+def check_out_dir(source_dir, out_dir):
+    """
+    Refuses output directories that build() must not wipe: the source tree,
+    the repository, any directory containing either, and non-empty
+    directories that hold no previous build (no manifest.json).
+
+    Raises:
+        ValueError: If out_dir is unsafe to replace
+    """
+    out = out_dir.resolve()
+    for protected in (source_dir.resolve(), REPO_DIR):
+        if out == protected or out in protected.parents:
+            raise ValueError(f"refusing to replace {out_dir}: it contains {protected}")
+    if out.exists() and not out.is_dir():
+        raise ValueError(f"refusing to replace {out_dir}: not a directory")
+    if out.is_dir() and any(out.iterdir()) and not (out / MANIFEST_NAME).is_file():
+        raise ValueError(f"refusing to replace {out_dir}: not empty and not a previous build (no {MANIFEST_NAME})")
+
+
+def build(source_dir=FRONTEND_DIR, out_dir=DIST_DIR):
+    """Builds the frontend into out_dir and returns the manifest."""
+    check_out_dir(source_dir, out_dir)
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+
+    manifest = {}
+    sizes = []
+    for path in sorted(source_dir.iterdir()):
+        minify = MINIFIERS.get(path.suffix)
+        if not path.is_file() or minify is None:
+            continue
+        original = path.read_text(encoding="utf-8")
+        minified = minify(original)
+        name = hashed_name(path.name, minified)
+        (out_dir / name).write_text(minified, encoding="utf-8")
+        manifest[path.name] = name
+        sizes.append((path.name, name, len(original.encode()), len(minified.encode())))
+
+    index = (source_dir / "index.html").read_text(encoding="utf-8")
+    for original, name in manifest.items():
+        index = re.sub(
+            r'((?:href|src)=["\'])(?:\./)?' + re.escape(original) + r'(["\'])',
+            lambda match: match.group(1) + name + match.group(2),
+            index,
+        )
+    (out_dir / "index.html").write_text(index, encoding="utf-8")
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+    for original, name, before, after in sizes:
+        print(f"  {original:<12} -> {name:<28} {before:>7,} B -> {after:>7,} B ({(1 - after / before) * 100:.0f}% smaller)")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minify and fingerprint the frontend assets")
+    parser.add_argument("--source", type=Path, default=FRONTEND_DIR)
+    parser.add_argument("--out", type=Path, default=DIST_DIR)
+    args = parser.parse_args()
+
+    try:
+        check_out_dir(args.source, args.out)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    print(f"🔨 Building frontend from {args.source}")
+    build(args.source, args.out)
+    print(f"✅ Wrote {args.out} (serve it with: python serve_frontend.py)")
+
+
+if __name__ == "__main__":
+    main()
@@ -49,24 +49,27 @@ async function loadTasksFromDatabase() {
         }
 
         const tasks = await response.json();
+        showDatabaseTasks(tasks);
+    } catch (error) {
+        console.log('Could not load tasks from database:', error.message);
+    }
+}
 
-        if (tasks.length > 0) {
-            // Display loaded tasks with scores
-            const scoredTasks = tasks.map(task => ({
-                ...task,
-                score: 0  // Will be scored if needed
-            }));
+function showDatabaseTasks(tasks) {
+    if (tasks.length > 0) {
+        // Display loaded tasks with scores
+        const scoredTasks = tasks.map(task => ({
+            ...task,
+            score: 0  // Will be scored if needed
+        }));
 
-            resultCount.textContent = `${tasks.length} tasks (from database)`;
-            displayResults(scoredTasks);
+        resultCount.textContent = `${tasks.length} tasks (from database)`;
+        displayResults(scoredTasks);
 
-            // Also populate the textarea with JSON for editing
-            taskInput.value = JSON.stringify(tasks, null, 2);
+        // Also populate the textarea with JSON for editing
+        taskInput.value = JSON.stringify(tasks, null, 2);
 
-            console.log(`✅ Loaded ${tasks.length} tasks from database`);
-        }
-    } catch (error) {
-        console.log('Could not load tasks from database:', error.message);
+        console.log(`✅ Loaded ${tasks.length} tasks from database`);
     }
 }
 
@@ -97,33 +100,6 @@ function getTasksFromInput() {
     }
 }
 
-// Remove duplicate tasks based on title, due_date, importance, estimated_hours, dependencies
-function dedupeTasks(tasks) {
-    const seen = new Map();
-    const result = [];
-
-    for (const t of tasks) {
-        const key = [
-            (t.title || '').trim().toLowerCase(),
-            t.due_date || '',
-            String(t.importance || ''),
-            String(t.estimated_hours || ''),
-            JSON.stringify(t.dependencies || [])
-        ].join('||');
-
-        if (!seen.has(key)) {
-            seen.set(key, true);
-            result.push(t);
-        }
-    }
-
-    if (result.length !== tasks.length) {
-        console.log(`Deduplicated tasks: ${tasks.length} -> ${result.length}`);
-    }
-
-    return result;
-}
-
 // ============================================
 // ADD INDIVIDUAL TASK TO INPUT
 // ============================================
@@ -190,16 +166,14 @@ async function analyzeTasks() {
         return;
     }
 
-    // Deduplicate input tasks to avoid duplicate entries (based on key fields)
-    const dedupedInput = dedupeTasks(tasks);
-
     try {
         const response = await fetch(`${API_BASE}/analyze/`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({ tasks: dedupedInput })
+            // The server drops repeated tasks and gives ones already saved their stored id
+            body: JSON.stringify({ tasks, dedupe: 'merge' })
         });
 
         if (!response.ok) {
@@ -440,7 +414,7 @@ async function saveTasksToDatabase(tasks) {
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({ tasks: tasksToSave })
+            body: JSON.stringify({ tasks: tasksToSave, dedupe: 'merge' })
         });
 
         if (response.ok) {
@@ -461,17 +435,24 @@ async function saveTasksToDatabase(tasks) {
 
 async function deleteTaskFromDatabase(taskId) {
     try {
-        const response = await fetch(`${API_BASE}/delete/${taskId}/`, {
-            method: 'DELETE',
+        // Delete and reload the list in one request via /batch/
+        const response = await fetch(`${API_BASE}/batch/`, {
+            method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
-            }
+            },
+            body: JSON.stringify({
+                operations: [
+                    { op: 'delete', id: taskId },
+                    { op: 'list' }
+                ]
+            })
         });
 
         if (response.ok) {
+            const result = await response.json();
             console.log(`✅ Task ${taskId} deleted from database`);
-            // Reload tasks from database
-            loadTasksFromDatabase();
+            showDatabaseTasks(result.results[1].body);
         } else {
             showError(`Failed to delete task ${taskId}`);
         }
@@ -1,20 +1,134 @@
 #!/usr/bin/env python3
 """
-Simple HTTP server for serving the Task Analyzer frontend
+Static HTTP server for the Task Analyzer frontend
 Runs on port 8001
+
+- Threaded, HTTP/1.1 keep-alive
+- Small assets are loaded once at startup, gzip-precompressed and served from memory
+- ETag / If-None-Match revalidation (304 Not Modified)
+- Long-lived immutable Cache-Control for content-hashed assets (e.g. scripts.3f9a1c2b.js)
+- Large files are streamed from disk with sendfile()
+
+Serves frontend/dist/ (built by build_frontend.py) when it exists, otherwise
+the unbuilt frontend/ sources.
 """
 
+import argparse
+import gzip
+import hashlib
 import http.server
-import socketserver
-import os
+import json
+import mimetypes
+import re
+from email.utils import formatdate
 from pathlib import Path
 
 PORT = 8001
 FRONTEND_DIR = Path(__file__).parent / "frontend"
+DIST_DIR = FRONTEND_DIR / "dist"
+MANIFEST_NAME = "manifest.json"
+
+# Files larger than this are not cached in memory; they are sent with sendfile()
+SENDFILE_THRESHOLD = 256 * 1024
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+MIN_COMPRESS_SIZE = 512
+
+HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+
+def accept_encoding_qvalues(header):
+    """Parses an Accept-Encoding header into {coding: q}; bad q-values count as 0."""
+    qvalues = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[name] = q
+    return qvalues
+
+
+def accepts_gzip(header):
+    """
+    True when the client accepts gzip (by name, x-gzip or "*") with q > 0 and
+    doesn't explicitly prefer identity.
+    """
+    qvalues = accept_encoding_qvalues(header)
+    q = qvalues.get("gzip", qvalues.get("x-gzip", qvalues.get("*", 0.0)))
+    return q > 0 and q >= qvalues.get("identity", 0.0)
+
+
+class Asset:
+    """One static file, with its precompressed body when it is small enough to keep in memory."""
 
-class FrontendHandler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=str(FRONTEND_DIR), **kwargs)
+    def __init__(self, path, url_path, immutable=False):
+        stat = path.stat()
+        self.path = path
+        self.size = stat.st_size
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        if self.content_type.startswith("text/") or self.content_type == "application/javascript":
+            self.content_type += "; charset=utf-8"
+        immutable = immutable or HASHED_NAME.search(url_path)
+        self.cache_control = IMMUTABLE_CACHE if immutable else REVALIDATE_CACHE
+
+        self.body = None
+        self.gzip_body = None
+        if self.size <= SENDFILE_THRESHOLD:
+            self.body = path.read_bytes()
+            self.etag = '"%s"' % hashlib.sha1(self.body).hexdigest()[:20]
+            if self.size >= MIN_COMPRESS_SIZE and self.content_type.startswith(COMPRESSIBLE_TYPES):
+                compressed = gzip.compress(self.body, compresslevel=9, mtime=0)
+                if len(compressed) < self.size:
+                    self.gzip_body = compressed
+                    # A different byte stream, so a different entity tag
+                    self.gzip_etag = self.etag[:-1] + '-gz"'
+        else:
+            self.etag = '"%x-%x"' % (int(stat.st_mtime), self.size)
+
+
+def default_root():
+    """The built frontend if build_frontend.py has been run, else the sources."""
+    return DIST_DIR if (DIST_DIR / MANIFEST_NAME).is_file() else FRONTEND_DIR
+
+
+def load_assets(root):
+    """
+    Maps URL paths ("/scripts.js") to assets for every file under root.
+
+    Files named in the build manifest are content-hashed, so they are cached
+    as immutable.
+    """
+    manifest_path = root / MANIFEST_NAME
+    hashed = set(json.loads(manifest_path.read_text()).values()) if manifest_path.is_file() else set()
+
+    assets = {}
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.name.startswith(".") or path == manifest_path:
+            continue
+        if root.resolve() != DIST_DIR.resolve() and DIST_DIR.resolve() in path.resolve().parents:
+            continue  # Build output is not part of the source tree
+        url_path = "/" + path.relative_to(root).as_posix()
+        assets[url_path] = Asset(path, url_path, immutable=path.name in hashed)
+    if "/index.html" in assets:
+        assets["/"] = assets["/index.html"]
+    return assets
+
+
+class FrontendHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "TaskAnalyzerStatic/2.0"
+    assets = {}
 
     def end_headers(self):
         # Add CORS headers
@@ -25,23 +139,104 @@ class FrontendHandler(http.server.SimpleHTTPRequestHandler):
 
     def do_OPTIONS(self):
         self.send_response(200)
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
-if __name__ == "__main__":
-    os.chdir(FRONTEND_DIR)
-    handler = FrontendHandler
-    
-    with socketserver.TCPServer(("", PORT), handler) as httpd:
-        print(f"✅ Frontend server running on http://127.0.0.1:{PORT}/")
-        print(f"📁 Serving files from: {FRONTEND_DIR}")
+    def do_HEAD(self):
+        self.serve(send_body=False)
+
+    def do_GET(self):
+        self.serve(send_body=True)
+
+    def serve(self, send_body):
+        asset = self.assets.get(self.path.split("?", 1)[0].split("#", 1)[0])
+        if asset is None:
+            body = b"Not Found"
+            self.send_response(404)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        use_gzip = asset.gzip_body is not None and accepts_gzip(self.headers.get("Accept-Encoding", ""))
+        etag = asset.gzip_etag if use_gzip else asset.etag
+        common = [
+            ("ETag", etag),
+            ("Cache-Control", asset.cache_control),
+            ("Last-Modified", asset.last_modified),
+            ("Vary", "Accept-Encoding"),
+        ]
+
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in
+                              [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]):
+            self.send_response(304)
+            for name, value in common:
+                self.send_header(name, value)
+            self.end_headers()
+            return
+
+        body = asset.gzip_body if use_gzip else asset.body
+
+        self.send_response(200)
+        self.send_header("Content-Type", asset.content_type)
+        for name, value in common:
+            self.send_header(name, value)
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body) if body is not None else asset.size))
+        self.end_headers()
+
+        if not send_body:
+            return
+        if body is not None:
+            self.wfile.write(body)
+        else:
+            self.wfile.flush()
+            with open(asset.path, "rb") as handle:
+                self.connection.sendfile(handle)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class FrontendServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    verbose = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Task Analyzer frontend")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--bind", default="")
+    parser.add_argument("--root", type=Path, default=None,
+                        help="Directory to serve (default: frontend/dist if built, else frontend)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+    args.root = args.root or default_root()
+
+    FrontendHandler.assets = load_assets(args.root)
+    cached = sum(1 for asset in set(FrontendHandler.assets.values()) if asset.body is not None)
+
+    with FrontendServer((args.bind, args.port), FrontendHandler) as httpd:
+        httpd.verbose = args.verbose
+        print(f"✅ Frontend server running on http://127.0.0.1:{args.port}/")
+        print(f"📁 Serving files from: {args.root} ({cached} cached in memory, gzip precompressed)")
         print(f"🔗 Backend API: http://127.0.0.1:8000/api/tasks")
         print(f"\n📋 Task Analyzer is ready!")
-        print(f"   - Frontend: http://127.0.0.1:{PORT}/")
+        print(f"   - Frontend: http://127.0.0.1:{args.port}/")
         print(f"   - Backend: http://127.0.0.1:8000/")
-        print(f"\n💡 Tip: Open http://127.0.0.1:{PORT}/ in your browser")
+        print(f"\n💡 Tip: Open http://127.0.0.1:{args.port}/ in your browser")
         print(f"\nPress Ctrl+C to stop the server\n")
-        
+
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
             print("\n✅ Server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,28 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _install_triggers(using, **kwargs):
+    from django.db import connections
+    from django.db.migrations.executor import MigrationExecutor
+
+    from .triggers import install_triggers
+    connection = connections[using]
+    # The triggers are written against the latest schema; after a partial
+    # migrate (migrate tasks 0007) they are installed by the next full one
+    executor = MigrationExecutor(connection)
+    if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+        return
+    install_triggers(connection)
 
 
 class TasksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "tasks"
+
+    def ready(self):
+        # Register the change-tracking signal handlers
+        from . import signals  # noqa: F401
+
+        # Table rebuilds during migrate drop SQLite triggers; put them back afterwards
+        post_migrate.connect(_install_triggers, sender=self)
@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task, ArchivedTask
+from .signals import tasks_changed
+
+DEFAULT_OVERDUE_DAYS = 30
+DEFAULT_BATCH_SIZE = 1000
+
+
+def archivable_tasks(overdue_days=DEFAULT_OVERDUE_DAYS, today=None, workspace_id=None):
+    """
+    Returns the queryset of tasks that belong in the archive:
+    completed tasks and tasks overdue by more than `overdue_days`,
+    optionally limited to one workspace.
+    """
+    today = today or date.today()
+    cutoff = today - timedelta(days=overdue_days)
+    tasks = Task.objects.all() if workspace_id is None else Task.objects.filter(workspace_id=workspace_id)
+    return tasks.filter(Q(completed=True) | Q(due_date__lt=cutoff))
+
+
+def archive_tasks(queryset, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Moves the tasks in `queryset` into `ArchivedTask`, one batch per transaction.
+
+    A batch is the next `batch_size` IDs; it is moved with `archive_queryset()`
+    restricted to that ID range, so each batch costs the same few set-based
+    statements whatever its size, the hot table is never locked for the whole
+    run, and no per-row delete signals are sent.
+
+    Returns:
+        int: Number of tasks archived
+    """
+    archived = 0
+    queryset = queryset.order_by('id')
+
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.values_list('id', flat=True)[:batch_size])
+            if not ids:
+                break
+            archived += archive_queryset(queryset.filter(id__gte=ids[0], id__lte=ids[-1]))
+
+    return archived
+
+
+ARCHIVE_COPY_FIELDS = ['workspace', 'title', 'due_date', 'importance', 'estimated_hours', 'dependencies', 'completed']
+
+
+def archive_queryset(queryset):
+    """
+    Moves every task in `queryset` into `ArchivedTask` with two set-based
+    statements in one transaction: INSERT ... SELECT and DELETE ... WHERE id IN
+    (SELECT ...). Nothing is loaded into Python, so it suits admin actions on
+    "all N matching tasks" where `archive_tasks()` would page through them.
+    Only the workspaces the tasks belonged to are marked as changed.
+
+    Returns:
+        int: Number of tasks archived
+    """
+    ops = connection.ops
+    task_table = ops.quote_name(Task._meta.db_table)
+    archive_table = ops.quote_name(ArchivedTask._meta.db_table)
+    columns = ', '.join(ops.quote_name(ArchivedTask._meta.get_field(name).column)
+                        for name in ['original_id'] + ARCHIVE_COPY_FIELDS + ['archived_at'])
+    source_sql, source_params = queryset.order_by().values_list('id', *ARCHIVE_COPY_FIELDS).query.sql_with_params()
+    ids_sql, ids_params = queryset.order_by().values('id').query.sql_with_params()
+    archived_at = ops.adapt_datetimefield_value(timezone.now())
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        workspace_ids = list(queryset.order_by().values_list('workspace_id', flat=True).distinct())
+        cursor.execute(
+            f"INSERT INTO {archive_table} ({columns}) SELECT source.*, %s FROM ({source_sql}) source",
+            (archived_at, *source_params),
+        )
+        archived = cursor.rowcount
+        cursor.execute(f"DELETE FROM {task_table} WHERE id IN (SELECT id FROM ({ids_sql}) ids)", ids_params)
+        if archived:
+            for workspace_id in workspace_ids:
+                tasks_changed(workspace_id)
+    return archived
@@ -0,0 +1,262 @@
+"""
+Columnar binary format for /analyze/ (media type
+`application/vnd.task-analyzer.columns`).
+
+Machine-to-machine callers can send tasks as packed columns instead of JSON
+and read the scores back the same way. The server decodes a request with
+memoryview.cast() (no per-task objects) and hands the columns straight to
+calculate_scores_batch().
+
+All integers are little-endian. Every column starts on an 8-byte boundary
+(zero padding after the previous one).
+
+Request body (n tasks, m dependency values in total):
+
+    offset  type        field
+    0       4 bytes     magic b"TAC1"
+    4       uint16      version (1)
+    6       uint16      flags (0)
+    8       uint32      n
+    12      uint32      m
+    16      int64[n]    ids
+            int32[n]    due dates as proleptic Gregorian ordinals
+                        (Python date.toordinal(), 2025-01-01 = 739252)
+            int32[n]    importance
+            int32[n]    estimated hours
+            uint32[n+1] dependency offsets: task i depends on
+                        values[offsets[i]:offsets[i+1]]; offsets[0] = 0,
+                        offsets[n] = m, non-decreasing
+            int64[m]    dependency values (task IDs)
+            uint32[n+1] title offsets into the string table (same rules,
+                        offsets[n] = table length)
+            uint8[...]  string table: the UTF-8 titles, concatenated
+
+Response body, when the request's Accept header names this media type:
+
+    0       4 bytes     magic b"TAS1"
+    4       uint16      version (1)
+    6       uint16      flags (0)
+    8       uint32      n
+    12      uint32      0 (reserved)
+    16      int64[n]    ids, in request order
+            int32[n]    scores, in request order, rounded to the nearest
+                        integer (JSON requests with fractional importance or
+                        hours score fractionally; halves round to even)
+            uint32[n]   ranks, in request order (1 = highest score; ties keep
+                        request order, like the JSON response's sort; taken
+                        from the unrounded scores)
+
+Error responses are always JSON. encode_columns() and decode_scores() are
+reference encoders for clients written in Python.
+"""
+import struct
+import sys
+from array import array
+from datetime import date
+from operator import sub
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+MEDIA_TYPE = 'application/vnd.task-analyzer.columns'
+REQUEST_MAGIC = b'TAC1'
+RESPONSE_MAGIC = b'TAS1'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+
+MAX_ORDINAL = date.max.toordinal()
+LITTLE_ENDIAN = sys.byteorder == 'little'
+
+
+class TaskColumns:
+    """Decoded request columns. Numeric columns are typed memoryviews over the request body."""
+
+    def __init__(self, ids, due_ordinals, importances, estimated_hours, dependency_offsets,
+                 dependency_values, title_offsets, titles):
+        self.ids = ids
+        self.due_ordinals = due_ordinals
+        self.importances = importances
+        self.estimated_hours = estimated_hours
+        self.dependency_offsets = dependency_offsets
+        self.dependency_values = dependency_values
+        self.title_offsets = title_offsets
+        self.titles = titles
+
+    def __len__(self):
+        return len(self.ids)
+
+    def dependency_counts(self):
+        offsets = self.dependency_offsets
+        return list(map(sub, offsets[1:], offsets[:-1]))
+
+    def title(self, i):
+        return bytes(self.titles[self.title_offsets[i]:self.title_offsets[i + 1]]).decode('utf-8', 'replace')
+
+    def dependencies(self, i):
+        return list(self.dependency_values[self.dependency_offsets[i]:self.dependency_offsets[i + 1]])
+
+
+class ScoredColumns:
+    """Scores and ranks for a columnar response, in request order."""
+
+    def __init__(self, ids, scores, ranks):
+        self.ids = ids
+        self.scores = scores
+        self.ranks = ranks
+
+
+def _padded(size):
+    return (size + 7) & ~7
+
+
+def _column(view, offset, typecode, count):
+    """Returns (column, next_offset) for `count` items of `typecode` at `offset`."""
+    size = count * struct.calcsize(typecode)
+    chunk = view[offset:offset + size]
+    if len(chunk) != size:
+        raise ValueError("Truncated columnar payload.")
+    if LITTLE_ENDIAN:
+        column = chunk.cast(typecode)
+    else:
+        column = array(typecode, chunk)
+        column.byteswap()
+    return column, offset + _padded(size)
+
+
+def _check_offsets(offsets, total, name):
+    if offsets[0] != 0 or offsets[-1] != total:
+        raise ValueError(f"{name} offsets must start at 0 and end at {total}.")
+    if any(map(int.__gt__, offsets[:-1], offsets[1:])):
+        raise ValueError(f"{name} offsets must be non-decreasing.")
+
+
+def decode_columns(buffer):
+    """
+    Decodes a request body without copying the numeric columns.
+
+    Raises:
+        ValueError: If the payload is malformed
+    """
+    view = memoryview(buffer)
+    if len(view) < HEADER.size:
+        raise ValueError("Truncated columnar payload.")
+    magic, version, _flags, count, dependency_count = HEADER.unpack_from(view)
+    if magic != REQUEST_MAGIC or version != VERSION:
+        raise ValueError("Not a version 1 task columns payload.")
+
+    offset = HEADER.size
+    ids, offset = _column(view, offset, 'q', count)
+    due_ordinals, offset = _column(view, offset, 'i', count)
+    importances, offset = _column(view, offset, 'i', count)
+    estimated_hours, offset = _column(view, offset, 'i', count)
+    dependency_offsets, offset = _column(view, offset, 'I', count + 1)
+    dependency_values, offset = _column(view, offset, 'q', dependency_count)
+    title_offsets, offset = _column(view, offset, 'I', count + 1)
+    titles = view[offset:]
+
+    _check_offsets(dependency_offsets, dependency_count, "Dependency")
+    _check_offsets(title_offsets, len(titles), "Title")
+    if count and (min(due_ordinals) < 1 or max(due_ordinals) > MAX_ORDINAL):
+        raise ValueError("Due dates must be valid date ordinals.")
+    return TaskColumns(ids, due_ordinals, importances, estimated_hours, dependency_offsets,
+                       dependency_values, title_offsets, titles)
+
+
+def _pack(typecode, values):
+    column = array(typecode, values)
+    if not LITTLE_ENDIAN:
+        column.byteswap()
+    data = column.tobytes()
+    return data + bytes(_padded(len(data)) - len(data))
+
+
+def encode_columns(tasks):
+    """
+    Encodes task dicts (id, title, due_date, importance, estimated_hours,
+    dependencies) as a request body. Missing fields use the /analyze/ defaults.
+    """
+    dependency_offsets = [0]
+    dependency_values = []
+    title_offsets = [0]
+    titles = bytearray()
+    for task in tasks:
+        dependency_values.extend(task.get('dependencies', []))
+        dependency_offsets.append(len(dependency_values))
+        titles += str(task.get('title', '')).encode('utf-8')
+        title_offsets.append(len(titles))
+
+    due_ordinals = [
+        (date.fromisoformat(task['due_date']) if isinstance(task['due_date'], str) else task['due_date']).toordinal()
+        for task in tasks
+    ]
+    return b''.join([
+        HEADER.pack(REQUEST_MAGIC, VERSION, 0, len(tasks), len(dependency_values)),
+        _pack('q', [task.get('id', 0) for task in tasks]),
+        _pack('i', due_ordinals),
+        _pack('i', [task.get('importance', 5) for task in tasks]),
+        _pack('i', [task.get('estimated_hours', 1) for task in tasks]),
+        _pack('I', dependency_offsets),
+        _pack('q', dependency_values),
+        _pack('I', title_offsets),
+        bytes(titles),
+    ])
+
+
+def encode_scores(result):
+    """Encodes a ScoredColumns as a response body (scores rounded to int32)."""
+    return b''.join([
+        HEADER.pack(RESPONSE_MAGIC, VERSION, 0, len(result.ids), 0),
+        _pack('q', result.ids),
+        _pack('i', map(round, result.scores)),
+        _pack('I', result.ranks),
+    ])
+
+
+def decode_scores(buffer):
+    """Decodes a response body into a ScoredColumns."""
+    view = memoryview(buffer)
+    magic, version, _flags, count, _ = HEADER.unpack_from(view)
+    if magic != RESPONSE_MAGIC or version != VERSION:
+        raise ValueError("Not a version 1 task scores payload.")
+    ids, offset = _column(view, HEADER.size, 'q', count)
+    scores, offset = _column(view, offset, 'i', count)
+    ranks, offset = _column(view, offset, 'I', count)
+    return ScoredColumns(ids, scores, ranks)
+
+
+def rank(scores):
+    """1-based ranks by descending score; ties keep input order."""
+    order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+    ranks = [0] * len(scores)
+    for position, i in enumerate(order, 1):
+        ranks[i] = position
+    return ranks
+
+
+class ColumnarParser(BaseParser):
+    """DRF parser: request.data becomes a TaskColumns."""
+
+    media_type = MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return decode_columns(stream.read() if stream is not None else b'')
+        except ValueError as exc:
+            raise ParseError(f"Columnar parse error - {exc}")
+
+
+class ColumnarRenderer(BaseRenderer):
+    """DRF renderer for ScoredColumns; anything else (errors) is rendered as JSON."""
+
+    media_type = MEDIA_TYPE
+    format = 'columns'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, ScoredColumns):
+            return encode_scores(data)
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = 'application/json'
+        return JSONRenderer().render(data)
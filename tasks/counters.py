@@ -0,0 +1,146 @@
+"""
+Dashboard counters: totals over open tasks that would otherwise mean
+scanning and scoring every row.
+
+On SQLite each workspace's counters live in its `TaskCounters` row. Triggers
+on `tasks_task` (see `tasks.triggers`) add and subtract each written row's
+contribution, so every write path, raw-SQL imports included, keeps them
+current in the same transaction. The date buckets are relative to the row's
+`as_of` day; the first read on a new day moves them forward by counting only
+the tasks whose due dates crossed a bucket edge (index range scans on
+due_date), never the whole table.
+
+Other backends have no triggers and recompute the counters with one
+aggregate query per workspace version (see `tasks.signals`) and day.
+"""
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, F, Q
+
+from .models import DEFAULT_WORKSPACE_ID, Task, TaskCounters
+from .signals import current_version
+
+COUNTER_NAMES = ('total', 'overdue', 'due_3_days', 'due_7_days', 'quick_wins', 'blocked')
+
+
+def counter_filters(today):
+    """Counter name -> Q over open tasks; the SQL twin is in tasks.triggers."""
+    return {
+        'total': Q(),
+        'overdue': Q(due_date__lt=today),
+        'due_3_days': Q(due_date__range=(today, today + timedelta(days=3))),
+        'due_7_days': Q(due_date__range=(today, today + timedelta(days=7))),
+        'quick_wins': Q(estimated_hours__lt=2),
+        # Non-empty dependencies array (matches the scoring penalty)
+        'blocked': Q(dependencies__0__isnull=False),
+    }
+
+
+def compute_counters(workspace_id=DEFAULT_WORKSPACE_ID, today=None):
+    """Recomputes a workspace's counters from tasks_task with a single aggregate query."""
+    today = today or date.today()
+    return Task.objects.active().filter(workspace_id=workspace_id).aggregate(**{
+        name: Count('id', filter=condition) for name, condition in counter_filters(today).items()
+    })
+
+
+def _maintained():
+    return connection.vendor == 'sqlite'
+
+
+def _open_between(workspace_id, start, end):
+    """Open tasks due in [start, end] (an empty range when start > end)."""
+    if start > end:
+        return 0
+    return Task.objects.active().filter(workspace_id=workspace_id, due_date__range=(start, end)).count()
+
+
+def _roll_forward(workspace_id, counters, today):
+    """
+    Re-buckets counters kept as of an earlier (or, after a clock change, later)
+    day. Only the due-date buckets move: overdue gains the tasks due between the
+    two days, and the 3/7-day windows are recounted over their few days.
+    """
+    as_of = counters['as_of']
+    if today > as_of:
+        overdue = counters['overdue'] + _open_between(workspace_id, as_of, today - timedelta(days=1))
+    else:
+        overdue = counters['overdue'] - _open_between(workspace_id, today, as_of - timedelta(days=1))
+    return {
+        **counters,
+        'as_of': today,
+        'overdue': overdue,
+        'due_3_days': _open_between(workspace_id, today, today + timedelta(days=3)),
+        'due_7_days': _open_between(workspace_id, today, today + timedelta(days=7)),
+    }
+
+
+def dashboard_counters(workspace_id=DEFAULT_WORKSPACE_ID, today=None):
+    """
+    Returns a workspace's counters as of `today`: a dict with "as_of" and
+    COUNTER_NAMES.
+
+    The usual read is one primary-key lookup. The row is created by a full
+    recompute when missing (first use, or after install_triggers() rebuilt
+    it) and moved forward on the first read of a new day.
+    """
+    today = today or date.today()
+    if not _maintained():
+        version = current_version(workspace_id)
+        key = f'tasks:counters:{workspace_id}:{version}:{today.isoformat()}'
+        counters = cache.get(key)
+        if counters is None:
+            counters = {'as_of': today, **compute_counters(workspace_id, today)}
+            cache.set(key, counters)
+        return counters
+
+    fields = ('as_of', *COUNTER_NAMES)
+    row = TaskCounters.objects.filter(workspace_id=workspace_id)
+    counters = row.values(*fields).first()
+    if counters is not None and counters['as_of'] == today:
+        return counters
+
+    with transaction.atomic():
+        # Take the write lock before reading, so no trigger can change the
+        # counters between the reads below and the save (SQLite has one writer)
+        if not row.update(as_of=F('as_of')):
+            counters = {'as_of': today, **compute_counters(workspace_id, today)}
+            TaskCounters.objects.create(workspace_id=workspace_id, **counters)
+            return counters
+        counters = row.values(*fields).get()
+        if counters['as_of'] != today:
+            counters = _roll_forward(workspace_id, counters, today)
+            row.update(**counters)
+    return counters
+
+
+def repair_counters(workspace_id=DEFAULT_WORKSPACE_ID, today=None):
+    """
+    Recomputes a workspace's counters and compares them with the maintained ones.
+
+    Returns:
+        tuple: (counters, mismatches) where mismatches maps each counter that
+        was wrong to its (stored, actual) values. Stored counters are replaced
+        by the recomputed ones; on backends without a counters row, nothing is
+        stored and mismatches is always empty.
+    """
+    today = today or date.today()
+    if not _maintained():
+        return dashboard_counters(workspace_id, today), {}
+    with transaction.atomic():
+        row = TaskCounters.objects.filter(workspace_id=workspace_id)
+        locked = row.update(as_of=F('as_of'))
+        counters = {'as_of': today, **compute_counters(workspace_id, today)}
+        if not locked:
+            TaskCounters.objects.create(workspace_id=workspace_id, **counters)
+            return counters, {}
+        stored = row.values('as_of', *COUNTER_NAMES).get()
+        if stored['as_of'] != today:
+            stored = _roll_forward(workspace_id, stored, today)
+        mismatches = {
+            name: (stored[name], counters[name]) for name in COUNTER_NAMES if stored[name] != counters[name]
+        }
+        row.update(**counters)
+    return counters, mismatches
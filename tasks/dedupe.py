@@ -0,0 +1,226 @@
+"""
+Duplicate detection for tasks.
+
+Two tasks are duplicates when they are due the same day and their titles
+normalize to the same text (case, accents, punctuation and spacing ignored).
+`title_key()` hashes the normalized title to a 63-bit integer that is stored
+in `Task.title_key`, so duplicates among stored tasks are found through the
+(due_date, title_key) index rather than by comparing titles.
+
+Near-duplicate mode also pairs titles, due the same day, whose character
+trigram sets have a Jaccard similarity of at least `threshold`. MinHash
+signatures cut into LSH bands pick candidate pairs in linear time, and every
+candidate is confirmed with its exact Jaccard similarity, so a reported pair
+is never a false positive (a rare true pair may be missed).
+"""
+import re
+import unicodedata
+from hashlib import blake2b
+from random import Random
+
+from django.conf import settings
+from django.db.models import Count
+
+from .bulk import ID_CHUNK_SIZE, chunked
+from .models import DEFAULT_WORKSPACE_ID, Task
+
+NUM_PERM = 24
+BANDS = 8
+ROWS_PER_BAND = NUM_PERM // BANDS
+# Fixed masks: every process derives the same permutations
+_MASKS = [Random(1009 + i).getrandbits(64) for i in range(NUM_PERM)]
+
+DEDUPE_ACTIONS = ('off', 'flag', 'merge')
+
+_WORD = re.compile(r'\w+')
+
+
+def normalize_title(title):
+    """Lowercases, strips accents and punctuation, and collapses whitespace."""
+    text = str(title or '')
+    if text.isascii():
+        # NFKD and combining marks can't change ASCII; casefold() is lower() here
+        text = text.lower()
+    else:
+        text = unicodedata.normalize('NFKD', text).casefold()
+        text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(_WORD.findall(text))
+
+
+def _hash64(text):
+    return int.from_bytes(blake2b(text.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def title_key(title):
+    """63-bit hash of the normalized title (fits a signed BIGINT column)."""
+    return _hash64(normalize_title(title)) >> 1
+
+
+def shingles(normalized):
+    """Character trigrams of a normalized title (the title itself if shorter)."""
+    if len(normalized) < 3:
+        return {normalized}
+    return {normalized[i:i + 3] for i in range(len(normalized) - 2)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def minhash(shingle_set):
+    """MinHash signature: one 64-bit hash per shingle, XOR-permuted NUM_PERM ways."""
+    hashes = [_hash64(shingle) for shingle in shingle_set]
+    return tuple(min(h ^ mask for h in hashes) for mask in _MASKS)
+
+
+def _bands(signature):
+    return [(band, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]) for band in range(BANDS)]
+
+
+class _NearIndex:
+    """LSH buckets of (due_date, band, band values) -> entries seen so far."""
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.buckets = {}
+
+    def best_match(self, due_date, grams, signature):
+        """Returns (entry, similarity) for the most similar entry at or above the threshold, or None."""
+        best = None
+        seen = set()
+        for band in _bands(signature):
+            for entry in self.buckets.get((due_date, band), ()):
+                if id(entry) in seen:
+                    continue
+                seen.add(id(entry))
+                similarity = jaccard(grams, entry[1])
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (entry, similarity)
+        return best
+
+    def add(self, due_date, ref, grams, signature):
+        entry = (ref, grams)
+        for band in _bands(signature):
+            self.buckets.setdefault((due_date, band), []).append(entry)
+
+
+def default_threshold():
+    return getattr(settings, 'TASKS_DEDUPE_THRESHOLD', 0.8)
+
+
+def find_duplicates(items, near=False, threshold=None, stored=True, workspace_id=DEFAULT_WORKSPACE_ID):
+    """
+    Finds duplicates among `items` and against a workspace's stored tasks, in
+    one pass.
+
+    Args:
+        items (list): (title, due_date) pairs, due_date a date or None
+        near (bool): Also match near-duplicate titles
+        threshold (float): Minimum trigram Jaccard similarity for near mode
+            (default TASKS_DEDUPE_THRESHOLD)
+        stored (bool): Also match items against tasks in the database
+        workspace_id (int): Workspace whose stored tasks are matched
+
+    Returns:
+        list: One entry per item: None, or {"id": stored_task_id} /
+        {"index": earlier_item_index} plus "similarity" (1.0 for exact).
+        Items are only ever matched to an original, never to another
+        duplicate, so the earliest occurrence (or the stored task) wins.
+    """
+    threshold = default_threshold() if threshold is None else threshold
+    normalized = [normalize_title(title) for title, _ in items]
+    keys = [_hash64(text) >> 1 for text in normalized]
+    results = [None] * len(items)
+
+    stored_keys = {}
+    stored_rows = []
+    if stored:
+        # Lookups are split so no IN (...) list outgrows SQLite's parameter limit
+        queryset = Task.objects.filter(workspace_id=workspace_id).values_list('id', 'title', 'due_date')
+        if near:
+            # Near matches can have any title, so load the candidate days
+            dates = sorted({due for _, due in items if due is not None})
+            for chunk in chunked(dates):
+                stored_rows.extend(queryset.filter(due_date__in=chunk))
+        else:
+            pairs = sorted({(due, key) for (_, due), key in zip(items, keys) if due is not None})
+            for chunk in chunked(pairs, ID_CHUNK_SIZE // 2):
+                stored_rows.extend(queryset.filter(due_date__in={due for due, _ in chunk},
+                                                   title_key__in={key for _, key in chunk}))
+        # A row can match more than one chunk; the oldest stored task is the original
+        stored_rows = sorted(set(stored_rows))
+        for task_id, title, due in stored_rows:
+            stored_keys.setdefault((due, title_key(title)), (task_id, normalize_title(title)))
+
+    index = _NearIndex(threshold) if near else None
+    if near:
+        for task_id, title, due in stored_rows:
+            grams = shingles(normalize_title(title))
+            index.add(due, {"id": task_id}, grams, minhash(grams))
+
+    seen = {}
+    for i, (_, due) in enumerate(items):
+        key = (due, keys[i])
+        match = stored_keys.get(key)
+        if match is not None and match[1] == normalized[i]:
+            results[i] = {"id": match[0], "similarity": 1.0}
+            continue
+        if key in seen and normalized[seen[key]] == normalized[i]:
+            results[i] = {"index": seen[key], "similarity": 1.0}
+            continue
+        if near:
+            grams = shingles(normalized[i])
+            signature = minhash(grams)
+            best = index.best_match(due, grams, signature)
+            if best is not None:
+                (ref, _), similarity = best
+                results[i] = {**ref, "similarity": round(similarity, 3)}
+                continue
+            index.add(due, {"index": i}, grams, signature)
+        seen.setdefault(key, i)
+    return results
+
+
+def duplicate_groups(queryset=None, near=False, threshold=None):
+    """
+    Groups stored tasks that duplicate each other.
+
+    Exact mode finds candidate groups with one GROUP BY over the
+    (workspace, due_date, title_key) index. Near mode streams tasks ordered by due date
+    and runs the LSH pass one day at a time, so memory is bounded by the
+    busiest day rather than the table.
+
+    Returns:
+        list: Groups of (id, title, due_date) rows, oldest task first, in
+        order of their first task
+    """
+    threshold = default_threshold() if threshold is None else threshold
+    queryset = Task.objects.all() if queryset is None else queryset
+
+    if not near:
+        repeated = (queryset.order_by().filter(title_key__isnull=False).values('due_date', 'title_key')
+                    .annotate(count=Count('id')).filter(count__gt=1).values('title_key'))
+        groups = {}
+        rows = queryset.filter(title_key__in=repeated).order_by('id').values_list('id', 'title', 'due_date')
+        for row in rows.iterator(chunk_size=2000):
+            groups.setdefault((row[2], normalize_title(row[1])), []).append(row)
+        return sorted((group for group in groups.values() if len(group) > 1), key=lambda group: group[0][0])
+
+    groups = []
+    day = None
+    index = members = None
+    rows = queryset.order_by('due_date', 'id').values_list('id', 'title', 'due_date')
+    for row in rows.iterator(chunk_size=2000):
+        if row[2] != day:
+            groups.extend(group for group in (members or {}).values() if len(group) > 1)
+            day, index, members = row[2], _NearIndex(threshold), {}
+        grams = shingles(normalize_title(row[1]))
+        signature = minhash(grams)
+        best = index.best_match(day, grams, signature)
+        if best is not None:
+            members[best[0][0]].append(row)
+            continue
+        index.add(day, row[0], grams, signature)
+        members[row[0]] = [row]
+    groups.extend(group for group in (members or {}).values() if len(group) > 1)
+    return sorted(groups, key=lambda group: group[0][0])
@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+from datetime import date
+from itertools import islice
+
+from .models import Task, ArchivedTask
+from .scoring import calculate_scores_batch
+
+EXPORT_FIELDS = ['id', 'title', 'due_date', 'importance', 'estimated_hours', 'dependencies', 'completed']
+ARCHIVE_FIELDS = ['archived', 'archived_at']
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def export_columns(include_archived=False, scores=False):
+    """Column names of an export, in output order."""
+    return EXPORT_FIELDS + (ARCHIVE_FIELDS if include_archived else []) + (['score'] if scores else [])
+
+
+def export_chunks(lookups=None, include_archived=False, scores=False, chunk_size=DEFAULT_CHUNK_SIZE, today=None):
+    """
+    Yields lists of row tuples (see export_columns) for live tasks, then
+    archived tasks, chunk_size rows at a time.
+
+    Rows come from values_list().iterator(chunk_size), which streams from a
+    server-side cursor where the backend has one, so only one chunk is ever
+    held in memory. Scores are computed per chunk with the batch scorer.
+    """
+    lookups = lookups or {}
+    today = today or date.today()
+    sources = [(Task.objects.filter(**lookups).order_by('id').values_list(*EXPORT_FIELDS), None)]
+    if include_archived:
+        archived_fields = ['original_id'] + EXPORT_FIELDS[1:] + ['archived_at']
+        sources.append((ArchivedTask.objects.filter(**lookups).order_by('original_id').values_list(*archived_fields),
+                        True))
+
+    for queryset, archived in sources:
+        rows = queryset.iterator(chunk_size=chunk_size)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            if include_archived:
+                if archived:
+                    chunk = [row[:-1] + (True, row[-1]) for row in chunk]
+                else:
+                    chunk = [row + (False, None) for row in chunk]
+            if scores:
+                batch_scores = calculate_scores_batch(
+                    [row[2].toordinal() for row in chunk],
+                    [row[3] for row in chunk],
+                    [row[4] for row in chunk],
+                    [len(row[5]) if isinstance(row[5], list) else 0 for row in chunk],
+                    today=today,
+                )
+                chunk = [row + (score,) for row, score in zip(chunk, batch_scores)]
+            yield chunk
+
+
+def stream_csv(columns, chunks):
+    """Encodes export chunks as CSV text, one string per chunk after the header."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(value) for value in row] for row in chunk)
+        yield buffer.getvalue()
+
+
+def stream_ndjson(columns, chunks):
+    """Encodes export chunks as newline-delimited JSON, one string per chunk."""
+    for chunk in chunks:
+        yield ''.join(json.dumps(dict(zip(columns, row)), default=_json_default) + '\n' for row in chunk)
+
+
+def _csv_value(value):
+    # Same cell formats import_tasks reads back: JSON lists, lowercase booleans, ISO dates
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if value is None:
+        return ''
+    return value
+
+
+def _json_default(value):
+    return value.isoformat()
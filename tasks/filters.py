@@ -0,0 +1,36 @@
+from datetime import date
+
+
+def parse_task_filter(params):
+    """
+    Turns filter parameters into queryset lookups.
+    
+    Supported keys (all optional):
+        - due_from (str): Only tasks due on or after this date (YYYY-MM-DD)
+        - due_to (str): Only tasks due on or before this date (YYYY-MM-DD)
+        - min_importance (int): Only tasks with at least this importance
+    
+    Returns:
+        dict: Keyword arguments for QuerySet.filter()
+    
+    Raises:
+        ValueError: If a value can't be parsed
+    """
+    lookups = {}
+    
+    for key, lookup in (('due_from', 'due_date__gte'), ('due_to', 'due_date__lte')):
+        value = params.get(key)
+        if value not in (None, ''):
+            try:
+                lookups[lookup] = date.fromisoformat(str(value))
+            except ValueError:
+                raise ValueError(f"'{key}' must be a date in YYYY-MM-DD format.")
+    
+    min_importance = params.get('min_importance')
+    if min_importance not in (None, ''):
+        try:
+            lookups['importance__gte'] = int(min_importance)
+        except (TypeError, ValueError):
+            raise ValueError("'min_importance' must be an integer.")
+    
+    return lookups
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from tasks.archive import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_OVERDUE_DAYS,
+    archivable_tasks,
+    archive_tasks,
+)
+from tasks.workspaces import command_workspace_id
+
+
+class Command(BaseCommand):
+    help = "Move completed and long-overdue tasks into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--overdue-days',
+            type=int,
+            default=DEFAULT_OVERDUE_DAYS,
+            help=f"Archive tasks overdue by more than this many days (default {DEFAULT_OVERDUE_DAYS}).",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Rows moved per transaction (default {DEFAULT_BATCH_SIZE}).",
+        )
+        parser.add_argument(
+            '--workspace',
+            help="Workspace slug to archive (default: every workspace).",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Only report how many tasks would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        workspace_id = command_workspace_id(options['workspace']) if options['workspace'] else None
+        queryset = archivable_tasks(overdue_days=options['overdue_days'], workspace_id=workspace_id)
+
+        if options['dry_run']:
+            self.stdout.write(f"{queryset.count()} task(s) would be archived.")
+            return
+
+        archived = archive_tasks(queryset, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} task(s)."))
@@ -0,0 +1,214 @@
+import json
+from contextlib import nullcontext
+from datetime import date
+from itertools import islice
+from random import Random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+
+from tasks.bulk import task_insert_sql
+from tasks.dedupe import title_key
+from tasks.models import Task
+from tasks.signals import tasks_changed
+from tasks.triggers import triggers_suspended
+from tasks.workspaces import command_workspace_id
+
+VERBS = ["Review", "Fix", "Write", "Update", "Plan", "Test", "Deploy", "Refactor", "Document", "Design"]
+NOUNS = ["API docs", "login bug", "release notes", "database schema", "dashboard", "test suite",
+         "onboarding flow", "CI pipeline", "billing report", "search page"]
+
+GRAPH_SHAPES = ['none', 'chain', 'fan-in', 'dag']
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic tasks for load and scale testing, either inserted into "
+        "tasks_task in bulk or written out as JSON/NDJSON analyze payloads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help="Number of tasks to generate.")
+        parser.add_argument('--format', choices=['db', 'json', 'ndjson'], default='db',
+                            help="Insert into the database (default) or emit a payload.")
+        parser.add_argument('--output', help="Payload file for json/ndjson (default: stdout).")
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help="Rows per bulk insert / transaction (default 10000).")
+        parser.add_argument('--seed', type=int, default=None, help="Random seed for repeatable data.")
+        parser.add_argument('--clear', action='store_true', help="Delete the workspace's existing tasks first.")
+        parser.add_argument('--workspace', help="Workspace slug to insert into (default: the default workspace).")
+        parser.add_argument('--keep-triggers', action='store_true',
+                            help="Maintain search, dependency and counter tables row by row instead of "
+                                 "rebuilding them once at the end (cheaper for small batches into large tables).")
+
+        parser.add_argument('--overdue-ratio', type=float, default=0.15,
+                            help="Share of tasks that are already overdue (default 0.15).")
+        parser.add_argument('--max-overdue-days', type=int, default=120,
+                            help="Oldest overdue due date, in days ago (default 120).")
+        parser.add_argument('--horizon-days', type=int, default=60,
+                            help="Latest due date for upcoming tasks, in days (default 60).")
+        parser.add_argument('--importance', choices=['uniform', 'normal', 'skewed'], default='normal',
+                            help="uniform 1-10, normal around 5, or skewed towards low values.")
+        parser.add_argument('--max-hours', type=int, default=16,
+                            help="Largest estimated_hours value (default 16).")
+        parser.add_argument('--hours', choices=['uniform', 'exponential'], default='exponential',
+                            help="exponential gives many quick wins and a long tail.")
+
+        parser.add_argument('--graph', choices=GRAPH_SHAPES, default='dag',
+                            help="Dependency graph shape (default dag).")
+        parser.add_argument('--max-deps', type=int, default=3,
+                            help="Maximum dependencies per task for dag graphs (default 3).")
+        parser.add_argument('--chain-length', type=int, default=10,
+                            help="Tasks per chain for chain graphs (default 10).")
+        parser.add_argument('--fan-in', type=int, default=8,
+                            help="Tasks feeding each sink for fan-in graphs (default 8).")
+        parser.add_argument('--window', type=int, default=1000,
+                            help="How far back (in IDs) dag dependencies may reach (default 1000).")
+        parser.add_argument('--cycle-ratio', type=float, default=0.0,
+                            help="Share of tasks given a forward edge that can close a cycle.")
+
+    def handle(self, *args, **options):
+        count = options['count']
+        if count < 0:
+            raise CommandError("count must be zero or positive.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        if options['format'] == 'db':
+            workspace_id = command_workspace_id(options['workspace'])
+            with nullcontext() if options['keep_triggers'] else triggers_suspended(connection):
+                if options['clear']:
+                    # One set-based statement: QuerySet.delete() would send a signal per row
+                    with connection.cursor() as cursor:
+                        cursor.execute(f"DELETE FROM {connection.ops.quote_name(Task._meta.db_table)} "
+                                       f"WHERE workspace_id = %s", [workspace_id])
+                first_id = (Task.objects.aggregate(Max('id'))['id__max'] or 0) + 1
+                inserted = self.insert(generate_tasks(count, first_id, options), options['batch_size'],
+                                       workspace_id)
+            # After the derived tables are rebuilt, so readers reload consistent data
+            tasks_changed(workspace_id)
+            self.stdout.write(self.style.SUCCESS(f"Inserted {inserted} task(s)."))
+        else:
+            self.emit(generate_tasks(count, 1, options), options)
+
+    def insert(self, rows, batch_size, workspace_id):
+        """
+        Inserts rows with one executemany() per batch.
+
+        This skips model instantiation, which dominates bulk_create() at this
+        volume; values are adapted with the backend's own helpers.
+        """
+        ops = connection.ops
+        sql = task_insert_sql(['id', 'title', 'due_date', 'importance', 'estimated_hours', 'dependencies',
+                               'completed', 'title_key', 'workspace'])
+
+        inserted = 0
+        rows = iter(rows)
+        while True:
+            batch = [
+                (row['id'], row['title'], ops.adapt_datefield_value(row['due_date']), row['importance'],
+                 row['estimated_hours'], ops.adapt_json_value(row['dependencies'], None), False,
+                 title_key(row['title']), workspace_id)
+                for row in islice(rows, batch_size)
+            ]
+            if not batch:
+                break
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, batch)
+            inserted += len(batch)
+            if inserted % (batch_size * 10) == 0:
+                self.stderr.write(f"  {inserted} rows...")
+
+        # IDs were assigned explicitly, so move the sequence past them (no-op on SQLite)
+        with connection.cursor() as cursor:
+            for statement in ops.sequence_reset_sql(no_style(), [Task]):
+                cursor.execute(statement)
+        return inserted
+
+    def emit(self, rows, options):
+        stream = open(options['output'], 'w') if options['output'] else None
+        write = stream.write if stream else (lambda text: self.stdout.write(text, ending=''))
+        try:
+            if options['format'] == 'ndjson':
+                for row in rows:
+                    write(json.dumps(row, default=str) + '\n')
+            else:
+                write('{"tasks": [')
+                for index, row in enumerate(rows):
+                    write((',\n' if index else '\n') + json.dumps(row, default=str))
+                write('\n]}\n')
+        finally:
+            if stream:
+                stream.close()
+
+
+def generate_tasks(count, first_id, options):
+    """
+    Yields `count` task dicts with IDs first_id, first_id + 1, ...
+
+    Dependencies only point at IDs inside the generated range, so the same
+    graph shape is produced whether the rows go to the database or a payload.
+    """
+    rng = Random(options['seed'])
+    today_ordinal = date.today().toordinal()
+    last_id = first_id + count - 1
+
+    overdue_ratio = options['overdue_ratio']
+    max_overdue = max(1, options['max_overdue_days'])
+    horizon = max(0, options['horizon_days'])
+    importance_mode = options['importance']
+    hours_mode = options['hours']
+    max_hours = max(1, options['max_hours'])
+    graph = options['graph']
+    max_deps = options['max_deps']
+    chain_length = max(1, options['chain_length'])
+    group = max(1, options['fan_in']) + 1
+    window = max(1, options['window'])
+    cycle_ratio = options['cycle_ratio']
+
+    for offset in range(count):
+        task_id = first_id + offset
+
+        if rng.random() < overdue_ratio:
+            due = today_ordinal - rng.randint(1, max_overdue)
+        else:
+            due = today_ordinal + rng.randint(0, horizon)
+
+        if importance_mode == 'uniform':
+            importance = rng.randint(1, 10)
+        elif importance_mode == 'normal':
+            importance = min(10, max(1, round(rng.gauss(5, 2))))
+        else:
+            importance = min(10, 1 + int(rng.expovariate(0.5)))
+
+        if hours_mode == 'uniform':
+            hours = rng.randint(1, max_hours)
+        else:
+            hours = min(max_hours, 1 + int(rng.expovariate(0.35)))
+
+        if graph == 'chain':
+            dependencies = [task_id - 1] if offset % chain_length else []
+        elif graph == 'fan-in':
+            # The last task of every group depends on all the others in it
+            position = offset % group
+            dependencies = list(range(task_id - position, task_id)) if position == group - 1 else []
+        elif graph == 'dag':
+            earliest = max(first_id, task_id - window)
+            k = min(task_id - earliest, rng.randint(0, max_deps))
+            dependencies = sorted(rng.sample(range(earliest, task_id), k)) if k else []
+        else:
+            dependencies = []
+
+        if cycle_ratio and task_id < last_id and rng.random() < cycle_ratio:
+            dependencies.append(rng.randint(task_id + 1, min(last_id, task_id + window)))
+
+        yield {
+            'id': task_id,
+            'title': f"{rng.choice(VERBS)} {rng.choice(NOUNS)} #{task_id}",
+            'due_date': date.fromordinal(due),
+            'importance': importance,
+            'estimated_hours': hours,
+            'dependencies': dependencies,
+        }
@@ -0,0 +1,336 @@
+import csv
+import gzip
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+from itertools import islice
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from tasks.bulk import enable_fast_writes, task_insert_sql
+from tasks.dedupe import title_key
+from tasks.models import ImportCheckpoint
+from tasks.serializers import TaskRowValidator
+from tasks.signals import tasks_changed
+from tasks.triggers import triggers_suspended
+from tasks.workspaces import command_workspace_id
+
+INSERT_FIELDS = ['title', 'due_date', 'importance', 'estimated_hours', 'dependencies', 'completed', 'title_key',
+                 'workspace']
+FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+# Extra workers only add IPC when there are no spare cores to run them on
+DEFAULT_WORKERS = min(4, len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream tasks from a CSV or NDJSON file (optionally .gz) into tasks_task. Rows are "
+        "validated with TaskSerializer's rules and inserted in batches, one transaction per "
+        "batch, with a checkpoint in the same transaction so an interrupted import can --resume."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or NDJSON file; a .gz suffix is decompressed on the fly.")
+        parser.add_argument('--format', choices=['auto', 'csv', 'ndjson'], default='auto',
+                            help="Input format (default: from the file extension).")
+        parser.add_argument('--batch-size', type=int, default=10000,
+                            help="Rows per insert / transaction / checkpoint (default 10000).")
+        parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                            help=f"Processes that parse and validate batches (default {DEFAULT_WORKERS}; "
+                                 f"1 does everything in this process).")
+        parser.add_argument('--checkpoint', help="Checkpoint name (default: the file's absolute path).")
+        parser.add_argument('--resume', action='store_true',
+                            help="Continue from the checkpoint left by an interrupted import.")
+        parser.add_argument('--restart', action='store_true',
+                            help="Discard the checkpoint of an interrupted import and start over.")
+        parser.add_argument('--errors', help="Write rejected rows and their errors to this NDJSON file.")
+        parser.add_argument('--max-errors', type=int, default=None,
+                            help="Abort once more than this many rows have been rejected.")
+        parser.add_argument('--progress-every', type=int, default=100000,
+                            help="Report progress every N rows (default 100000, 0 to disable).")
+        parser.add_argument('--no-wal', action='store_true',
+                            help="Leave the SQLite journal mode alone instead of switching to WAL.")
+        parser.add_argument('--workspace', help="Workspace slug to import into (default: the default workspace).")
+        parser.add_argument('--keep-triggers', action='store_true',
+                            help="Maintain search, dependency and counter tables row by row instead of "
+                                 "rebuilding them once at the end (cheaper for small files into large tables).")
+        parser.add_argument('--dry-run', action='store_true', help="Validate only; insert nothing.")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.is_file():
+            raise CommandError(f"{path} does not exist.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        fmt = options['format'] if options['format'] != 'auto' else detect_format(path)
+        workspace_id = command_workspace_id(options['workspace'])
+        dry_run = options['dry_run']
+
+        checkpoint_name = options['checkpoint'] or str(path.resolve())
+        state = self.start_state(path, checkpoint_name, options)
+        if not dry_run and not options['no_wal']:
+            enable_fast_writes()
+
+        sql = task_insert_sql(INSERT_FIELDS)
+        errors_file = open(options['errors'], 'a' if options['resume'] else 'w') if options['errors'] else None
+        progress_every = options['progress_every'] if options['verbosity'] > 0 else 0
+        max_errors = options['max_errors']
+
+        started = time.perf_counter()
+        resumed_rows = state['rows']
+        next_report = resumed_rows + progress_every if progress_every else None
+        reader = RowReader(path, fmt, state)
+        # Derived tables are rebuilt once when the block exits, before readers are notified
+        suspend = not dry_run and not options['keep_triggers']
+        try:
+            batches = prepared_batches(reader, fmt, state['header'], workspace_id, options)
+            with triggers_suspended(connection) if suspend else nullcontext():
+                for (rows, offset), (batch, rejected) in batches:
+                    state['inserted'] += len(batch)
+                    state['rejected'] += len(rejected)
+                    state['rows'] = rows
+                    state['offset'] = offset
+                    if not dry_run:
+                        # Rows and checkpoint commit together: a crash leaves both or neither
+                        with transaction.atomic():
+                            if batch:
+                                with connection.cursor() as cursor:
+                                    cursor.executemany(sql, batch)
+                            save_checkpoint(checkpoint_name, state)
+                    if errors_file:
+                        for number, errors, data in rejected:
+                            errors_file.write(json.dumps({'row': number, 'errors': errors, 'data': data},
+                                                         default=str) + '\n')
+
+                    if max_errors is not None and state['rejected'] > max_errors:
+                        raise CommandError(
+                            f"Aborted after {state['rejected']} rejected rows (--max-errors {max_errors}); "
+                            f"{state['inserted']} rows were inserted. Fix the input and re-run with --resume."
+                        )
+                    if next_report is not None and state['rows'] >= next_report:
+                        self.report(state, state['rows'] - resumed_rows, time.perf_counter() - started)
+                        next_report = state['rows'] + progress_every
+        finally:
+            reader.close()
+            if errors_file:
+                errors_file.close()
+            if state['inserted'] and not dry_run:
+                tasks_changed(workspace_id)
+
+        if not dry_run:
+            ImportCheckpoint.objects.filter(name=checkpoint_name).delete()
+        elapsed = time.perf_counter() - started
+        rate = (state['rows'] - resumed_rows) / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Validated' if dry_run else 'Imported'} {state['inserted']} task(s), "
+            f"rejected {state['rejected']}, in {elapsed:.2f}s ({rate:,.0f} rows/s)."
+        ))
+
+    def start_state(self, path, checkpoint_name, options):
+        stat = path.stat()
+        fresh = {'source': str(path.resolve()), 'size': stat.st_size, 'mtime': stat.st_mtime,
+                 'rows': 0, 'offset': 0, 'header': None, 'inserted': 0, 'rejected': 0}
+        if options['dry_run']:
+            return fresh
+        if options['restart']:
+            ImportCheckpoint.objects.filter(name=checkpoint_name).delete()
+        state = ImportCheckpoint.objects.filter(name=checkpoint_name).values_list('state', flat=True).first()
+        if state is None:
+            if options['resume']:
+                raise CommandError(f"No checkpoint named {checkpoint_name}.")
+            return fresh
+        if not options['resume']:
+            raise CommandError(
+                f"A checkpoint from an earlier import of {checkpoint_name} exists. Re-run with --resume to "
+                f"continue it, or with --restart to start over."
+            )
+
+        if (state.get('source'), state.get('size'), state.get('mtime')) != \
+                (fresh['source'], fresh['size'], fresh['mtime']):
+            raise CommandError(f"{path} has changed since the checkpoint was written; re-run with --restart "
+                               f"to start over.")
+        self.stdout.write(f"Resuming at row {state['rows']} ({state['inserted']} already imported).")
+        return state
+
+    def report(self, state, rows, elapsed):
+        rate = rows / elapsed if elapsed else 0
+        self.stderr.write(f"  {state['rows']:,} rows ({state['inserted']:,} inserted, "
+                          f"{state['rejected']:,} rejected), {rate:,.0f} rows/s")
+
+
+def detect_format(path):
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    if suffixes and suffixes[-1] == '.gz':
+        suffixes.pop()
+    fmt = FORMATS.get(suffixes[-1]) if suffixes else None
+    if fmt is None:
+        raise CommandError(f"Cannot tell the format of {path.name}; pass --format csv or --format ndjson.")
+    return fmt
+
+
+def save_checkpoint(name, state):
+    ImportCheckpoint.objects.update_or_create(name=name, defaults={'state': state})
+
+
+class RowReader:
+    """
+    Iterates (row_number, record) over a CSV or NDJSON file, starting at the
+    checkpoint in `state`. CSV records are lists of strings, NDJSON records
+    are the raw line bytes. `offset` is always the byte position just after
+    the last record returned, which is where a resumed import seeks to.
+    """
+
+    def __init__(self, path, fmt, state):
+        self.handle = gzip.open(path, 'rb') if path.suffix.lower() == '.gz' else open(path, 'rb')
+        self.offset = state['offset']
+        self.number = state['rows']
+        if self.offset:
+            self.handle.seek(self.offset)
+        if fmt == 'csv':
+            self.records = (record for record in csv.reader(self.text_lines()) if record)
+            if state['header'] is None:
+                state['header'] = [name.strip() for name in next(self.records, [])]
+        else:
+            self.records = (line for line in self.byte_lines() if line.strip())
+
+    def byte_lines(self):
+        for line in self.handle:
+            self.offset += len(line)
+            yield line
+
+    def text_lines(self):
+        for line in self.byte_lines():
+            yield line.decode('utf-8-sig' if self.offset == len(line) else 'utf-8')
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        record = next(self.records)
+        self.number += 1
+        return self.number, record
+
+    def close(self):
+        self.handle.close()
+
+
+def prepared_batches(reader, fmt, header, workspace_id, options):
+    """
+    Yields ((last_row_number, offset), (insert_rows, rejected)) per batch, in
+    file order.
+
+    With more than one worker, batches are parsed and validated in forked
+    processes while this one inserts; at most two batches per worker are in
+    flight, so memory stays flat however large the file is.
+    """
+    batch_size = options['batch_size']
+    workers = options['workers']
+
+    def chunks():
+        while True:
+            chunk = list(islice(reader, batch_size))
+            if not chunk:
+                return
+            yield (chunk[-1][0], reader.offset), chunk
+
+    if workers <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        for position, chunk in chunks():
+            yield position, prepare_batch(fmt, header, chunk, workspace_id)
+        return
+
+    with multiprocessing.get_context('fork').Pool(workers) as pool:
+        pending = deque()
+        for position, chunk in chunks():
+            pending.append((position, pool.apply_async(prepare_batch, (fmt, header, chunk, workspace_id))))
+            if len(pending) >= workers * 2:
+                position, result = pending.popleft()
+                yield position, result.get()
+        while pending:
+            position, result = pending.popleft()
+            yield position, result.get()
+
+
+def _json_loader():
+    """orjson.loads when orjson is installed (about 3x faster on NDJSON rows), else json.loads."""
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        return json.loads
+
+
+_loads = _json_loader()
+_validator = None
+
+
+def prepare_batch(fmt, header, chunk, workspace_id):
+    """
+    Parses and validates one batch of (row_number, record) pairs.
+
+    Returns (insert_rows, rejected): parameter tuples for INSERT_FIELDS, and
+    (row_number, errors, data) for every row that failed validation.
+    """
+    global _validator
+    if _validator is None:
+        _validator = TaskRowValidator()
+    validate = _validator.validate
+    ops = connection.ops
+
+    insert_rows = []
+    rejected = []
+    for number, record in chunk:
+        if fmt == 'csv':
+            row = csv_row(header, record)
+        else:
+            try:
+                row = _loads(record)
+            except ValueError as exc:
+                rejected.append((number, {'non_field_errors': [f"Invalid JSON: {exc}"]},
+                                 record.decode(errors='replace')))
+                continue
+            if not isinstance(row, dict):
+                rejected.append((number, {'non_field_errors': ["Expected a JSON object."]}, row))
+                continue
+
+        data, errors = validate(row)
+        if errors:
+            rejected.append((number, errors, row))
+            continue
+        insert_rows.append((
+            data['title'], ops.adapt_datefield_value(data['due_date']), data['importance'],
+            data['estimated_hours'], ops.adapt_json_value(data['dependencies'], None), data['completed'],
+            title_key(data['title']), workspace_id,
+        ))
+    return insert_rows, rejected
+
+
+def csv_row(header, record):
+    """
+    Turns a CSV record into a task dict. Empty cells count as missing, so the
+    model defaults apply; integer and dependency cells are converted here.
+    """
+    row = {name: value for name, value in zip(header, record) if value != ''}
+    for name in ('importance', 'estimated_hours'):
+        value = row.get(name)
+        if value is not None and value.isdigit():
+            row[name] = int(value)
+    if 'dependencies' in row:
+        row['dependencies'] = parse_dependencies(row['dependencies'])
+    return row
+
+
+def parse_dependencies(value):
+    """CSV cells hold dependencies as a JSON list ("[1, 2]") or separated IDs ("1;2" / "1 2")."""
+    value = value.strip()
+    if value.startswith('['):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    parts = value.replace(';', ' ').replace(',', ' ').split()
+    return [int(part) if part.isdigit() else part for part in parts]
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.counters import COUNTER_NAMES, repair_counters
+from tasks.models import Workspace
+from tasks.workspaces import command_workspace_id
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard counters from the task table and repair any that drifted."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workspace', help="Slug of the only workspace to check (default: every workspace).")
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Exit with an error if any counter was wrong (after repairing it).",
+        )
+
+    def handle(self, *args, **options):
+        workspaces = Workspace.objects.order_by('id').values_list('id', 'slug')
+        if options['workspace']:
+            workspaces = workspaces.filter(id=command_workspace_id(options['workspace']))
+
+        repaired = 0
+        for workspace_id, slug in workspaces:
+            counters, mismatches = repair_counters(workspace_id)
+            self.stdout.write(f"[{slug}]")
+            for name in COUNTER_NAMES:
+                if name in mismatches:
+                    stored, actual = mismatches[name]
+                    self.stdout.write(self.style.WARNING(f"  {name}: {actual} (was {stored})"))
+                else:
+                    self.stdout.write(f"  {name}: {counters[name]}")
+            repaired += len(mismatches)
+
+        if repaired and options['check']:
+            raise CommandError(f"Repaired {repaired} counter(s) that had drifted.")
+        if repaired:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {repaired} counter(s)."))
+        else:
+            self.stdout.write(self.style.SUCCESS("All counters are correct."))
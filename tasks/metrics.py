@@ -0,0 +1,149 @@
+"""
+In-process request metrics.
+
+Views mark their hot phases with `phase()`:
+
+    with phase('score'):
+        scores = calculate_scores_batch(...)
+
+While `RequestTimingMiddleware` is active, the time spent in each phase is
+collected per request, sent back in a `Server-Timing` header and aggregated
+into histograms that `/metrics` exposes in Prometheus text format. Outside a
+timed request `phase()` returns a shared no-op context manager, so the hooks
+cost one context-variable lookup when metrics are disabled.
+"""
+import threading
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+from time import perf_counter
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_request_timings = ContextVar('request_timings', default=None)
+_NO_OP = nullcontext()
+
+
+class _Phase:
+    __slots__ = ('timings', 'name', 'start')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = perf_counter() - self.start
+        self.timings[self.name] = self.timings.get(self.name, 0.0) + elapsed
+        return False
+
+
+def phase(name):
+    """Times the enclosed block as `name` for the current request, if it is being timed."""
+    timings = _request_timings.get()
+    if timings is None:
+        return _NO_OP
+    return _Phase(timings, name)
+
+
+def start_request():
+    """Starts collecting phase timings for the current request."""
+    timings = {}
+    return timings, _request_timings.set(timings)
+
+
+def current_timings():
+    """The phase timings of the request being timed, or None."""
+    return _request_timings.get()
+
+
+def finish_request(token):
+    _request_timings.reset(token)
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Registry:
+    """Thread-safe store of histograms and counters for one worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, labels, value):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def register_counter(self, name):
+        """Lists a counter at 0 until it is first incremented."""
+        with self._lock:
+            self.counters.setdefault(name, 0)
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def clear(self):
+        # Counters are reset rather than dropped, so their series never disappear
+        with self._lock:
+            self.histograms.clear()
+            self.counters = dict.fromkeys(self.counters, 0)
+
+    def render(self):
+        """Returns all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = []
+            seen = set()
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# TYPE {name} histogram")
+                base = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+                prefix = base + ',' if base else ''
+                bounds = [repr(bound) for bound in histogram.buckets] + ['+Inf']
+                cumulative = 0
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{base}}} {histogram.sum:.6f}')
+                lines.append(f'{name}_count{{{base}}} {histogram.count}')
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name} {value}")
+            return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# One registry per worker process
+registry = Registry()
+
+SCORE_FALLBACK_COUNTER = 'task_analyzer_score_fallback_total'
+registry.register_counter(SCORE_FALLBACK_COUNTER)
+
+
+def record_score_fallback():
+    """Counts a task that fell back to the neutral score of 50."""
+    registry.increment(SCORE_FALLBACK_COUNTER)
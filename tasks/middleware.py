@@ -0,0 +1,316 @@
+import zlib
+from io import BytesIO
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from . import metrics, profiling
+from .querylog import capture_queries, logger as query_logger
+
+
+class RequestTimingMiddleware:
+    """
+    Records per-phase timings for every request.
+    
+    Adds a `Server-Timing` header (parse, validate, db, score, sort, render and
+    total, in milliseconds) and feeds the histograms served at /metrics. The
+    phases never overlap, so they add up to at most `total`; "render" covers
+    serialization inside the view plus DRF's rendering of the response, and
+    not the work of other middleware afterwards.
+    Enabled with TASKS_METRICS_ENABLED = True; otherwise Django drops it from
+    the middleware chain entirely.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'TASKS_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = perf_counter()
+        timings, token = metrics.start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.finish_request(token)
+
+        total = perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        endpoint = (match.url_name if match else None) or 'unmatched'
+        for name, seconds in timings.items():
+            metrics.registry.observe(
+                'task_analyzer_request_phase_seconds', {'endpoint': endpoint, 'phase': name}, seconds
+            )
+        metrics.registry.observe(
+            'task_analyzer_request_duration_seconds',
+            {'endpoint': endpoint, 'method': request.method, 'status': response.status_code},
+            total
+        )
+
+        timings['total'] = total
+        response['Server-Timing'] = ', '.join(
+            f"{name};dur={seconds * 1000:.3f}" for name, seconds in timings.items()
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook returns; time just
+        # the rendering, which ends with the post-render callbacks
+        timings = metrics.current_timings()
+        if timings is not None:
+            render_start = perf_counter()
+
+            def rendered(response):
+                timings['render'] = timings.get('render', 0.0) + perf_counter() - render_start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class QueryProfilerMiddleware:
+    """
+    Adds X-Query-Count, X-Query-Time-Ms and X-Query-N-Plus-One debug headers to
+    every response and logs suspected N+1 patterns. Opt in with
+    TASKS_QUERY_PROFILER_ENABLED = True.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'TASKS_QUERY_PROFILER_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with capture_queries() as log:
+            response = self.get_response(request)
+
+        suspects = log.n_plus_one
+        for shape, count in suspects.items():
+            query_logger.warning("Possible N+1 on %s: %d x %s", request.path, count, shape)
+
+        response['X-Query-Count'] = str(log.count)
+        response['X-Query-Time-Ms'] = f"{log.total_seconds * 1000:.3f}"
+        response['X-Query-N-Plus-One'] = str(len(suspects))
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Runs a single request under cProfile/tracemalloc when it carries a valid
+    profiling header (see tasks.profiling). Requests without the header only
+    pay for a dictionary lookup. Disabled unless TASKS_PROFILING_TOKEN is set.
+    """
+
+    def __init__(self, get_response):
+        if not profiling.profiling_token():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = profiling.requested_mode(request)
+        if mode is None:
+            return self.get_response(request)
+
+        response, captures = profiling.run_profiled(
+            mode, request.path.strip('/') or 'root', self.get_response, request
+        )
+        response['X-Profile-Captures'] = ', '.join(captures)
+        return response
+
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/x-ndjson', 'application/javascript',
+                      'application/xml')
+
+
+def _zstd_compressor():
+    """
+    Returns a factory for zstd compressors (objects with compress() and
+    flush()), or None when no zstd module is installed.
+    """
+    try:
+        from compression import zstd  # Python 3.14+
+        return lambda level: zstd.ZstdCompressor(level=level)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return lambda level: zstandard.ZstdCompressor(level=level).compressobj()
+    except ImportError:
+        return None
+
+
+def _gzip_compressor(level):
+    return zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+
+class RequestBodyTooLarge(Exception):
+    pass
+
+
+def gunzip_stream(read, limit, chunk_size=64 * 1024):
+    """
+    Decompresses a gzip stream read with `read(n)` (all members), refusing to
+    produce more than `limit` bytes so a small "zip bomb" can't exhaust memory.
+
+    Raises:
+        RequestBodyTooLarge: If the output would exceed `limit`
+        zlib.error: If the data is not valid or complete gzip
+    """
+    out = bytearray()
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    started = False
+    pending = b''
+    while True:
+        data = pending or read(chunk_size)
+        if not data:
+            break
+        started = True
+        out += decompressor.decompress(data, limit + 1 - len(out))
+        if len(out) > limit:
+            raise RequestBodyTooLarge
+        pending = decompressor.unconsumed_tail
+        if decompressor.eof:
+            # Concatenated gzip members form one stream (RFC 1952)
+            pending = decompressor.unused_data
+            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            started = False
+    if started:
+        raise zlib.error("Truncated gzip body")
+    return bytes(out)
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses and decompresses request bodies.
+
+    Responses: the encoding is negotiated from Accept-Encoding (zstd when a
+    zstd module is installed, else gzip). Bodies smaller than
+    TASKS_COMPRESS_MIN_BYTES or of non-text types are sent as they are;
+    streaming responses (such as /export/) are compressed chunk by chunk.
+
+    Requests: bodies sent with `Content-Encoding: gzip` (large /analyze/ and
+    /save-analysis/ payloads) are decompressed before the view parses them.
+    Output is capped at TASKS_MAX_DECOMPRESSED_BYTES (413 beyond it); other
+    encodings get 415.
+
+    Disabled with TASKS_COMPRESSION_ENABLED = False.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'TASKS_COMPRESSION_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.min_bytes = getattr(settings, 'TASKS_COMPRESS_MIN_BYTES', 1024)
+        self.max_request_bytes = getattr(settings, 'TASKS_MAX_DECOMPRESSED_BYTES', 50 * 1024 * 1024)
+        self.gzip_level = getattr(settings, 'TASKS_GZIP_LEVEL', 6)
+        self.zstd_level = getattr(settings, 'TASKS_ZSTD_LEVEL', 3)
+        self.compressors = {'gzip': lambda: _gzip_compressor(self.gzip_level)}
+        zstd = _zstd_compressor()
+        if zstd is not None:
+            self.compressors['zstd'] = lambda: zstd(self.zstd_level)
+
+    def __call__(self, request):
+        encoding = request.META.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if encoding and encoding != 'identity':
+            error = self.decompress_request(request, encoding)
+            if error is not None:
+                return error
+        return self.compress_response(request, self.get_response(request))
+
+    def decompress_request(self, request, encoding):
+        if encoding not in ('gzip', 'x-gzip'):
+            response = JsonResponse({"error": f"Unsupported Content-Encoding '{encoding}'. Use gzip."},
+                                    status=415)
+            response['Accept-Encoding'] = 'gzip'
+            return response
+        try:
+            body = gunzip_stream(request.read, self.max_request_bytes)
+        except RequestBodyTooLarge:
+            return JsonResponse(
+                {"error": f"Decompressed request body exceeds {self.max_request_bytes} bytes."}, status=413
+            )
+        except zlib.error:
+            return JsonResponse({"error": "Request body is not valid gzip."}, status=400)
+
+        # Downstream parsers see a plain body of the decompressed length
+        request._body = body
+        request._stream = BytesIO(body)
+        request._read_started = False
+        request.META['CONTENT_LENGTH'] = str(len(body))
+        del request.META['HTTP_CONTENT_ENCODING']
+        return None
+
+    def compress_response(self, request, response):
+        if response.has_header('Content-Encoding') or response.status_code < 200 or response.status_code == 206:
+            return response
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = self.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = self.compress_stream(response.streaming_content, self.compressors[encoding]())
+            del response['Content-Length']
+        else:
+            if len(response.content) < self.min_bytes:
+                return response
+            compressor = self.compressors[encoding]()
+            compressed = compressor.compress(response.content) + compressor.flush()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and not etag.startswith('W/'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
+
+    @staticmethod
+    def compress_stream(chunks, compressor):
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def negotiate(self, accept_encoding):
+        """
+        Picks the supported coding with the highest q-value (zstd wins ties),
+        or None when nothing is acceptable or identity is explicitly preferred.
+        """
+        best, best_q = None, 0.0
+        wildcard = None
+        offered = {}
+        for part in accept_encoding.split(','):
+            name, _, params = part.strip().partition(';')
+            name = name.strip().lower()
+            q = 1.0
+            for param in params.split(';'):
+                key, _, value = param.strip().partition('=')
+                if key.strip() == 'q':
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            if name == '*':
+                wildcard = q
+            elif name:
+                offered[name] = q
+        for name in ('zstd', 'gzip'):
+            if name not in self.compressors:
+                continue
+            q = offered.get(name, wildcard if wildcard is not None else 0.0)
+            if q > best_q:
+                best, best_q = name, q
+        if best_q < offered.get('identity', 0.0):
+            return None
+        return best
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("original_id", models.BigIntegerField(unique=True)),
+                ("title", models.CharField(max_length=200)),
+                ("due_date", models.DateField()),
+                ("importance", models.IntegerField(default=5)),
+                ("estimated_hours", models.IntegerField(default=1)),
+                ("dependencies", models.JSONField(blank=True, default=list)),
+                ("completed", models.BooleanField(default=False)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="completed",
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
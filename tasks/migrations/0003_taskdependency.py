@@ -0,0 +1,88 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:29
+
+from django.db import migrations, models
+
+# Integer IDs from a task's dependencies array (anything else is ignored, as in scoring)
+DEPENDENCY_IDS = """
+    SELECT DISTINCT {task}, value FROM json_each({dependencies})
+    WHERE json_type({dependencies}) = 'array' AND type = 'integer'
+"""
+
+TRIGGERS = [
+    f"""
+    CREATE TRIGGER tasks_task_dependencies_insert AFTER INSERT ON tasks_task
+    BEGIN
+        INSERT OR IGNORE INTO tasks_taskdependency (task_id, depends_on_id)
+        {DEPENDENCY_IDS.format(task='NEW.id', dependencies='NEW.dependencies')};
+    END
+    """,
+    f"""
+    CREATE TRIGGER tasks_task_dependencies_update AFTER UPDATE OF dependencies ON tasks_task
+    BEGIN
+        DELETE FROM tasks_taskdependency WHERE task_id = OLD.id;
+        INSERT OR IGNORE INTO tasks_taskdependency (task_id, depends_on_id)
+        {DEPENDENCY_IDS.format(task='NEW.id', dependencies='NEW.dependencies')};
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_task_dependencies_delete AFTER DELETE ON tasks_task
+    BEGIN
+        DELETE FROM tasks_taskdependency WHERE task_id = OLD.id;
+    END
+    """,
+]
+
+
+def create_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in TRIGGERS:
+        schema_editor.execute(sql)
+    # Backfill from the rows that already exist
+    schema_editor.execute(
+        "INSERT OR IGNORE INTO tasks_taskdependency (task_id, depends_on_id) "
+        "SELECT tasks_task.id, value FROM tasks_task, json_each(tasks_task.dependencies) "
+        "WHERE json_type(tasks_task.dependencies) = 'array' AND type = 'integer'"
+    )
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for name in ('insert', 'update', 'delete'):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS tasks_task_dependencies_{name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0002_task_completed_archivedtask"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskDependency",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_id", models.BigIntegerField()),
+                ("depends_on_id", models.BigIntegerField(db_index=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("task_id", "depends_on_id"),
+                        name="unique_task_dependency",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
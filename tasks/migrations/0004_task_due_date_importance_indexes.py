@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0003_taskdependency"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="task",
+            name="due_date",
+            field=models.DateField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="importance",
+            field=models.IntegerField(db_index=True, default=5),
+        ),
+    ]
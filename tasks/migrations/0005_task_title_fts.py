@@ -0,0 +1,43 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# The sync triggers and the initial build come from tasks.triggers.install_triggers(),
+# which runs after every migrate.
+CREATE_FTS = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_task_fts USING fts5(
+        title,
+        content='tasks_task',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='1 2 3'
+    )
+"""
+
+
+def create_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(CREATE_FTS)
+    except OperationalError:
+        # SQLite built without FTS5: /search/ falls back to LIKE queries
+        pass
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for name in ('insert', 'update', 'delete'):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS tasks_task_fts_{name}")
+    schema_editor.execute("DROP TABLE IF EXISTS tasks_task_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0004_task_due_date_importance_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
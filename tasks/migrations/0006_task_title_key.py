@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:41
+
+from django.db import migrations, models
+
+
+def backfill_title_keys(apps, schema_editor):
+    from tasks.dedupe import title_key
+
+    Task = apps.get_model('tasks', 'Task')
+    connection = schema_editor.connection
+    table = connection.ops.quote_name(Task._meta.db_table)
+    last_id = 0
+    while True:
+        rows = list(Task.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'title')[:5000])
+        if not rows:
+            break
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {table} SET title_key = %s WHERE id = %s",
+                [(title_key(title), task_id) for task_id, title in rows],
+            )
+        last_id = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0005_task_title_fts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="title_key",
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["due_date", "title_key"], name="task_due_title_key_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_title_keys, migrations.RunPython.noop),
+    ]
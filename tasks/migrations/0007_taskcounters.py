@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:45
+
+from django.db import migrations, models
+
+# The triggers that maintain the counters come from tasks.triggers.install_triggers(),
+# which runs after every migrate; the row itself is computed on first read.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0006_task_title_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskCounters",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("as_of", models.DateField()),
+                ("total", models.IntegerField(default=0)),
+                ("overdue", models.IntegerField(default=0)),
+                ("due_3_days", models.IntegerField(default=0)),
+                ("due_7_days", models.IntegerField(default=0)),
+                ("quick_wins", models.IntegerField(default=0)),
+                ("blocked", models.IntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,100 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Existing tasks, archived tasks and counters all move into this workspace.
+DEFAULT_WORKSPACE_ID = 1
+
+
+def create_default_workspace(apps, schema_editor):
+    Workspace = apps.get_model('tasks', 'Workspace')
+    Workspace.objects.get_or_create(id=DEFAULT_WORKSPACE_ID, defaults={'slug': 'default', 'name': 'Default'})
+
+
+def drop_counter_triggers(apps, schema_editor):
+    # They gain a workspace_id condition; install_triggers() recreates them after migrate
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for name in ('insert', 'update', 'delete'):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS tasks_task_counters_{name}")
+
+
+def clear_counters(apps, schema_editor):
+    # Counters become per workspace; they are recomputed on first read
+    apps.get_model('tasks', 'TaskCounters').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0007_taskcounters"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_counter_triggers, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name="Workspace",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("slug", models.SlugField(unique=True)),
+                ("name", models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.RunPython(create_default_workspace, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="task",
+            name="workspace",
+            field=models.ForeignKey(
+                default=DEFAULT_WORKSPACE_ID,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tasks",
+                to="tasks.workspace",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedtask",
+            name="workspace",
+            field=models.ForeignKey(
+                default=DEFAULT_WORKSPACE_ID,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_tasks",
+                to="tasks.workspace",
+                db_index=False,
+            ),
+        ),
+        migrations.RunPython(clear_counters, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="taskcounters",
+            name="workspace",
+            field=models.OneToOneField(
+                default=DEFAULT_WORKSPACE_ID,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="counters",
+                to="tasks.workspace",
+            ),
+            preserve_default=False,
+        ),
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_due_title_key_idx",
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["workspace", "completed", "due_date"], name="task_ws_open_due_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["workspace", "due_date", "title_key"], name="task_ws_due_title_key_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedtask",
+            index=models.Index(fields=["workspace", "original_id"], name="archived_ws_original_idx"),
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+# The data version moves from the per-process cache into the database, so
+# writes from other processes (management commands, other workers) invalidate
+# every worker's snapshots and cached plans.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0008_workspaces"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workspace",
+            name="version",
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,14 +1,172 @@
 from django.db import models
 
+
+class TaskQuerySet(models.QuerySet):
+    def active(self):
+        """Tasks that still need doing (the hot set scanned by scoring endpoints)."""
+        return self.filter(completed=False)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # bulk_create() skips save(), so fill in the duplicate-detection key here
+        objs = list(objs)
+        for obj in objs:
+            obj.set_title_key()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def update(self, **kwargs):
+        if isinstance(kwargs.get('title'), str):
+            from .dedupe import title_key
+            kwargs['title_key'] = title_key(kwargs['title'])
+        return super().update(**kwargs)
+
+
+# The workspace that existing rows, and requests that name none, belong to
+DEFAULT_WORKSPACE_ID = 1
+
+
+class Workspace(models.Model):
+    """
+    A team's partition of the task table. Every request runs inside one
+    workspace (see tasks.workspaces), and every query, cache and snapshot is
+    scoped to it.
+    """
+    slug = models.SlugField(max_length=50, unique=True)
+    name = models.CharField(max_length=100)
+    # Bumped after every committed write to the workspace's tasks (see tasks.signals)
+    version = models.BigIntegerField(default=0, editable=False)
+
+    def __str__(self):
+        return self.name
+
+
 # Create your models here.
 class Task(models.Model):
+    # Also indexed on its own: on SQLite that index is (workspace_id, id), which
+    # serves the per-workspace listings and exports that page in ID order
+    workspace = models.ForeignKey(Workspace, on_delete=models.CASCADE, default=DEFAULT_WORKSPACE_ID,
+                                  related_name='tasks')
+
     title = models.CharField(max_length=200)
-    due_date = models.DateField()
-    importance = models.IntegerField(default=5) # Scale 1-10
+    due_date = models.DateField(db_index=True)
+    importance = models.IntegerField(default=5, db_index=True) # Scale 1-10
     estimated_hours = models.IntegerField(default=1)
 
     # Simple JSON field to store dependency IDs [1, 2, 3]
     dependencies = models.JSONField(default=list, blank=True)
 
+    # Completed tasks stay here until `manage.py archive_tasks` moves them out
+    completed = models.BooleanField(default=False, db_index=True)
+
+    # Hash of the normalized title, for duplicate detection (see tasks.dedupe)
+    title_key = models.BigIntegerField(null=True, blank=True, editable=False)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Open tasks of one workspace by due date: snapshots, plans, counters
+            models.Index(fields=['workspace', 'completed', 'due_date'], name='task_ws_open_due_idx'),
+            models.Index(fields=['workspace', 'due_date', 'title_key'], name='task_ws_due_title_key_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def set_title_key(self):
+        from .dedupe import title_key
+        self.title_key = title_key(self.title)
+
+    def save(self, *args, **kwargs):
+        self.set_title_key()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'title' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'title_key'}
+        super().save(*args, **kwargs)
+
+
+class ArchivedTask(models.Model):
+    """
+    Cold storage for completed and long-overdue tasks.
+
+    Rows are moved here in batches by `manage.py archive_tasks` so that the
+    `tasks_task` table only holds the working set.
+    """
+    workspace = models.ForeignKey(Workspace, on_delete=models.CASCADE, default=DEFAULT_WORKSPACE_ID,
+                                  related_name='archived_tasks', db_index=False)
+    original_id = models.BigIntegerField(unique=True)
+    title = models.CharField(max_length=200)
+    due_date = models.DateField()
+    importance = models.IntegerField(default=5)
+    estimated_hours = models.IntegerField(default=1)
+    dependencies = models.JSONField(default=list, blank=True)
+    completed = models.BooleanField(default=False)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Exports read a workspace's archive in original ID order
+            models.Index(fields=['workspace', 'original_id'], name='archived_ws_original_idx'),
+        ]
+
     def __str__(self):
         return self.title
+
+
+class TaskDependency(models.Model):
+    """
+    Reverse index of `Task.dependencies`: one row per (task, dependency ID).
+
+    On SQLite it is kept in sync by triggers on `tasks_task` (see
+    `tasks.triggers`), so every write path, including raw-SQL imports,
+    maintains it.
+    Deleting tasks uses it to find the tasks that reference them without
+    scanning every row's JSON.
+    """
+    task_id = models.BigIntegerField()
+    depends_on_id = models.BigIntegerField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task_id', 'depends_on_id'], name='unique_task_dependency'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id} -> {self.depends_on_id}"
+
+
+class TaskCounters(models.Model):
+    """
+    Dashboard totals over one workspace's open tasks, relative to the day in
+    `as_of`.
+
+    One row per workspace, kept current by triggers on `tasks_task` (see
+    `tasks.triggers`) and moved to the current day by `tasks.counters`, so
+    reading the dashboard never scans the task table.
+    """
+    workspace = models.OneToOneField(Workspace, on_delete=models.CASCADE, related_name='counters')
+    as_of = models.DateField()
+    total = models.IntegerField(default=0)
+    overdue = models.IntegerField(default=0)
+    due_3_days = models.IntegerField(default=0)
+    due_7_days = models.IntegerField(default=0)
+    quick_wins = models.IntegerField(default=0)
+    blocked = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Counters as of {self.as_of}"
+
+
+class ImportCheckpoint(models.Model):
+    """
+    Progress of an `import_tasks` run that has not finished yet.
+
+    Written in the same transaction as each inserted batch, so after a crash
+    the checkpoint and the table agree and `--resume` never inserts a batch
+    twice. Deleted when the import completes.
+    """
+    name = models.CharField(max_length=1024, unique=True)
+    state = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.name
@@ -0,0 +1,190 @@
+"""
+Capacity-aware daily planning.
+
+`schedule()` turns open tasks into a day-by-day plan:
+
+1. Dependencies are resolved to a graph over the open tasks (dependencies on
+   completed, archived or unknown tasks count as already done). A Kahn pass
+   finds tasks caught in dependency cycles and tasks that can never be done
+   because they, or something they depend on, exceed the daily capacity.
+2. Days are filled greedily in dependency order. Ready tasks sit in one score
+   heap per `estimated_hours` value, so "the highest-scoring task that still
+   fits in today's remaining hours" is a peek at a handful of heap tops
+   rather than a scan. Finishing a task releases its dependents, which may be
+   scheduled later the same day.
+
+`plan_tasks()` loads one workspace's tasks and caches the result per
+workspace version, so repeat requests cost one cache lookup until a task in
+that workspace changes.
+"""
+import heapq
+from collections import deque
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import DEFAULT_WORKSPACE_ID, Task
+from .scoring import calculate_scores_batch
+from .signals import current_version
+
+PLAN_FIELDS = ('id', 'title', 'due_date', 'importance', 'estimated_hours', 'dependencies')
+
+CYCLE = 'dependency_cycle'
+TOO_LONG = 'exceeds_capacity'
+BLOCKED = 'blocked'
+NO_ROOM = 'beyond_horizon'
+
+
+def schedule(rows, capacity_hours, horizon_days, today=None):
+    """
+    Plans `rows` (tuples in PLAN_FIELDS order) over `horizon_days` days with
+    `capacity_hours` of work per day.
+
+    Returns:
+        dict: {
+            "days": [{"date", "hours_planned", "tasks": [...]}, ...],
+            "unscheduled": [(task_id, reason), ...] in priority order,
+        }
+        where reason is one of dependency_cycle, exceeds_capacity, blocked
+        (waits on a cyclic or oversized task) or beyond_horizon.
+    """
+    today = today or date.today()
+    count = len(rows)
+    scores = calculate_scores_batch(
+        [row[2].toordinal() for row in rows],
+        [row[3] for row in rows],
+        [row[4] for row in rows],
+        [len(row[5]) if isinstance(row[5], list) else 0 for row in rows],
+        today=today,
+    )
+    hours = [max(0, row[4]) for row in rows]
+
+    index = {row[0]: i for i, row in enumerate(rows)}
+    dependents = [[] for _ in range(count)]
+    prerequisites = [[] for _ in range(count)]
+    indegree = [0] * count
+    for i, row in enumerate(rows):
+        if not isinstance(row[5], list):
+            continue
+        for dep_id in set(row[5]):
+            j = index.get(dep_id) if isinstance(dep_id, int) else None
+            if j is not None:
+                dependents[j].append(i)
+                prerequisites[i].append(j)
+                indegree[i] += 1
+
+    # Kahn pass over the whole graph: anything left over is in (or behind) a cycle
+    remaining = indegree[:]
+    queue = deque(i for i in range(count) if not remaining[i])
+    order = []
+    while queue:
+        i = queue.popleft()
+        order.append(i)
+        for k in dependents[i]:
+            remaining[k] -= 1
+            if not remaining[k]:
+                queue.append(k)
+
+    reason = [CYCLE] * count
+    for i in order:
+        reason[i] = None
+    if len(order) < count:
+        # Peel tasks that only sit downstream of a cycle: they are blocked, not cyclic
+        outdegree = {i: sum(1 for k in dependents[i] if reason[k]) for i in range(count) if reason[i]}
+        queue = deque(i for i, degree in outdegree.items() if not degree)
+        while queue:
+            i = queue.popleft()
+            reason[i] = BLOCKED
+            for j in prerequisites[i]:
+                if j in outdegree:
+                    outdegree[j] -= 1
+                    if not outdegree[j]:
+                        queue.append(j)
+    for i in order:
+        if reason[i] is None and hours[i] > capacity_hours:
+            reason[i] = TOO_LONG
+        if reason[i] is not None:
+            for k in dependents[i]:
+                if reason[k] is None:
+                    reason[k] = BLOCKED
+
+    # Ready tasks, bucketed by hours: heap entries are (-score, id, index)
+    buckets = {}
+    for i in range(count):
+        if not indegree[i] and reason[i] is None:
+            buckets.setdefault(hours[i], []).append((-scores[i], rows[i][0], i))
+    for heap in buckets.values():
+        heapq.heapify(heap)
+    bucket_hours = sorted({hours[i] for i in range(count) if reason[i] is None})
+
+    scheduled = [False] * count
+    days = []
+    for offset in range(horizon_days):
+        day = today + timedelta(days=offset)
+        left = capacity_hours
+        planned = []
+        while True:
+            best = None
+            for h in bucket_hours:
+                if h > left:
+                    break
+                heap = buckets.get(h)
+                if heap and (best is None or heap[0] < best[0]):
+                    best = (heap[0], h)
+            if best is None:
+                break
+            _, _, i = heapq.heappop(buckets[best[1]])
+            left -= hours[i]
+            scheduled[i] = True
+            planned.append(i)
+            for k in dependents[i]:
+                indegree[k] -= 1
+                if not indegree[k] and reason[k] is None:
+                    heapq.heappush(buckets.setdefault(hours[k], []), (-scores[k], rows[k][0], k))
+
+        days.append({
+            'date': str(day),
+            'hours_planned': capacity_hours - left,
+            'tasks': [
+                {
+                    'id': rows[i][0],
+                    'title': rows[i][1],
+                    'due_date': str(rows[i][2]),
+                    'importance': rows[i][3],
+                    'estimated_hours': rows[i][4],
+                    'score': scores[i],
+                    'late': rows[i][2] < day,
+                }
+                for i in planned
+            ],
+        })
+
+    unscheduled = sorted(
+        (i for i in range(count) if not scheduled[i]),
+        key=lambda i: (-scores[i], rows[i][0]),
+    )
+    return {
+        'days': days,
+        'unscheduled': [(rows[i][0], reason[i] or NO_ROOM) for i in unscheduled],
+    }
+
+
+def plan_tasks(capacity_hours, horizon_days, today=None, workspace_id=DEFAULT_WORKSPACE_ID):
+    """
+    Plans every open task of a workspace, cached per (workspace, workspace
+    version, day, capacity, horizon).
+
+    The workspace version changes on every write to it, so a cached plan is
+    never stale; the date is part of the key because scores depend on it.
+    """
+    today = today or date.today()
+    version = current_version(workspace_id)
+    key = f'tasks:plan:{workspace_id}:{version}:{today}:{capacity_hours}:{horizon_days}'
+    plan = cache.get(key)
+    if plan is None:
+        rows = list(Task.objects.active().filter(workspace_id=workspace_id).order_by('id')
+                    .values_list(*PLAN_FIELDS))
+        plan = schedule(rows, capacity_hours, horizon_days, today=today)
+        cache.set(key, plan, getattr(settings, 'TASKS_PLAN_CACHE_TIMEOUT', 3600))
+    return plan
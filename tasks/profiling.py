@@ -0,0 +1,134 @@
+"""
+On-demand profiling of individual requests.
+
+A request carrying `X-Profile: cpu|memory|all` together with `X-Profile-Token`
+matching TASKS_PROFILING_TOKEN is run under cProfile and/or tracemalloc. The
+capture is written to TASKS_PROFILE_DIR, which keeps only the newest
+TASKS_PROFILE_KEEP files, and can be listed through /api/tasks/profiles/.
+
+Both are read from headers only, never the query string: URLs end up in
+access logs, Referer headers and browser history, and the token with them.
+
+Memory profiling is for development only. tracemalloc traces every thread
+of the process, so in a threaded server one profiled request would slow down
+and be charged for all concurrent requests. It is therefore only honoured with
+DEBUG = True: otherwise "all" captures CPU only and "memory" is ignored.
+cProfile only follows the profiled request's thread and is always available.
+
+    python -m pstats profiles/<capture>.pstats
+"""
+import hmac
+import re
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+MODES = {'cpu', 'memory', 'all'}
+DEFAULT_KEEP = 50
+TOP_ALLOCATIONS = 50
+
+CAPTURE_SUFFIXES = ('.pstats', '.tracemalloc.txt')
+_UNSAFE = re.compile(r'[^A-Za-z0-9_-]+')
+
+
+def profiling_token():
+    return getattr(settings, 'TASKS_PROFILING_TOKEN', None)
+
+
+def profile_dir():
+    return Path(getattr(settings, 'TASKS_PROFILE_DIR', settings.BASE_DIR / 'profiles'))
+
+
+def is_authorized(token):
+    expected = profiling_token()
+    return bool(expected and token and hmac.compare_digest(str(token), str(expected)))
+
+
+def requested_mode(request):
+    """Returns the profiling mode a request asks for, or None (cheap check first)."""
+    mode = request.META.get('HTTP_X_PROFILE')
+    token = request.META.get('HTTP_X_PROFILE_TOKEN')
+    if mode not in MODES or not is_authorized(token):
+        return None
+    if mode != 'cpu' and not memory_profiling_allowed():
+        return 'cpu' if mode == 'all' else None
+    return mode
+
+
+def memory_profiling_allowed():
+    # tracemalloc is process-global; see the module docstring
+    return settings.DEBUG
+
+
+def run_profiled(mode, label, func, *args):
+    """
+    Calls func(*args) under the requested profilers and stores the captures.
+    
+    Returns:
+        tuple: (func result, list of capture file names)
+    """
+    # Imported here so workers that never profile don't load them at boot
+    import cProfile
+    import tracemalloc
+
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{_UNSAFE.sub('_', label)[:40]}-{uuid.uuid4().hex[:8]}"
+
+    profiler = cProfile.Profile() if mode in ('cpu', 'all') else None
+    trace_memory = mode in ('memory', 'all') and not tracemalloc.is_tracing()
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        if profiler:
+            result = profiler.runcall(func, *args)
+        else:
+            result = func(*args)
+    finally:
+        snapshot = tracemalloc.take_snapshot() if trace_memory else None
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+        if trace_memory:
+            tracemalloc.stop()
+
+    captures = []
+    if profiler:
+        path = directory / f"{stem}.pstats"
+        profiler.dump_stats(path)
+        captures.append(path.name)
+    if snapshot:
+        path = directory / f"{stem}.tracemalloc.txt"
+        lines = [f"Peak traced memory: {peak / 1024:.1f} KiB", ""]
+        lines += [str(stat) for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]]
+        path.write_text('\n'.join(lines) + '\n')
+        captures.append(path.name)
+
+    rotate(directory)
+    return result, captures
+
+
+def list_captures():
+    """Returns metadata for the stored captures, newest first."""
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    captures = []
+    for path in directory.iterdir():
+        if path.is_file() and path.name.endswith(CAPTURE_SUFFIXES):
+            stat = path.stat()
+            captures.append({
+                'name': path.name,
+                'kind': 'cpu' if path.suffix == '.pstats' else 'memory',
+                'size': stat.st_size,
+                'created': stat.st_mtime,
+            })
+    return sorted(captures, key=lambda c: (c['created'], c['name']), reverse=True)
+
+
+def rotate(directory):
+    """Deletes all but the newest TASKS_PROFILE_KEEP captures."""
+    keep = getattr(settings, 'TASKS_PROFILE_KEEP', DEFAULT_KEEP)
+    for capture in list_captures()[keep:]:
+        (directory / capture['name']).unlink(missing_ok=True)
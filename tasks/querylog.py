@@ -0,0 +1,116 @@
+"""
+Query instrumentation.
+
+`capture_queries()` wraps database execution (via `connection.execute_wrapper`)
+to count queries and SQL time, log slow queries with the line of project code
+that issued them, and flag query shapes repeated often enough to look like an
+N+1 pattern. `tasks.middleware.QueryProfilerMiddleware` applies it to every request when
+TASKS_QUERY_PROFILER_ENABLED is set, and `assert_max_queries()` applies it to
+tests.
+"""
+import logging
+import re
+import traceback
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('tasks.queries')
+
+DEFAULT_SLOW_QUERY_MS = 100
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+_THIS_FILE = str(Path(__file__).resolve())
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+
+def normalize_sql(sql):
+    """Reduces a statement to its shape: literals and IN-lists collapsed."""
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _STRING.sub('?', sql)
+    return _NUMBER.sub('?', sql)
+
+
+def query_origin():
+    """Returns "file:line in function" for the innermost project frame."""
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if (filename.startswith(_PROJECT_ROOT) and filename != _THIS_FILE
+                and 'site-packages' not in filename):
+            return f"{Path(filename).relative_to(_PROJECT_ROOT)}:{frame.lineno} in {frame.name}"
+    return 'unknown'
+
+
+class QueryLog:
+    """Execute wrapper that records every query run while it is installed."""
+
+    def __init__(self, slow_query_ms=None, n_plus_one_threshold=None):
+        if slow_query_ms is None:
+            slow_query_ms = getattr(settings, 'TASKS_SLOW_QUERY_MS', DEFAULT_SLOW_QUERY_MS)
+        if n_plus_one_threshold is None:
+            n_plus_one_threshold = getattr(settings, 'TASKS_N_PLUS_ONE_THRESHOLD', DEFAULT_N_PLUS_ONE_THRESHOLD)
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.count = 0
+        self.total_seconds = 0.0
+        self.queries = []
+        self.shapes = Counter()
+        self.slow_queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = perf_counter() - start
+            self.count += 1
+            self.total_seconds += elapsed
+            self.queries.append(sql)
+            self.shapes[normalize_sql(sql)] += 1
+            if elapsed >= self.slow_query_seconds:
+                origin = query_origin()
+                self.slow_queries.append({'sql': sql, 'ms': elapsed * 1000, 'origin': origin})
+                logger.warning("Slow query (%.1f ms) from %s: %s", elapsed * 1000, origin, sql)
+
+    @property
+    def n_plus_one(self):
+        """Query shapes executed at least n_plus_one_threshold times, with their counts."""
+        return {
+            shape: count for shape, count in self.shapes.items()
+            if count >= self.n_plus_one_threshold
+        }
+
+
+@contextmanager
+def capture_queries(**options):
+    """Records all queries on every database connection inside the block."""
+    log = QueryLog(**options)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(log))
+        yield log
+
+
+@contextmanager
+def assert_max_queries(max_count, **options):
+    """
+    Test helper: fails if the block runs more than `max_count` queries.
+    
+        with assert_max_queries(2):
+            client.post('/api/tasks/save-analysis/', ...)
+    """
+    with capture_queries(**options) as log:
+        yield log
+    if log.count > max_count:
+        listing = '\n'.join(f"{i}. {sql}" for i, sql in enumerate(log.queries, 1))
+        raise AssertionError(
+            f"{log.count} queries executed, expected at most {max_count}:\n{listing}"
+        )
@@ -1,5 +1,7 @@
 from datetime import date
 
+from .metrics import record_score_fallback
+
 def calculate_task_score(task_data):
     """
     Calculates a priority score for a task.
@@ -89,6 +91,54 @@ def calculate_task_score(task_data):
         # Fallback: If something goes wrong, return a neutral score
         # This prevents crashes from malformed input
         print(f"Warning: Error calculating score for task: {e}")
+        record_score_fallback()
         return 50  # Neutral middle score
 
 
+
+def calculate_scores_batch(due_ordinals, importances, estimated_hours, dependency_counts, today=None):
+    """
+    Scores many tasks at once from column data.
+    
+    Produces exactly the same numbers as calculate_task_score, but works on
+    parallel sequences (lists or typed arrays) instead of one dict per task,
+    so callers can score stored rows without building dicts or model objects.
+    
+    Args:
+        due_ordinals (sequence): date.toordinal() of each due date (None = no due date)
+        importances (sequence): Importance of each task (clamped to 1-10)
+        estimated_hours (sequence): Estimated hours of each task
+        dependency_counts (sequence): Number of dependencies of each task
+        today (date): Reference date (defaults to date.today())
+    
+    Returns:
+        list: One score per task, in input order
+    """
+    today_ordinal = (today or date.today()).toordinal()
+    due_soon = today_ordinal + 3
+    due_this_week = today_ordinal + 7
+    
+    scores = []
+    append = scores.append
+    for due, importance, hours, dependency_count in zip(
+        due_ordinals, importances, estimated_hours, dependency_counts
+    ):
+        # 1. Urgency
+        if due is None or due > due_this_week:
+            score = 0
+        elif due < today_ordinal:
+            score = 100
+        elif due <= due_soon:
+            score = 50
+        else:
+            score = 25
+        
+        # 2. Importance, 3. Quick wins, 4. Dependencies
+        score += max(1, min(10, importance)) * 5
+        if hours < 2:
+            score += 10
+        score -= dependency_count * 30
+        
+        append(score if score > 0 else 0)
+    
+    return scores
@@ -0,0 +1,94 @@
+"""
+Title search.
+
+On SQLite the search runs against `tasks_task_fts`, an external-content FTS5
+index over `tasks_task.title` kept in sync by triggers (see `tasks.triggers`).
+FTS5 keeps extra prefix indexes for one to three characters, so autocomplete
+queries are index lookups too. Results are ranked with bm25, over at most
+TASKS_SEARCH_MAX_CANDIDATES matches: computing bm25 for every one of a
+million rows that start with "f" would take seconds, so a very common term is
+ranked within its first matches (in ID order) rather than the whole table.
+Other backends, and SQLite builds without FTS5, fall back to one
+`title__icontains` filter per word with no ranking.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Task
+
+FTS_TABLE = 'tasks_task_fts'
+SEARCH_FIELDS = ('id', 'title', 'due_date', 'importance', 'estimated_hours', 'dependencies', 'completed')
+
+_fts_available = {}
+
+
+def search_terms(text):
+    """Words in a search string, as the FTS5 unicode61 tokenizer splits them."""
+    return re.findall(r'\w+', text or '')
+
+
+def fts_query(terms, prefix=True):
+    """
+    Builds an FTS5 MATCH expression that ANDs every term. Each term is quoted,
+    so user input can never be read as FTS5 syntax; with prefix=True the last
+    term also matches longer words ("auth" -> "authentication").
+    """
+    query = ' '.join(f'"{term}"' for term in terms)
+    return query + '*' if prefix else query
+
+
+def fts_available():
+    """True when the FTS5 title index exists on this connection's database."""
+    if connection.vendor != 'sqlite':
+        return False
+    key = connection.settings_dict['NAME']
+    if key not in _fts_available:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts_available[key] = cursor.fetchone() is not None
+    return _fts_available[key]
+
+
+def search_tasks(terms, queryset=None, prefix=True, limit=20):
+    """
+    Finds tasks whose titles contain every term.
+
+    Args:
+        terms (list): Words from search_terms()
+        queryset (QuerySet): Task queryset the matches must also satisfy
+            (e.g. due-date and importance filters); defaults to all tasks
+        prefix (bool): Let the last term match as a prefix
+        limit (int): Most rows to return
+
+    Returns:
+        list: (row, relevance) pairs, best match first, where row is a tuple
+        in SEARCH_FIELDS order and relevance is the negated bm25 score
+        (higher is better), or None without FTS5
+    """
+    queryset = (Task.objects.all() if queryset is None else queryset).order_by()
+
+    if not fts_available():
+        for term in terms:
+            queryset = queryset.filter(title__icontains=term)
+        return [(row, None) for row in queryset.order_by('id').values_list(*SEARCH_FIELDS)[:limit]]
+
+    # The filtered queryset is joined to the FTS match, so SQLite drives the
+    # query from the index and checks the filters on matching rows only; the
+    # inner LIMIT stops after `candidates` matches before anything is sorted
+    source_sql, source_params = queryset.values('id').query.sql_with_params()
+    candidates = max(limit, getattr(settings, 'TASKS_SEARCH_MAX_CANDIDATES', 1000))
+    sql = (
+        f"SELECT id, relevance FROM ("
+        f"SELECT source.id AS id, -{FTS_TABLE}.rank AS relevance FROM {FTS_TABLE} "
+        f"JOIN ({source_sql}) source ON source.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s LIMIT %s"
+        f") ORDER BY relevance DESC, id LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, (*source_params, fts_query(terms, prefix), candidates, limit))
+        matches = cursor.fetchall()
+
+    rows = {row[0]: row for row in Task.objects.filter(id__in=[m[0] for m in matches]).values_list(*SEARCH_FIELDS)}
+    return [(rows[task_id], relevance) for task_id, relevance in matches if task_id in rows]
@@ -1,8 +1,139 @@
+import re
+from datetime import date
+
 from rest_framework import serializers
-from .models import Task
+from rest_framework.exceptions import ValidationError
+
+from .models import Task, ArchivedTask
 
 
 class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
-        fields = ['id', 'title', 'due_date', 'importance', 'estimated_hours', 'dependencies']
+        fields = ['id', 'title', 'due_date', 'importance', 'estimated_hours', 'dependencies', 'completed']
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    # Archived rows keep the ID they had in the live table
+    id = serializers.IntegerField(source='original_id')
+    archived = serializers.BooleanField(default=True, read_only=True)
+
+    class Meta:
+        model = ArchivedTask
+        fields = ['id', 'title', 'due_date', 'importance', 'estimated_hours', 'dependencies', 'completed',
+                  'archived', 'archived_at']
+
+
+ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+class TaskRowValidator:
+    """
+    Validates plain task dicts with TaskSerializer's field rules, without
+    building a serializer per row (used by bulk loaders such as import_tasks).
+
+    Values that already have the common type (ISO date strings, ints, bools)
+    are checked inline against the same limits; anything else is handed to the
+    serializer field itself, so both paths accept and reject the same input.
+    """
+
+    def __init__(self):
+        self.fields = {name: field for name, field in TaskSerializer().fields.items() if not field.read_only}
+        self.title_max_length = self.fields['title'].max_length
+        self.int_limits = {
+            name: (self.fields[name].min_value, self.fields[name].max_value)
+            for name in ('importance', 'estimated_hours')
+        }
+        model_fields = {field.name: field for field in Task._meta.concrete_fields}
+        self.defaults = {
+            name: model_fields[name].get_default
+            for name, field in self.fields.items() if not field.required
+        }
+
+    def validate(self, row):
+        """
+        Returns (data, errors). `data` holds the validated values with model
+        defaults filled in; `errors` is shaped like serializer.errors.
+        """
+        data = self._validate_common(row)
+        if data is not None:
+            return data, {}
+
+        data = {}
+        errors = {}
+        for name, field in self.fields.items():
+            if name not in row:
+                if field.required:
+                    errors[name] = [str(field.error_messages['required'])]
+                else:
+                    data[name] = self.defaults[name]()
+                continue
+            value = row[name]
+            try:
+                data[name] = self._validate_value(name, field, value)
+            except ValidationError as exc:
+                errors[name] = [str(message) for message in exc.detail]
+        return data, errors
+
+    def _validate_common(self, row):
+        """
+        Whole-row fast path for the shape nearly every row has. Returns None as
+        soon as anything needs the per-field checks.
+        """
+        title = row.get('title')
+        due_date = row.get('due_date')
+        if type(title) is not str or type(due_date) is not str or not title.isascii():
+            return None
+        title = title.strip()
+        if not title or len(title) > self.title_max_length or '\x00' in title or not ISO_DATE.match(due_date):
+            return None
+        try:
+            due_date = date.fromisoformat(due_date)
+        except ValueError:
+            return None
+
+        data = {'title': title, 'due_date': due_date}
+        for name in ('importance', 'estimated_hours'):
+            if name in row:
+                value = row[name]
+                low, high = self.int_limits[name]
+                if type(value) is not int or not low <= value <= high:
+                    return None
+                data[name] = value
+            else:
+                data[name] = self.defaults[name]()
+        if 'dependencies' in row:
+            dependencies = row['dependencies']
+            if type(dependencies) is not list or not all(type(item) is int for item in dependencies):
+                return None
+            data['dependencies'] = dependencies
+        else:
+            data['dependencies'] = self.defaults['dependencies']()
+        if 'completed' in row:
+            if type(row['completed']) is not bool:
+                return None
+            data['completed'] = row['completed']
+        else:
+            data['completed'] = self.defaults['completed']()
+        return data
+
+    def _validate_value(self, name, field, value):
+        value_type = type(value)
+        if name == 'title' and value_type is str and value.isascii():
+            stripped = value.strip()
+            if stripped and len(stripped) <= self.title_max_length and '\x00' not in stripped:
+                return stripped
+        elif name == 'due_date' and value_type is str and ISO_DATE.match(value):
+            try:
+                return date.fromisoformat(value)
+            except ValueError:
+                pass
+        elif name in self.int_limits and value_type is int:
+            low, high = self.int_limits[name]
+            if low <= value <= high:
+                return value
+        elif name == 'completed' and value_type is bool:
+            return value
+        elif name == 'dependencies' and value_type is list and all(type(item) is int for item in value):
+            return value
+        return field.run_validation(value)
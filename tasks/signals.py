@@ -0,0 +1,73 @@
+"""
+Change tracking for the task table.
+
+Every committed write to `Task` bumps its workspace's `version` column (or,
+when the writer doesn't know which workspace it touched, every workspace's).
+Readers that keep derived data in memory (see `tasks.snapshot`) or cache it
+(plans, counters) compare against that version and only reload when it has
+moved, so a write in one workspace never invalidates another's. The version
+lives in the database rather than in Django's cache, so writes made by other
+processes (management commands, other workers) are seen as well; checking it
+is one primary-key lookup.
+
+The bump is part of the writing transaction, so other connections see the
+new version exactly when they see the new data. Versions are nanosecond
+timestamps (or one more than the previous version if that is larger), so
+they never repeat, even after a rollback or a database restore: derived data
+built from rolled-back writes can't match a later version, and cache keys
+built from versions stay unambiguous.
+"""
+import time
+
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import DEFAULT_WORKSPACE_ID, Task, Workspace
+
+
+def current_version(workspace_id=DEFAULT_WORKSPACE_ID):
+    """Returns the workspace's current version (0 if the workspace is gone)."""
+    version = Workspace.objects.filter(pk=workspace_id).values_list('version', flat=True).first()
+    return version or 0
+
+
+def bump_version(workspace_id=None):
+    """Marks one workspace (or, without one, every workspace) as changed."""
+    workspaces = Workspace.objects.all() if workspace_id is None else Workspace.objects.filter(pk=workspace_id)
+    workspaces.update(version=Greatest(F('version') + 1, Value(time.time_ns())))
+
+
+def tasks_changed(workspace_id=None):
+    """
+    Call after writes that bypass model signals (QuerySet.update(), bulk_create(),
+    raw SQL) so in-memory snapshots get refreshed. Pass the workspace when the
+    write stayed inside one; without it every workspace's readers reload.
+    """
+    bump_version(workspace_id)
+
+
+def _apply_to_snapshot(task, apply):
+    from .snapshot import snapshots
+
+    snapshot = snapshots.peek(task.workspace_id)
+    previous = snapshot.version if snapshot is not None else None
+    if previous is not None:
+        # Compare-and-set: it only succeeds if nobody (in any process) changed
+        # the workspace since the snapshot was built, so patching is safe
+        version = max(previous + 1, time.time_ns())
+        if Workspace.objects.filter(pk=task.workspace_id, version=previous).update(version=version):
+            snapshot.apply_change(previous, version, apply)
+            return
+    bump_version(task.workspace_id)
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, **kwargs):
+    _apply_to_snapshot(instance, lambda snap: snap.upsert(instance))
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    _apply_to_snapshot(instance, lambda snap: snap.remove(instance.id))
@@ -0,0 +1,180 @@
+"""
+Per-worker, array-backed snapshots of each workspace's active tasks.
+
+A snapshot keeps one typed array per scoring input so read-only endpoints can
+score every open task with `calculate_scores_batch` without querying the
+database or instantiating models. It is refreshed lazily: a full reload when
+its workspace's version (see `tasks.signals`) moved, and an in-place patch when
+the change was made by this worker and nothing else changed the workspace in
+between. Each workspace has
+its own snapshot, so loading one costs that workspace's size, not the table's.
+"""
+import threading
+from array import array
+from collections import OrderedDict
+from datetime import date
+
+from django.conf import settings
+
+from .models import DEFAULT_WORKSPACE_ID, Task
+from .scoring import calculate_scores_batch
+
+
+class TaskSnapshot:
+    def __init__(self, workspace_id=DEFAULT_WORKSPACE_ID):
+        self._lock = threading.RLock()
+        self.workspace_id = workspace_id
+        self.version = None
+        self._reset()
+
+    def _reset(self):
+        self.ids = array('q')
+        self.due_ordinals = array('l')
+        self.importances = array('l')
+        self.estimated_hours = array('l')
+        self.dependency_counts = array('l')
+        self.titles = []
+        self._positions = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def load(self, version):
+        """Rebuilds the snapshot from the database with a single projected query."""
+        with self._lock:
+            self._reset()
+            rows = Task.objects.active().filter(workspace_id=self.workspace_id).values_list(
+                'id', 'title', 'due_date', 'importance', 'estimated_hours', 'dependencies'
+            )
+            for row in rows.iterator(chunk_size=2000):
+                self._append(*row)
+            self.version = version
+
+    def refresh(self):
+        """Reloads the snapshot if its workspace changed since it was built."""
+        from .signals import current_version
+
+        version = current_version(self.workspace_id)
+        if version != self.version:
+            self.load(version)
+        return self
+
+    def apply_change(self, previous, version, apply):
+        """
+        Patches the snapshot in place for a single committed change that moved
+        the workspace from `previous` to `version`, provided the snapshot was
+        at `previous`. Otherwise the next refresh() reloads it.
+        """
+        with self._lock:
+            if self.version is not None and self.version == previous:
+                apply(self)
+                self.version = version
+
+    def upsert(self, task):
+        with self._lock:
+            if task.completed:
+                self.remove(task.id)
+                return
+            position = self._positions.get(task.id)
+            if position is None:
+                self._append(task.id, task.title, task.due_date, task.importance,
+                             task.estimated_hours, task.dependencies)
+                return
+            due_date = task.due_date
+            if isinstance(due_date, str):
+                due_date = date.fromisoformat(due_date)
+            self.titles[position] = task.title
+            self.due_ordinals[position] = due_date.toordinal()
+            self.importances[position] = task.importance
+            self.estimated_hours[position] = task.estimated_hours
+            self.dependency_counts[position] = _dependency_count(task.dependencies)
+
+    def remove(self, task_id):
+        with self._lock:
+            position = self._positions.pop(task_id, None)
+            if position is None:
+                return
+            # Swap the last row into the hole so removal stays O(1)
+            last = len(self.ids) - 1
+            if position != last:
+                for column in (self.ids, self.due_ordinals, self.importances,
+                               self.estimated_hours, self.dependency_counts, self.titles):
+                    column[position] = column[last]
+                self._positions[self.ids[position]] = position
+            for column in (self.ids, self.due_ordinals, self.importances,
+                           self.estimated_hours, self.dependency_counts, self.titles):
+                column.pop()
+
+    def _append(self, task_id, title, due_date, importance, estimated_hours, dependencies):
+        if isinstance(due_date, str):
+            due_date = date.fromisoformat(due_date)
+        self._positions[task_id] = len(self.ids)
+        self.ids.append(task_id)
+        self.titles.append(title)
+        self.due_ordinals.append(due_date.toordinal())
+        self.importances.append(importance)
+        self.estimated_hours.append(estimated_hours)
+        self.dependency_counts.append(_dependency_count(dependencies))
+
+    def top(self, limit, today=None):
+        """
+        Scores every task in the snapshot and returns the `limit` best ones.
+        
+        Returns:
+            list: Dicts with id, title, due_date, importance, estimated_hours and score
+        """
+        with self._lock:
+            scores = calculate_scores_batch(
+                self.due_ordinals, self.importances, self.estimated_hours,
+                self.dependency_counts, today=today
+            )
+            ids = self.ids
+            # Ties are broken by ID so the order doesn't depend on snapshot layout
+            best = sorted(range(len(scores)), key=lambda i: (-scores[i], ids[i]))[:limit]
+            return [
+                {
+                    'id': self.ids[i],
+                    'title': self.titles[i],
+                    'due_date': date.fromordinal(self.due_ordinals[i]),
+                    'importance': self.importances[i],
+                    'estimated_hours': self.estimated_hours[i],
+                    'score': scores[i],
+                }
+                for i in best
+            ]
+
+
+def _dependency_count(dependencies):
+    return len(dependencies) if isinstance(dependencies, list) else 0
+
+
+class SnapshotRegistry:
+    """
+    The worker's snapshots, one per workspace, created on first use. Only the
+    TASKS_SNAPSHOT_MAX_WORKSPACES most recently used are kept, so memory is
+    bounded by the busiest workspaces rather than by every tenant.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = OrderedDict()
+
+    def get(self, workspace_id):
+        """The workspace's snapshot, not necessarily up to date (call refresh())."""
+        with self._lock:
+            snapshot = self._snapshots.get(workspace_id)
+            if snapshot is None:
+                snapshot = self._snapshots[workspace_id] = TaskSnapshot(workspace_id)
+                while len(self._snapshots) > getattr(settings, 'TASKS_SNAPSHOT_MAX_WORKSPACES', 32):
+                    self._snapshots.popitem(last=False)
+            else:
+                self._snapshots.move_to_end(workspace_id)
+            return snapshot
+
+    def peek(self, workspace_id):
+        """The workspace's snapshot if this worker has one, else None."""
+        return self._snapshots.get(workspace_id)
+
+
+# One registry per worker process
+snapshots = SnapshotRegistry()
@@ -1,10 +1,38 @@
+from django.apps import apps
 from django.test import TestCase, Client
 from django.urls import reverse
 from rest_framework import status
 from datetime import date, timedelta
-from .models import Task
-from .scoring import calculate_task_score
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from io import BytesIO, StringIO
+from .models import (DEFAULT_WORKSPACE_ID, Task, ArchivedTask, ImportCheckpoint, TaskCounters, TaskDependency,
+                     Workspace)
+from .serializers import TaskSerializer, TaskRowValidator
+from .bulk import dependents_of, task_insert_sql
+from .export import export_chunks
+from .planner import schedule
+from . import search as search_module
+from .dedupe import find_duplicates, normalize_title, title_key
+from .management.commands.import_tasks import save_checkpoint
+from .counters import compute_counters, dashboard_counters
+from .archive import archivable_tasks, archive_queryset, archive_tasks
+from .middleware import CompressionMiddleware, gunzip_stream
+from .binary import MEDIA_TYPE, decode_columns, decode_scores, encode_columns, rank
+from .scoring import calculate_task_score, calculate_scores_batch
+from .snapshot import SnapshotRegistry, TaskSnapshot, snapshots
+from .triggers import DERIVED_TABLES, triggers_suspended
+from .signals import current_version
+from . import metrics
+from .querylog import assert_max_queries, capture_queries, normalize_sql
+from django.test import override_settings
+from unittest import skipUnless
+from unittest.mock import patch
+import tempfile
+import csv
+import gzip
 import json
+from pathlib import Path
 
 
 # ============================================
@@ -539,3 +567,1908 @@ class TaskIntegrationTest(TestCase):
         
         # Should match
         self.assertEqual(analyzed_score, direct_score)
+
+
+# ============================================
+# ARCHIVE TESTS
+# ============================================
+
+class TaskArchiveTest(TestCase):
+    """Test completion state and the archive tier"""
+    
+    def setUp(self):
+        """Create open, completed and long-overdue tasks"""
+        self.client = Client()
+        self.today = date.today()
+        self.open_task = Task.objects.create(
+            title="Open Task",
+            due_date=self.today + timedelta(days=2),
+            importance=6
+        )
+        self.done_task = Task.objects.create(
+            title="Done Task",
+            due_date=self.today + timedelta(days=1),
+            importance=9,
+            completed=True
+        )
+        self.stale_task = Task.objects.create(
+            title="Stale Task",
+            due_date=self.today - timedelta(days=90),
+            importance=3
+        )
+    
+    def test_complete_task(self):
+        """Test marking a task as completed"""
+        response = self.client.post(reverse('tasks:complete_task', args=[self.open_task.id]))
+        self.assertEqual(response.status_code, 200)
+        self.open_task.refresh_from_db()
+        self.assertTrue(self.open_task.completed)
+    
+    def test_complete_nonexistent_task(self):
+        """Test completing a task that doesn't exist"""
+        response = self.client.post(reverse('tasks:complete_task', args=[9999]))
+        self.assertEqual(response.status_code, 404)
+    
+    def test_suggest_skips_completed(self):
+        """Test that completed tasks are never suggested"""
+        data = self.client.get(reverse('tasks:suggest')).json()
+        titles = [task['title'] for task in data['top_tasks']]
+        self.assertNotIn("Done Task", titles)
+    
+    def test_archive_command_moves_tasks(self):
+        """Test that completed and long-overdue tasks are moved in batches"""
+        out = StringIO()
+        call_command('archive_tasks', '--batch-size', '1', stdout=out)
+        self.assertIn("Archived 2 task(s)", out.getvalue())
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ["Open Task"])
+        archived = ArchivedTask.objects.get(original_id=self.done_task.id)
+        self.assertTrue(archived.completed)
+        self.assertTrue(ArchivedTask.objects.filter(original_id=self.stale_task.id).exists())
+    
+    def test_archive_command_dry_run(self):
+        """Test that a dry run leaves the tables untouched"""
+        out = StringIO()
+        call_command('archive_tasks', '--dry-run', stdout=out)
+        self.assertIn("2 task(s) would be archived", out.getvalue())
+        self.assertEqual(Task.objects.count(), 3)
+        self.assertEqual(ArchivedTask.objects.count(), 0)
+
+    def test_archive_batch_query_count_is_constant(self):
+        """Test a batch costs the same queries whatever its size (no per-row delete signals)"""
+        for count in (10, 500):
+            Task.objects.bulk_create([Task(title=f"Old {i}", due_date=self.today - timedelta(days=60))
+                                      for i in range(count)])
+            # One batch (select IDs, workspaces, INSERT ... SELECT, DELETE, version bump), then an
+            # empty one; the rest are savepoints
+            with self.assertNumQueries(12):
+                archived = archive_tasks(archivable_tasks(), batch_size=1000)
+            self.assertEqual(archived, count + (2 if count == 10 else 0))
+
+    def test_archive_command_workspace(self):
+        """Test --workspace only archives that workspace's tasks and only bumps its version"""
+        acme = Workspace.objects.create(slug='acme', name="Acme")
+        Task.objects.create(title="Acme done", due_date=self.today, completed=True, workspace=acme)
+        default_version = current_version(DEFAULT_WORKSPACE_ID)
+        call_command('archive_tasks', '--workspace', 'acme', stdout=StringIO())
+        self.assertEqual(list(ArchivedTask.objects.values_list('title', flat=True)), ["Acme done"])
+        self.assertEqual(Task.objects.count(), 3)
+        self.assertEqual(current_version(DEFAULT_WORKSPACE_ID), default_version)
+        with self.assertRaises(CommandError):
+            call_command('archive_tasks', '--workspace', 'nope', stdout=StringIO())
+    
+    def test_list_include_archived(self):
+        """Test that archived tasks are only listed on request"""
+        call_command('archive_tasks', stdout=StringIO())
+        data = self.client.get(reverse('tasks:task_list')).json()
+        self.assertEqual(len(data), 1)
+        
+        data = self.client.get(reverse('tasks:task_list'), {'include_archived': '1'}).json()
+        self.assertEqual(len(data), 3)
+        archived = [task for task in data if task.get('archived')]
+        self.assertEqual({task['id'] for task in archived}, {self.done_task.id, self.stale_task.id})
+
+
+# ============================================
+# BATCH SCORING & SNAPSHOT TESTS
+# ============================================
+
+class BatchScoringTest(TestCase):
+    """Test that the batch scorer matches calculate_task_score"""
+    
+    def test_matches_single_task_scoring(self):
+        """Test batch scores against the scalar scorer across all branches"""
+        today = date.today()
+        tasks = [
+            {'due_date': today + timedelta(days=offset), 'importance': importance,
+             'estimated_hours': hours, 'dependencies': list(range(deps))}
+            for offset in (-400, -1, 0, 3, 4, 7, 8, 30)
+            for importance in (-3, 1, 5, 10, 14)
+            for hours in (0, 1, 2, 8)
+            for deps in (0, 1, 3)
+        ]
+        scores = calculate_scores_batch(
+            [t['due_date'].toordinal() for t in tasks],
+            [t['importance'] for t in tasks],
+            [t['estimated_hours'] for t in tasks],
+            [len(t['dependencies']) for t in tasks],
+            today=today
+        )
+        self.assertEqual(scores, [calculate_task_score(t) for t in tasks])
+    
+    def test_missing_due_date(self):
+        """Test that a missing due date gets no urgency bonus"""
+        self.assertEqual(calculate_scores_batch([None], [5], [1], [0]), [35])
+
+
+class TaskSnapshotTest(TestCase):
+    """Test the in-memory columnar snapshot"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.today = date.today()
+        self.urgent = Task.objects.create(title="Urgent", due_date=self.today, importance=9)
+        self.later = Task.objects.create(title="Later", due_date=self.today + timedelta(days=20))
+        self.done = Task.objects.create(title="Done", due_date=self.today, importance=10, completed=True)
+    
+    def test_load_skips_completed(self):
+        """Test that only open tasks are loaded"""
+        snap = TaskSnapshot()
+        snap.load(version=1)
+        self.assertEqual(sorted(snap.ids), sorted([self.urgent.id, self.later.id]))
+    
+    def test_upsert_and_remove(self):
+        """Test incremental updates keep columns aligned"""
+        snap = TaskSnapshot()
+        snap.load(version=1)
+        self.later.importance = 10
+        snap.upsert(self.later)
+        snap.remove(self.urgent.id)
+        snap.upsert(Task(id=999, title="New", due_date=self.today, importance=2, dependencies=[1]))
+        self.assertEqual(list(snap.ids), [self.later.id, 999])
+        self.assertEqual(snap.titles, ["Later", "New"])
+        self.assertEqual(list(snap.importances), [10, 2])
+        self.assertEqual(list(snap.dependency_counts), [0, 1])
+        self.later.completed = True
+        snap.upsert(self.later)
+        self.assertEqual(list(snap.ids), [999])
+    
+    def test_apply_change_requires_current_version(self):
+        """Test that a stale snapshot is not patched"""
+        snap = TaskSnapshot()
+        snap.load(version=5)
+        snap.apply_change(6, 7, lambda s: s.remove(self.urgent.id))
+        self.assertEqual(snap.version, 5)
+        self.assertEqual(len(snap), 2)
+        snap.apply_change(5, 9, lambda s: s.remove(self.urgent.id))
+        self.assertEqual(snap.version, 9)
+        self.assertEqual(len(snap), 1)
+    
+    def test_top_matches_scoring(self):
+        """Test that top() ranks by calculate_task_score"""
+        snap = TaskSnapshot()
+        snap.load(version=1)
+        best = snap.top(1, today=self.today)[0]
+        self.assertEqual(best['id'], self.urgent.id)
+        self.assertEqual(best['score'], calculate_task_score({
+            'due_date': self.today, 'importance': 9, 'estimated_hours': 1, 'dependencies': []
+        }))
+    
+    def test_suggest_only_checks_the_version(self):
+        """Test that suggest only reads the workspace version when nothing changed"""
+        self.client.get(reverse('tasks:suggest'))
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('tasks:suggest'))
+        self.assertEqual(response.json()['top_tasks'][0]['id'], self.urgent.id)
+    
+    def test_writes_invalidate_snapshot(self):
+        """Test that saving a task bumps its workspace's version"""
+        snapshots.get(DEFAULT_WORKSPACE_ID).refresh()
+        version = current_version(DEFAULT_WORKSPACE_ID)
+        Task.objects.create(title="Fresh", due_date=self.today - timedelta(days=1), importance=10)
+        self.assertNotEqual(current_version(DEFAULT_WORKSPACE_ID), version)
+        data = self.client.get(reverse('tasks:suggest')).json()
+        self.assertEqual(data['top_tasks'][0]['title'], "Fresh")
+
+    def test_writes_from_another_process_invalidate(self):
+        """Test that a management command run elsewhere is seen by this worker"""
+        stale = Task.objects.create(title="Stale", due_date=self.today - timedelta(days=30), importance=10)
+        self.assertEqual(self.client.get(reverse('tasks:suggest')).json()['top_tasks'][0]['id'], stale.id)
+        self.assertEqual(self.client.get('/api/tasks/plan/').data['scheduled_count'], 3)
+
+        # The command runs with its own cache and its own (empty) snapshots
+        other_cache = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                   'LOCATION': 'other-process'}}
+        with override_settings(CACHES=other_cache), \
+                patch('tasks.snapshot.snapshots', SnapshotRegistry()):
+            call_command('archive_tasks', '--overdue-days', '7', stdout=StringIO())
+
+        data = self.client.get(reverse('tasks:suggest')).json()
+        self.assertNotIn(stale.id, [t['id'] for t in data['top_tasks']])
+        self.assertEqual(self.client.get('/api/tasks/plan/').data['scheduled_count'], 2)
+        ids = [t['id'] for t in self.client.get(reverse('tasks:task_list')).json()]
+        self.assertNotIn(stale.id, ids)
+
+
+# ============================================
+# STORED ANALYSIS TESTS
+# ============================================
+
+class StoredAnalyzeTest(TestCase):
+    """Test /analyze/ on stored tasks selected by ID or filter"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.today = date.today()
+        self.soon = Task.objects.create(
+            title="Soon", due_date=self.today + timedelta(days=1), importance=8
+        )
+        self.later = Task.objects.create(
+            title="Later", due_date=self.today + timedelta(days=30), importance=4,
+            dependencies=[self.soon.id]
+        )
+        self.done = Task.objects.create(
+            title="Done", due_date=self.today, importance=9, completed=True
+        )
+    
+    def post(self, payload):
+        return self.client.post(
+            reverse('tasks:analyze'),
+            data=json.dumps(payload),
+            content_type='application/json'
+        )
+    
+    def test_analyze_by_ids(self):
+        """Test scoring stored tasks by ID"""
+        response = self.post({'ids': [self.later.id, self.soon.id, 9999]})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual([t['id'] for t in data['tasks']], [self.soon.id, self.later.id])
+        self.assertEqual(data['missing_ids'], [9999])
+        self.assertEqual(data['tasks'][1]['dependencies'], [self.soon.id])
+        self.assertEqual(data['tasks'][0]['score'], calculate_task_score({
+            'due_date': self.soon.due_date, 'importance': 8, 'estimated_hours': 1, 'dependencies': []
+        }))
+    
+    def test_analyze_by_filter(self):
+        """Test scoring stored open tasks matching a filter"""
+        response = self.post({'filter': {'min_importance': 5}})
+        self.assertEqual([t['id'] for t in response.json()['tasks']], [self.soon.id])
+        
+        response = self.post({'filter': {'due_from': str(self.today + timedelta(days=2))}})
+        self.assertEqual([t['id'] for t in response.json()['tasks']], [self.later.id])
+    
+    def test_analyze_stored_uses_one_query(self):
+        """Test that stored analysis is a single projected query"""
+        with self.assertNumQueries(1):
+            self.post({'filter': {}})
+    
+    def test_analyze_many_ids(self):
+        """Test more IDs than SQLite's historical 999-variable limit are queried in chunks"""
+        import sqlite3
+        from django.db import connection
+        connection.ensure_connection()
+        previous = connection.connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        self.addCleanup(connection.connection.setlimit, sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, previous)
+        ids = [self.later.id, self.soon.id] + list(range(100000, 102000))
+        response = self.post({'ids': ids})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([t['id'] for t in response.json()['tasks']], [self.soon.id, self.later.id])
+        self.assertEqual(len(response.json()['missing_ids']), 2000)
+    
+    def test_analyze_stored_invalid(self):
+        """Test validation of IDs and filters"""
+        self.assertEqual(self.post({'ids': 'all'}).status_code, 400)
+        self.assertEqual(self.post({'filter': {'due_to': 'tomorrow'}}).status_code, 400)
+        self.assertEqual(self.post({'filter': {'min_importance': 'high'}}).status_code, 400)
+
+
+# ============================================
+# METRICS TESTS
+# ============================================
+
+@override_settings(TASKS_METRICS_ENABLED=True)
+class RequestMetricsTest(TestCase):
+    """Test Server-Timing headers and the Prometheus endpoint"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.today = date.today()
+        metrics.registry.clear()
+    
+    def test_server_timing_header(self):
+        """Test that analyze reports its phases"""
+        response = self.client.post(
+            reverse('tasks:analyze'),
+            data=json.dumps({'tasks': [{'title': 'A', 'due_date': str(self.today)}]}),
+            content_type='application/json'
+        )
+        phases = [part.split(';')[0] for part in response['Server-Timing'].split(', ')]
+        for name in ('parse', 'validate', 'score', 'sort', 'render', 'total'):
+            self.assertIn(name, phases)
+    
+    def test_phases_fit_in_total(self):
+        """Test phases don't overlap: together they never exceed the total"""
+        Task.objects.bulk_create(Task(title=f"Task {i}", due_date=self.today) for i in range(200))
+        for _ in range(5):
+            response = self.client.get(reverse('tasks:task_list'), HTTP_ACCEPT_ENCODING='gzip')
+            timings = {}
+            for part in response['Server-Timing'].split(', '):
+                name, _, duration = part.partition(';dur=')
+                timings[name] = float(duration)
+            self.assertIn('render', timings)
+            total = timings.pop('total')
+            self.assertLessEqual(sum(timings.values()), total + 0.01)
+    
+    def test_metrics_endpoint(self):
+        """Test that /metrics exposes histograms and the fallback counter"""
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('task_analyzer_score_fallback_total 0', body)
+        self.client.get(reverse('tasks:task_list'))
+        calculate_task_score({'due_date': 'invalid-date'})
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn(
+            'task_analyzer_request_phase_seconds_count{endpoint="task_list",phase="db"} 1', body
+        )
+        self.assertIn('le="+Inf"', body)
+        self.assertIn('task_analyzer_score_fallback_total 1', body)
+    
+    def test_metrics_endpoint_is_guarded(self):
+        """Test /metrics only answers allowed addresses, and not at all when disabled"""
+        response = self.client.get(reverse('metrics'), REMOTE_ADDR='203.0.113.7')
+        self.assertEqual(response.status_code, 403)
+        with self.settings(TASKS_METRICS_ALLOWED_IPS=['203.0.113.7']):
+            self.assertEqual(self.client.get(reverse('metrics'), REMOTE_ADDR='203.0.113.7').status_code, 200)
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        with self.settings(TASKS_METRICS_ENABLED=False):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+    
+    def test_no_header_when_disabled(self):
+        """Test that no Server-Timing header is sent unless metrics are enabled"""
+        with self.settings(TASKS_METRICS_ENABLED=False):
+            response = Client().get(reverse('tasks:task_list'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_phase_is_noop_outside_requests(self):
+        """Test that hooks cost nothing when no request is being timed"""
+        self.assertIs(metrics.phase('score'), metrics.phase('db'))
+
+
+# ============================================
+# QUERY PROFILER TESTS
+# ============================================
+
+class QueryProfilerTest(TestCase):
+    """Test query counting, N+1 detection and the query budget helper"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.today = date.today()
+    
+    def test_normalize_sql(self):
+        """Test that literals and IN-lists collapse to one shape"""
+        self.assertEqual(
+            normalize_sql('SELECT * FROM t WHERE id IN (%s, %s) AND x = 5'),
+            normalize_sql('SELECT * FROM t WHERE id IN (%s) AND x = 17')
+        )
+    
+    def test_detects_n_plus_one(self):
+        """Test that repeated query shapes are flagged"""
+        ids = [Task.objects.create(title=f"T{i}", due_date=self.today).id for i in range(6)]
+        with capture_queries(n_plus_one_threshold=5) as log:
+            for task_id in ids:
+                Task.objects.get(id=task_id)
+        self.assertEqual(log.count, 6)
+        self.assertEqual(list(log.n_plus_one.values()), [6])
+    
+    def test_slow_queries_logged_with_origin(self):
+        """Test that queries over the threshold are logged with their origin"""
+        with self.assertLogs('tasks.queries', level='WARNING') as logs:
+            with capture_queries(slow_query_ms=0) as log:
+                Task.objects.count()
+        self.assertEqual(len(log.slow_queries), 1)
+        self.assertIn('tasks/tests.py', log.slow_queries[0]['origin'])
+        self.assertIn('Slow query', logs.output[0])
+    
+    def test_assert_max_queries_fails_over_budget(self):
+        """Test the query budget helper"""
+        with self.assertRaises(AssertionError):
+            with assert_max_queries(1):
+                Task.objects.count()
+                Task.objects.count()
+    
+    def test_save_analysis_query_budget(self):
+        """Test that saving many tasks does not issue one query per task"""
+        payload = {'tasks': [
+            {'title': f'Bulk {i}', 'due_date': str(self.today), 'importance': 5}
+            for i in range(25)
+        ]}
+        with assert_max_queries(3):
+            response = self.client.post(
+                reverse('tasks:save_analysis'),
+                data=json.dumps(payload),
+                content_type='application/json'
+            )
+        data = response.json()
+        self.assertEqual(data['saved'], 25)
+        self.assertTrue(all(task['id'] for task in data['saved_tasks']))
+    
+    @override_settings(TASKS_QUERY_PROFILER_ENABLED=True)
+    def test_debug_headers(self):
+        """Test that the middleware reports query stats in headers"""
+        response = self.client.get(reverse('tasks:task_list'))
+        self.assertEqual(response['X-Query-Count'], '1')
+        self.assertIn('X-Query-Time-Ms', response)
+        self.assertEqual(response['X-Query-N-Plus-One'], '0')
+
+
+# ============================================
+# PROFILING TESTS
+# ============================================
+
+class RequestProfilingTest(TestCase):
+    """Test on-demand request profiling"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.settings_override = override_settings(
+            TASKS_PROFILING_TOKEN='secret',
+            TASKS_PROFILE_DIR=self.tmp.name,
+            TASKS_PROFILE_KEEP=2
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        self.payload = json.dumps({'tasks': [{'title': 'A', 'due_date': str(date.today())}]})
+    
+    def analyze(self, **headers):
+        return self.client.post(
+            reverse('tasks:analyze'), data=self.payload, content_type='application/json', headers=headers
+        )
+    
+    def test_capture_with_valid_token(self):
+        """Test that a privileged request is profiled and listed"""
+        with self.settings(DEBUG=True):
+            response = self.analyze(**{'X-Profile': 'all', 'X-Profile-Token': 'secret'})
+        self.assertEqual(response.status_code, 200)
+        captures = response['X-Profile-Captures'].split(', ')
+        self.assertEqual(len(captures), 2)
+        
+        listing = self.client.get(reverse('tasks:list_profiles'), headers={'X-Profile-Token': 'secret'})
+        self.assertEqual({c['name'] for c in listing.json()['captures']}, set(captures))
+        
+        download = self.client.get(
+            reverse('tasks:download_profile', args=[captures[0]]), headers={'X-Profile-Token': 'secret'}
+        )
+        self.assertEqual(download.status_code, 200)
+    
+    def test_memory_profiling_needs_debug(self):
+        """Test process-wide tracemalloc is never started outside development"""
+        response = self.analyze(**{'X-Profile': 'all', 'X-Profile-Token': 'secret'})
+        self.assertTrue(response['X-Profile-Captures'].endswith('.pstats'))
+        self.assertNotIn(',', response['X-Profile-Captures'])
+        response = self.analyze(**{'X-Profile': 'memory', 'X-Profile-Token': 'secret'})
+        self.assertNotIn('X-Profile-Captures', response)
+    
+    def test_invalid_token_is_not_profiled(self):
+        """Test that a wrong token runs the request normally"""
+        response = self.analyze(**{'X-Profile': 'cpu', 'X-Profile-Token': 'wrong'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Captures', response)
+        listing = self.client.get(reverse('tasks:list_profiles'), headers={'X-Profile-Token': 'wrong'})
+        self.assertEqual(listing.status_code, 403)
+    
+    def test_token_in_query_string_is_ignored(self):
+        """Test the token is only accepted from a header, never from the URL"""
+        response = self.client.post(
+            reverse('tasks:analyze') + '?_profile=cpu&_profile_token=secret',
+            data=self.payload, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Profile-Captures', response)
+        response = self.analyze(**{'X-Profile': 'cpu'})
+        self.assertNotIn('X-Profile-Captures', response)
+    
+    def test_captures_rotate(self):
+        """Test that only the newest captures are kept"""
+        for _ in range(3):
+            self.analyze(**{'X-Profile': 'cpu', 'X-Profile-Token': 'secret'})
+        listing = self.client.get(reverse('tasks:list_profiles'), headers={'X-Profile-Token': 'secret'})
+        self.assertEqual(listing.json()['count'], 2)
+
+
+# ============================================
+# DATA GENERATOR TESTS
+# ============================================
+
+class GenerateTasksCommandTest(TestCase):
+    """Test the synthetic data generator"""
+
+    def test_clear_is_one_delete(self):
+        """Test --clear removes the workspace's tasks with one statement and bumps its version once"""
+        Task.objects.bulk_create([Task(title=f"Old {i}", due_date=date.today()) for i in range(50)])
+        with capture_queries() as log:
+            call_command('generate_tasks', '3', '--clear', '--seed', '1', stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(sum(1 for sql in log.queries if sql.startswith('DELETE FROM "tasks_task"')), 1)
+        self.assertEqual(sum(1 for sql in log.queries if sql.startswith('UPDATE "tasks_workspace"')), 1)
+        self.assertEqual(Task.objects.count(), 3)
+        self.assertEqual(self.client.get('/api/tasks/search/', {'q': 'old'}).json()['count'], 0)
+
+    def test_inserts_chain_graph(self):
+        """Test bulk inserting a chain-shaped dependency graph"""
+        existing = Task.objects.create(title="Existing", due_date=date.today())
+        call_command('generate_tasks', '7', '--graph', 'chain', '--chain-length', '3',
+                     '--batch-size', '2', '--seed', '1', stdout=StringIO(), stderr=StringIO())
+        tasks = list(Task.objects.exclude(id=existing.id).order_by('id'))
+        self.assertEqual(len(tasks), 7)
+        self.assertEqual(tasks[0].id, existing.id + 1)
+        self.assertEqual(tasks[0].dependencies, [])
+        self.assertEqual(tasks[1].dependencies, [tasks[0].id])
+        self.assertEqual(tasks[3].dependencies, [])
+        self.assertTrue(all(1 <= task.importance <= 10 for task in tasks))
+    
+    def test_overdue_ratio(self):
+        """Test that the overdue share is honoured"""
+        call_command('generate_tasks', '20', '--overdue-ratio', '1', stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(Task.objects.filter(due_date__lt=date.today()).count(), 20)
+    
+    def test_emits_ndjson_payload(self):
+        """Test writing an NDJSON payload instead of inserting"""
+        out = StringIO()
+        call_command('generate_tasks', '5', '--format', 'ndjson', '--graph', 'fan-in', '--fan-in', '4',
+                     '--seed', '3', stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row['id'] for row in rows], [1, 2, 3, 4, 5])
+        self.assertEqual(rows[4]['dependencies'], [1, 2, 3, 4])
+        self.assertEqual(Task.objects.count(), 0)
+
+
+# ============================================
+# IMPORT COMMAND TESTS
+# ============================================
+
+class ImportTasksCommandTest(TestCase):
+    """Test the streaming CSV / NDJSON importer"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def run_import(self, *args):
+        out = StringIO()
+        call_command('import_tasks', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+    
+    def test_imports_csv(self):
+        """Test CSV rows are validated, defaulted and inserted"""
+        path = self.dir / 'tasks.csv'
+        path.write_text(
+            "title,due_date,importance,estimated_hours,dependencies\n"
+            "Write docs,2025-12-01,7,3,\"[1, 2]\"\n"
+            "  Fix bug  ,2025-12-02,,,1;3\n"
+            ",2025-12-03,5,1,\n"
+            "Bad date,2025-02-30,5,1,\n"
+        )
+        errors = self.dir / 'errors.ndjson'
+        self.run_import(str(path), '--errors', str(errors))
+        
+        tasks = list(Task.objects.order_by('id'))
+        self.assertEqual([task.title for task in tasks], ['Write docs', 'Fix bug'])
+        self.assertEqual(tasks[0].dependencies, [1, 2])
+        self.assertEqual((tasks[1].importance, tasks[1].estimated_hours), (5, 1))
+        self.assertEqual(tasks[1].dependencies, [1, 3])
+        rejected = [json.loads(line) for line in errors.read_text().splitlines()]
+        self.assertEqual([row['row'] for row in rejected], [3, 4])
+        self.assertIn('title', rejected[0]['errors'])
+        self.assertIn('due_date', rejected[1]['errors'])
+        self.assertFalse(ImportCheckpoint.objects.exists())
+    
+    def test_imports_gzipped_ndjson(self):
+        """Test NDJSON input, including gzip and invalid lines"""
+        path = self.dir / 'tasks.ndjson.gz'
+        lines = [json.dumps({'title': f'Task {i}', 'due_date': '2025-12-01', 'importance': 3})
+                 for i in range(5)] + ['not json', '[1, 2]']
+        path.write_bytes(gzip.compress('\n'.join(lines).encode()))
+        output = self.run_import(str(path), '--batch-size', '2')
+        self.assertEqual(Task.objects.count(), 5)
+        self.assertIn('rejected 2', output)
+    
+    def test_parallel_workers_keep_file_order(self):
+        """Test batches validated in worker processes are inserted in order"""
+        path = self.dir / 'tasks.ndjson'
+        path.write_text(''.join(json.dumps({'title': f'Task {i}', 'due_date': '2025-12-01'}) + '\n'
+                                for i in range(50)))
+        self.run_import(str(path), '--batch-size', '3', '--workers', '2')
+        self.assertEqual(list(Task.objects.order_by('id').values_list('title', flat=True)),
+                         [f'Task {i}' for i in range(50)])
+    
+    def test_matches_serializer_rules(self):
+        """Test the row validator accepts and rejects exactly what TaskSerializer does"""
+        validator = TaskRowValidator()
+        rows = [
+            {'title': 'x' * 200, 'due_date': '2025-01-01'},
+            {'title': 'x' * 201, 'due_date': '2025-01-01'},
+            {'title': 'Task', 'due_date': '2025-W01-1'},
+            {'title': 'Task', 'due_date': '2025-01-01', 'importance': '8', 'completed': 'true'},
+            {'title': 'Task', 'due_date': '2025-01-01', 'importance': 2.5},
+            {'title': 'Tâche', 'due_date': '2025-01-01', 'dependencies': 'abc'},
+            {'due_date': '2025-01-01'},
+        ]
+        for row in rows:
+            serializer = TaskSerializer(data=row)
+            data, errors = validator.validate(dict(row))
+            self.assertEqual(serializer.is_valid(), not errors, row)
+            if not errors:
+                self.assertEqual(dict(serializer.validated_data), {k: v for k, v in data.items()
+                                                                    if k in serializer.validated_data})
+            else:
+                self.assertEqual(set(serializer.errors), set(errors))
+    
+    def test_resumes_from_checkpoint(self):
+        """Test an aborted import continues after the last committed batch"""
+        path = self.dir / 'tasks.ndjson'
+        rows = [{'title': f'Task {i}', 'due_date': '2025-12-01'} for i in range(6)]
+        rows[3] = {'title': ''}
+        path.write_text('\n'.join(json.dumps(row) for row in rows) + '\n')
+        
+        with self.assertRaises(CommandError):
+            self.run_import(str(path), '--batch-size', '2', '--max-errors', '0')
+        self.assertEqual(Task.objects.count(), 3)
+        checkpoint = ImportCheckpoint.objects.get(name=str(path.resolve())).state
+        self.assertEqual(checkpoint['rows'], 4)
+        
+        with self.assertRaises(CommandError):
+            self.run_import(str(path))  # refuses to start over silently
+        output = self.run_import(str(path), '--resume')
+        self.assertIn('Resuming at row 4', output)
+        self.assertEqual(sorted(Task.objects.values_list('title', flat=True)),
+                         ['Task 0', 'Task 1', 'Task 2', 'Task 4', 'Task 5'])
+    
+    def test_checkpoint_commits_with_the_batch(self):
+        """Test a crash before the checkpoint is saved also rolls back the batch, so --resume inserts it once"""
+        path = self.dir / 'tasks.ndjson'
+        path.write_text(''.join(json.dumps({'title': f'Task {i}', 'due_date': '2025-12-01'}) + '\n'
+                                for i in range(6)))
+        saves = []
+
+        def crash_on_second_batch(name, state):
+            saves.append(state['rows'])
+            if len(saves) == 2:
+                raise KeyboardInterrupt
+            save_checkpoint(name, state)
+
+        with patch('tasks.management.commands.import_tasks.save_checkpoint', crash_on_second_batch):
+            with self.assertRaises(KeyboardInterrupt):
+                self.run_import(str(path), '--batch-size', '2', '--workers', '1')
+        self.assertEqual(Task.objects.count(), 2)
+        self.assertEqual(ImportCheckpoint.objects.get().state['rows'], 2)
+
+        self.run_import(str(path), '--resume')
+        self.assertEqual(sorted(Task.objects.values_list('title', flat=True)), [f'Task {i}' for i in range(6)])
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_restart_discards_checkpoint(self):
+        """Test --restart starts an interrupted import over"""
+        path = self.dir / 'tasks.ndjson'
+        path.write_text(json.dumps({'title': 'Task', 'due_date': '2025-12-01'}) + '\n')
+        ImportCheckpoint.objects.create(name=str(path.resolve()), state={'rows': 1})
+        with self.assertRaises(CommandError):
+            self.run_import(str(path))
+        self.run_import(str(path), '--restart')
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_resumes_csv_after_header(self):
+        """Test a resumed CSV import keeps the header from the checkpoint"""
+        path = self.dir / 'tasks.csv'
+        path.write_text("title,due_date\nA,2025-12-01\nB,2025-12-02\nC,bad\nD,2025-12-04\n")
+        with self.assertRaises(CommandError):
+            self.run_import(str(path), '--batch-size', '3', '--max-errors', '0')
+        self.run_import(str(path), '--resume')
+        self.assertEqual(sorted(Task.objects.values_list('title', flat=True)), ['A', 'B', 'D'])
+    
+    def test_dry_run(self):
+        """Test --dry-run validates without inserting"""
+        path = self.dir / 'tasks.jsonl'
+        path.write_text(json.dumps({'title': 'Task', 'due_date': '2025-12-01'}) + '\n')
+        output = self.run_import(str(path), '--dry-run')
+        self.assertIn('Validated 1 task(s)', output)
+        self.assertEqual(Task.objects.count(), 0)
+
+    def test_rebuilds_derived_tables_once(self):
+        """Test the triggers are suspended during the load and the derived tables rebuilt after it"""
+        from django.db import connection
+        first = Task.objects.create(title="Existing", due_date=date.today())
+        path = self.dir / 'tasks.ndjson'
+        path.write_text(''.join(json.dumps({'title': f'Imported {i}', 'due_date': str(date.today()),
+                                            'dependencies': [first.id]}) + '\n' for i in range(5)))
+        with capture_queries() as queries:
+            self.run_import(str(path), '--batch-size', '2')
+        self.assertTrue(any(sql.startswith('DROP TRIGGER') for sql in queries.queries))
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")
+            self.assertEqual(cursor.fetchone()[0], sum(len(triggers) for triggers, _ in DERIVED_TABLES.values()))
+        self.assertEqual(TaskDependency.objects.filter(depends_on_id=first.id).count(), 5)
+        self.assertEqual(self.client.get('/api/tasks/search/', {'q': 'imported'}).json()['count'], 5)
+        self.assertEqual(dashboard_counters()['total'], 6)
+
+    def test_keep_triggers(self):
+        """Test --keep-triggers maintains the derived tables row by row"""
+        path = self.dir / 'tasks.ndjson'
+        path.write_text(json.dumps({'title': 'Imported', 'due_date': str(date.today())}) + '\n')
+        with capture_queries() as queries:
+            self.run_import(str(path), '--keep-triggers')
+        self.assertFalse(any('TRIGGER' in sql for sql in queries.queries))
+        self.assertEqual(self.client.get('/api/tasks/search/', {'q': 'imported'}).json()['count'], 1)
+
+
+# ============================================
+# EXPORT TESTS
+# ============================================
+
+class ExportTest(TestCase):
+    """Test the streaming /export/ endpoint"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.today = date.today()
+        self.first = Task.objects.create(title="First, with comma", due_date=self.today, importance=9,
+                                         estimated_hours=1, dependencies=[])
+        self.second = Task.objects.create(title="Second", due_date=self.today + timedelta(days=10),
+                                          importance=3, estimated_hours=5, dependencies=[self.first.id])
+        ArchivedTask.objects.create(original_id=99, title="Old", due_date=self.today - timedelta(days=90),
+                                    importance=4, estimated_hours=2, dependencies=[], completed=True)
+    
+    def export(self, query=''):
+        response = self.client.get('/api/tasks/export/' + query)
+        body = b''.join(response.streaming_content).decode() if response.streaming else response.content
+        return response, body
+    
+    def test_csv_export(self):
+        """Test CSV export streams every task and round-trips through import_tasks"""
+        response, body = self.export()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual([row['title'] for row in rows], ["First, with comma", "Second"])
+        self.assertEqual(rows[1]['dependencies'], f'[{self.first.id}]')
+        self.assertEqual(rows[0]['completed'], 'false')
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'export.csv'
+            path.write_text(body)
+            Task.objects.all().delete()
+            call_command('import_tasks', str(path), stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(Task.objects.get(title="Second").dependencies, [self.first.id])
+    
+    def test_ndjson_with_scores_and_archive(self):
+        """Test NDJSON export with batch scores and archived tasks"""
+        response, body = self.export('?format=ndjson&scores=1&include_archived=1')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [self.first.id, self.second.id, 99])
+        self.assertEqual([row['archived'] for row in rows], [False, False, True])
+        expected = calculate_task_score({'due_date': str(self.today), 'importance': 9,
+                                         'estimated_hours': 1, 'dependencies': []})
+        self.assertEqual(rows[0]['score'], expected)
+        self.assertIsNotNone(rows[2]['archived_at'])
+    
+    def test_filters_and_chunking(self):
+        """Test filters apply and chunks cover every row"""
+        rows = [row for chunk in export_chunks(chunk_size=1) for row in chunk]
+        self.assertEqual(len(rows), 2)
+        _, body = self.export('?format=ndjson&min_importance=5')
+        self.assertEqual([json.loads(line)['title'] for line in body.splitlines()], ["First, with comma"])
+    
+    def test_invalid_parameters(self):
+        """Test unknown formats and bad filters are rejected"""
+        response, _ = self.export('?format=xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response, _ = self.export('?due_from=soon')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# ============================================
+# PLANNER TESTS
+# ============================================
+
+class PlannerTest(TestCase):
+    """Test the capacity-aware scheduler and /plan/ endpoint"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.today = date.today()
+    
+    def row(self, task_id, hours, importance=5, days=3, dependencies=None):
+        return (task_id, f"Task {task_id}", self.today + timedelta(days=days), importance, hours,
+                dependencies or [])
+    
+    def test_dependencies_come_first(self):
+        """Test a task is never planned before its dependencies"""
+        rows = [self.row(1, 2, importance=10, dependencies=[2]), self.row(2, 2, importance=1)]
+        plan = schedule(rows, 8, 1, today=self.today)
+        self.assertEqual([task['id'] for task in plan['days'][0]['tasks']], [2, 1])
+    
+    def test_packs_best_fitting_task(self):
+        """Test days are filled with the highest-scoring tasks that still fit"""
+        rows = [self.row(1, 6, importance=9), self.row(2, 3, importance=8),
+                self.row(3, 2, importance=6), self.row(4, 1, importance=1)]
+        plan = schedule(rows, 8, 2, today=self.today)
+        self.assertEqual([task['id'] for task in plan['days'][0]['tasks']], [1, 3])
+        self.assertEqual(plan['days'][0]['hours_planned'], 8)
+        self.assertEqual([task['id'] for task in plan['days'][1]['tasks']], [2, 4])
+    
+    def test_unscheduled_reasons(self):
+        """Test cycles, oversized tasks and their dependents are reported"""
+        rows = [
+            self.row(1, 1, dependencies=[2]), self.row(2, 1, dependencies=[1]),  # cycle
+            self.row(3, 1, dependencies=[2]),                                    # behind the cycle
+            self.row(4, 20),                                                     # too long for a day
+            self.row(5, 1, dependencies=[4]),                                    # waits on it
+            self.row(6, 1, dependencies=[999]),                                  # unknown dep is done
+        ]
+        plan = schedule(rows, 8, 1, today=self.today)
+        self.assertEqual([task['id'] for task in plan['days'][0]['tasks']], [6])
+        self.assertEqual(dict(plan['unscheduled']), {
+            1: 'dependency_cycle', 2: 'dependency_cycle', 3: 'blocked', 4: 'exceeds_capacity', 5: 'blocked',
+        })
+    
+    def test_plan_endpoint_is_cached_per_version(self):
+        """Test /plan/ serves a cached plan until a task changes"""
+        Task.objects.create(title="A", due_date=self.today, importance=8, estimated_hours=3)
+        response = self.client.get('/api/tasks/plan/?capacity=4&days=2')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['scheduled_count'], 1)
+        
+        # Only the workspace version is read
+        with assert_max_queries(1):
+            self.client.get('/api/tasks/plan/?capacity=4&days=2')
+        Task.objects.create(title="B", due_date=self.today, importance=8, estimated_hours=3)
+        response = self.client.get('/api/tasks/plan/?capacity=4&days=2')
+        self.assertEqual(response.data['scheduled_count'], 2)
+        self.assertEqual(response.data['unscheduled_count'], 0)
+    
+    def test_plan_endpoint_defaults(self):
+        """Test /plan/ without query parameters uses 8 hours over 7 days"""
+        Task.objects.create(title="A", due_date=self.today, importance=8, estimated_hours=3)
+        response = self.client.get('/api/tasks/plan/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['capacity_hours'], 8)
+        self.assertEqual(response.data['horizon_days'], 7)
+        self.assertEqual(response.data['scheduled_count'], 1)
+    
+    def test_plan_rejects_bad_parameters(self):
+        """Test capacity and horizon are validated"""
+        for query in ('?capacity=0', '?capacity=abc', '?days=1000'):
+            response = self.client.get('/api/tasks/plan/' + query)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# ============================================
+# COMPRESSION TESTS
+# ============================================
+
+class CompressionTest(TestCase):
+    """Test negotiated response compression and gzip request bodies"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.tasks = [
+            {"title": f"Task {i}", "due_date": str(date.today()), "importance": 5, "estimated_hours": 2,
+             "dependencies": []}
+            for i in range(50)
+        ]
+    
+    def test_compresses_large_json_responses(self):
+        """Test large responses are gzipped when the client accepts it"""
+        Task.objects.bulk_create(Task(title=f"Task {i}", due_date=date.today()) for i in range(50))
+        response = self.client.get('/api/tasks/list/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))), 50)
+        
+        plain = self.client.get('/api/tasks/list/')
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertLess(len(response.content) * 3, len(plain.content))
+    
+    def test_small_responses_and_refused_codings(self):
+        """Test small bodies and q=0 codings are sent uncompressed"""
+        response = self.client.get('/api/tasks/suggest/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        Task.objects.bulk_create(Task(title=f"Task {i}", due_date=date.today()) for i in range(50))
+        response = self.client.get('/api/tasks/list/', HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+    
+    def test_negotiation(self):
+        """Test q-values, zstd preference and identity in Accept-Encoding"""
+        middleware = CompressionMiddleware(lambda request: None)
+        middleware.compressors.setdefault('zstd', None)
+        cases = {
+            'gzip': 'gzip',
+            'gzip, zstd': 'zstd',
+            'zstd;q=0.5, gzip': 'gzip',
+            'gzip;q=0': None,
+            'gzip;q=0, zstd;q=0, *': None,
+            'x-gzip-foo': None,
+            '*': 'zstd',
+            '*;q=0.5, zstd;q=0': 'gzip',
+            'identity': None,
+            'gzip;q=0.5, identity': None,
+            'gzip, identity;q=0.5': 'gzip',
+            '': None,
+        }
+        for header, expected in cases.items():
+            self.assertEqual(middleware.negotiate(header), expected, header)
+    
+    def test_static_server_negotiation(self):
+        """Test serve_frontend.py only sends gzip when it is accepted with q > 0"""
+        from serve_frontend import accepts_gzip
+        for header in ('gzip', 'GZIP;q=0.8', 'x-gzip', 'br, *', 'deflate, gzip;q=1.0, identity;q=0.5'):
+            self.assertTrue(accepts_gzip(header), header)
+        for header in ('', 'gzip;q=0', 'x-gzip-foo', 'identity', '*;q=0', 'gzip;q=0.2, identity', 'gzip;q=abc'):
+            self.assertFalse(accepts_gzip(header), header)
+
+    def test_static_server_etag_per_encoding(self):
+        """Test serve_frontend.py gives the gzip and identity bodies different ETags"""
+        import http.client
+        import threading
+        from serve_frontend import FrontendHandler, FrontendServer, load_assets
+
+        with tempfile.TemporaryDirectory() as directory:
+            Path(directory, 'app.js').write_text("console.log('task analyzer');\n" * 100)
+            handler = type('Handler', (FrontendHandler,), {'assets': load_assets(Path(directory))})
+            with FrontendServer(('127.0.0.1', 0), handler) as server:
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                try:
+                    def get(**headers):
+                        connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+                        connection.request('GET', '/app.js', headers=headers)
+                        response = connection.getresponse()
+                        response.read()
+                        connection.close()
+                        return response
+
+                    plain = get()
+                    zipped = get(**{'Accept-Encoding': 'gzip'})
+                    self.assertEqual(zipped.getheader('Content-Encoding'), 'gzip')
+                    self.assertEqual(zipped.getheader('Vary'), 'Accept-Encoding')
+                    self.assertNotEqual(plain.getheader('ETag'), zipped.getheader('ETag'))
+                    self.assertEqual(get(**{'If-None-Match': plain.getheader('ETag')}).status, 304)
+                    self.assertEqual(get(**{'Accept-Encoding': 'gzip',
+                                            'If-None-Match': plain.getheader('ETag')}).status, 200)
+                    self.assertEqual(get(**{'Accept-Encoding': 'gzip',
+                                            'If-None-Match': zipped.getheader('ETag')}).status, 304)
+                finally:
+                    server.shutdown()
+
+    def test_compresses_streaming_export(self):
+        """Test streaming responses are compressed chunk by chunk"""
+        Task.objects.create(title="Streamed", due_date=date.today())
+        response = self.client.get('/api/tasks/export/?format=ndjson', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        body = gzip.decompress(b''.join(response.streaming_content))
+        self.assertEqual(json.loads(body)['title'], "Streamed")
+    
+    def test_accepts_gzip_request_body(self):
+        """Test /analyze/ and /save-analysis/ accept Content-Encoding: gzip"""
+        body = gzip.compress(json.dumps({"tasks": self.tasks}).encode())
+        response = self.client.post('/api/tasks/analyze/', body, content_type='application/json',
+                                    HTTP_CONTENT_ENCODING='gzip')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 50)
+        
+        response = self.client.post('/api/tasks/save-analysis/', body, content_type='application/json',
+                                    HTTP_CONTENT_ENCODING='gzip')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Task.objects.count(), 50)
+    
+    @override_settings(TASKS_MAX_DECOMPRESSED_BYTES=10000)
+    def test_rejects_decompression_bombs(self):
+        """Test bodies that inflate past the cap get 413, bad or unknown codings 400/415"""
+        bomb = gzip.compress(b'{"tasks": [' + b' ' * 1000000 + b']}')
+        self.assertLess(len(bomb), 2000)
+        response = self.client.post('/api/tasks/analyze/', bomb, content_type='application/json',
+                                    HTTP_CONTENT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 413)
+        
+        truncated = gzip.compress(json.dumps({"tasks": self.tasks}).encode())[:-10]
+        response = self.client.post('/api/tasks/analyze/', truncated, content_type='application/json',
+                                    HTTP_CONTENT_ENCODING='gzip')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        response = self.client.post('/api/tasks/analyze/', b'{}', content_type='application/json',
+                                    HTTP_CONTENT_ENCODING='br')
+        self.assertEqual(response.status_code, 415)
+    
+    def test_multi_member_gzip(self):
+        """Test concatenated gzip members decompress as one body"""
+        data = gzip.compress(b'{"tasks": ') + gzip.compress(json.dumps(self.tasks[:2]).encode() + b'}')
+        self.assertEqual(json.loads(gunzip_stream(BytesIO(data).read, 10000, chunk_size=7))['tasks'],
+                         self.tasks[:2])
+
+
+# ============================================
+# COLUMNAR BINARY FORMAT TESTS
+# ============================================
+
+class ColumnarFormatTest(TestCase):
+    """Test the packed binary payload format for /analyze/"""
+    
+    def setUp(self):
+        self.client = Client()
+        today = date.today()
+        self.tasks = [
+            {"id": 10, "title": "Write report", "due_date": str(today + timedelta(days=10)), "importance": 4,
+             "estimated_hours": 5, "dependencies": []},
+            {"id": 11, "title": "Überfällig", "due_date": str(today - timedelta(days=1)), "importance": 9,
+             "estimated_hours": 1, "dependencies": [10, 12]},
+            {"id": 12, "title": "Quick fix", "due_date": str(today + timedelta(days=2)), "importance": 6,
+             "estimated_hours": 1, "dependencies": []},
+        ]
+        self.expected = [calculate_task_score(dict(task)) for task in self.tasks]
+    
+    def post(self, body, content_type, accept=MEDIA_TYPE):
+        return self.client.post('/api/tasks/analyze/', body, content_type=content_type, HTTP_ACCEPT=accept)
+    
+    def test_decode_is_zero_copy(self):
+        """Test numeric columns are memoryviews over the payload"""
+        columns = decode_columns(encode_columns(self.tasks))
+        self.assertIsInstance(columns.ids, memoryview)
+        self.assertEqual(list(columns.ids), [10, 11, 12])
+        self.assertEqual(columns.dependency_counts(), [0, 2, 0])
+        self.assertEqual(columns.dependencies(1), [10, 12])
+        self.assertEqual(columns.title(1), "Überfällig")
+    
+    def test_binary_request_and_response(self):
+        """Test scores and ranks come back as packed columns in request order"""
+        response = self.post(encode_columns(self.tasks), MEDIA_TYPE)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], MEDIA_TYPE)
+        result = decode_scores(response.content)
+        self.assertEqual(list(result.ids), [10, 11, 12])
+        self.assertEqual(list(result.scores), self.expected)
+        self.assertEqual(list(result.ranks), rank(self.expected))
+    
+    def test_binary_request_json_response(self):
+        """Test a binary request can be answered with the usual JSON"""
+        response = self.post(encode_columns(self.tasks), MEDIA_TYPE, accept='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        tasks = response.json()['tasks']
+        json_response = self.client.post('/api/tasks/analyze/', {"tasks": self.tasks},
+                                         content_type='application/json')
+        self.assertEqual(tasks, json_response.json()['tasks'])
+    
+    def test_json_request_binary_response(self):
+        """Test JSON callers can ask for packed scores"""
+        response = self.post(json.dumps({"tasks": self.tasks}), 'application/json')
+        result = decode_scores(response.content)
+        self.assertEqual(list(result.scores), self.expected)
+    
+    def test_fractional_scores_are_rounded(self):
+        """Test fractional importance or hours from JSON still pack into the int32 score column"""
+        tasks = [dict(self.tasks[0], importance=7.5), dict(self.tasks[2], estimated_hours=0.25)]
+        scores = [calculate_task_score(dict(task)) for task in tasks]
+        response = self.post(json.dumps({"tasks": tasks}), 'application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = decode_scores(response.content)
+        self.assertEqual(list(result.scores), [round(score) for score in scores])
+        self.assertEqual(list(result.ranks), rank(scores))
+    
+    def test_malformed_payloads(self):
+        """Test truncated or inconsistent payloads are rejected as JSON errors"""
+        body = encode_columns(self.tasks)
+        for bad in (body[:20], b'XXXX' + body[4:], body[:-30]):
+            response = self.post(bad, MEDIA_TYPE)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('error', response.json())
+        zero_due_date = bytearray(body)
+        zero_due_date[40:44] = bytes(4)  # first due ordinal, after the header and 3 padded ids
+        with self.assertRaises(ValueError):
+            decode_columns(zero_due_date)
+
+
+# ============================================
+# MULTI-BATCH ANALYZE TESTS
+# ============================================
+
+class AnalyzeBatchesTest(TestCase):
+    """Test scoring many task lists in one /analyze/ call"""
+    
+    def setUp(self):
+        self.client = Client()
+        today = date.today()
+        self.alpha = [
+            {"id": 1, "title": "Later", "due_date": str(today + timedelta(days=20)), "importance": 3},
+            {"id": 2, "title": "Overdue", "due_date": str(today - timedelta(days=2)), "importance": 7,
+             "estimated_hours": 4},
+            {"id": 3, "title": "Blocked", "due_date": str(today), "importance": 10, "dependencies": [1, 2]},
+        ]
+        self.beta = [
+            {"title": "Quick", "due_date": str(today + timedelta(days=1)), "importance": "high",
+             "estimated_hours": 0.5},
+        ]
+    
+    def analyze(self, payload):
+        return self.client.post('/api/tasks/analyze/', payload, content_type='application/json')
+    
+    def test_batches_match_single_list_results(self):
+        """Test each batch is scored and sorted exactly like its own request"""
+        response = self.analyze({"batches": {"alpha": self.alpha, "beta": self.beta}})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['count'], 4)
+        self.assertEqual(data['errors'], {})
+        for name, tasks in (("alpha", self.alpha), ("beta", self.beta)):
+            single = self.analyze({"tasks": tasks}).json()
+            self.assertEqual(data['batches'][name], single)
+    
+    def test_missing_due_date_matches_single_list(self):
+        """Test a task without due_date scores the same in batch and single-list mode"""
+        undated = [{"title": "x", "importance": 5}]
+        response = self.analyze({"batches": {"a": undated, "b": self.beta}})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['errors'], {})
+        self.assertEqual(data['batches']['a'], self.analyze({"tasks": undated}).json())
+        
+        response = self.analyze({"tasks": undated, "dedupe": "flag"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_bad_batches_are_reported_separately(self):
+        """Test a broken batch doesn't fail the others"""
+        response = self.analyze({"batches": {
+            "ok": self.alpha,
+            "empty": [],
+            "not-a-list": {"title": "x"},
+            "bad-date": [{"title": "x", "due_date": "31/12/2025"}],
+        }})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(list(data['batches']), ["ok"])
+        self.assertEqual(set(data['errors']), {"empty", "not-a-list", "bad-date"})
+        self.assertIn("Task 1: Invalid date format", data['errors']['bad-date'])
+    
+    def test_all_batches_failing(self):
+        """Test 400 when no batch can be scored"""
+        self.assertEqual(self.analyze({"batches": {"a": []}}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.analyze({"batches": []}).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# ============================================
+# BATCH OPERATIONS TESTS
+# ============================================
+
+class BatchOperationsTest(TestCase):
+    """Test running ordered operations through /batch/"""
+    
+    def setUp(self):
+        self.client = Client()
+        today = date.today()
+        self.keep = Task.objects.create(title="Keep", due_date=today + timedelta(days=5), importance=5)
+        self.drop = Task.objects.create(title="Drop", due_date=today, importance=9)
+        self.new_task = {"title": "New", "due_date": str(today - timedelta(days=1)), "importance": 10}
+    
+    def batch(self, operations, **extra):
+        return self.client.post('/api/tasks/batch/', {"operations": operations, **extra},
+                                content_type='application/json')
+    
+    def test_reads_reflect_earlier_writes(self):
+        """Test list and suggest see the batch's own writes"""
+        snapshots.get(DEFAULT_WORKSPACE_ID).refresh()
+        response = self.batch([
+            {"op": "save", "task": self.new_task},
+            {"op": "delete", "id": self.drop.id},
+            {"op": "complete", "id": self.keep.id},
+            {"op": "list"},
+            {"op": "suggest"},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertTrue(data['committed'])
+        self.assertEqual([r['status'] for r in data['results']], [201, 200, 200, 200, 200])
+        listed = {task['title']: task['completed'] for task in data['results'][3]['body']}
+        self.assertEqual(listed, {"New": False, "Keep": True})
+        self.assertEqual([t['title'] for t in data['results'][4]['body']['top_tasks']], ["New"])
+        # The committed batch is what the single endpoints see afterwards
+        self.assertEqual(self.client.get('/api/tasks/suggest/').json()['top_tasks'][0]['title'], "New")
+        self.assertFalse(Task.objects.filter(id=self.drop.id).exists())
+    
+    def test_failure_rolls_back_every_write(self):
+        """Test an atomic batch is all or nothing"""
+        snapshots.get(DEFAULT_WORKSPACE_ID).refresh()
+        response = self.batch([
+            {"op": "save", "tasks": [self.new_task]},
+            {"op": "delete", "id": self.drop.id},
+            {"op": "complete", "id": 999999},
+            {"op": "list"},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        data = response.json()
+        self.assertFalse(data['committed'])
+        self.assertEqual([r['status'] for r in data['results']], [200, 200, 404, None])
+        self.assertTrue(data['results'][3]['skipped'])
+        self.assertEqual(set(Task.objects.values_list('title', flat=True)), {"Keep", "Drop"})
+        # Readers must not keep serving the rolled-back state
+        titles = [t['title'] for t in self.client.get('/api/tasks/suggest/').json()['top_tasks']]
+        self.assertEqual(sorted(titles), ["Drop", "Keep"])
+    
+    def test_non_atomic_batch_keeps_successful_operations(self):
+        """Test atomic=false only undoes the failing operation"""
+        response = self.batch([
+            {"op": "save", "task": {"title": "Bad", "due_date": "not-a-date"}},
+            {"op": "delete", "id": self.drop.id},
+            {"op": "analyze", "ids": [self.keep.id]},
+        ], atomic=False)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertTrue(data['committed'])
+        self.assertEqual([r['status'] for r in data['results']], [400, 200, 200])
+        self.assertEqual(data['results'][2]['body']['tasks'][0]['id'], self.keep.id)
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ["Keep"])
+    
+    def test_invalid_requests(self):
+        """Test malformed batches are rejected before anything runs"""
+        self.assertEqual(self.batch([]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.batch([{"op": "drop-table"}]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.batch([{"op": "list"}], atomic="yes").status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(TASKS_BATCH_MAX_OPERATIONS=2):
+            self.assertEqual(self.batch([{"op": "list"}] * 3).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.batch([{"op": "delete", "id": "1"}])
+        self.assertEqual(response.json()['results'][0]['status'], 400)
+        self.assertEqual(Task.objects.count(), 2)
+
+
+# ============================================
+# BULK DELETE TESTS
+# ============================================
+
+class BulkDeleteTest(TestCase):
+    """Test bulk deletion and dependency reference repair"""
+    
+    def setUp(self):
+        self.client = Client()
+        due = date.today() + timedelta(days=3)
+        self.a = Task.objects.create(title="A", due_date=due)
+        self.b = Task.objects.create(title="B", due_date=due)
+        self.c = Task.objects.create(title="C", due_date=due, dependencies=[self.a.id, self.b.id, "x"])
+        self.d = Task.objects.create(title="D", due_date=due, dependencies=[self.a.id, self.a.id])
+    
+    def test_reverse_index_follows_every_write_path(self):
+        """Test TaskDependency tracks inserts, updates, raw SQL and deletes"""
+        self.assertEqual(dependents_of([self.a.id]), {self.c.id, self.d.id})
+        self.assertEqual(dependents_of([self.b.id]), {self.c.id})
+        
+        Task.objects.filter(id=self.c.id).update(dependencies=[self.d.id])
+        self.assertEqual(dependents_of([self.b.id]), set())
+        self.assertEqual(dependents_of([self.d.id]), {self.c.id})
+        
+        from django.db import connection
+        with connection.cursor() as cursor:
+            cursor.execute(task_insert_sql(['title', 'due_date', 'importance', 'estimated_hours',
+                                            'dependencies', 'completed', 'workspace']),
+                           ['Raw', str(date.today()), 5, 1, json.dumps([self.b.id]), False, DEFAULT_WORKSPACE_ID])
+        self.assertEqual(len(dependents_of([self.b.id])), 1)
+        
+        self.d.delete()
+        self.assertFalse(TaskDependency.objects.filter(task_id=self.d.id).exists())
+    
+    def test_bulk_delete_repairs_references(self):
+        """Test deleted IDs are stripped from the tasks that referenced them"""
+        response = self.client.post('/api/tasks/bulk-delete/', {"ids": [self.a.id, self.b.id, 999999]},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['deleted'], 2)
+        self.assertEqual(data['deleted_ids'], [self.a.id, self.b.id])
+        self.assertEqual(data['missing_ids'], [999999])
+        self.assertEqual(data['tasks_repaired'], 2)
+        self.assertEqual(data['references_repaired'], 4)
+        
+        self.c.refresh_from_db()
+        self.d.refresh_from_db()
+        self.assertEqual(self.c.dependencies, ["x"])
+        self.assertEqual(self.d.dependencies, [])
+        self.assertEqual(TaskDependency.objects.count(), 0)
+    
+    def test_bulk_delete_never_scans_the_table(self):
+        """Test referencing tasks come from the reverse index, not a full scan"""
+        Task.objects.bulk_create([Task(title=f"Filler {i}", due_date=date.today()) for i in range(200)])
+        with assert_max_queries(10) as log:
+            self.client.post('/api/tasks/bulk-delete/', {"ids": [self.a.id, self.b.id]},
+                             content_type='application/json')
+        self.assertTrue(any('tasks_taskdependency' in sql for sql in log.queries))
+        task_reads = [sql for sql in log.queries if sql.startswith('SELECT') and 'FROM "tasks_task"' in sql]
+        self.assertTrue(task_reads)
+        self.assertTrue(all('"tasks_task"."id" IN' in sql for sql in task_reads))
+    
+    def test_single_delete_repairs_references(self):
+        """Test /delete/<id>/ also cleans up dependencies"""
+        response = self.client.delete(f'/api/tasks/delete/{self.b.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['references_repaired'], 1)
+        self.c.refresh_from_db()
+        self.assertEqual(self.c.dependencies, [self.a.id, "x"])
+    
+    def test_invalid_requests(self):
+        """Test bad ID lists are rejected"""
+        for payload in ({}, {"ids": []}, {"ids": ["1"]}, {"ids": [True]}):
+            response = self.client.post('/api/tasks/bulk-delete/', payload, content_type='application/json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.settings(TASKS_BULK_DELETE_MAX_IDS=1):
+            response = self.client.post('/api/tasks/bulk-delete/', {"ids": [1, 2]},
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Task.objects.count(), 4)
+
+
+# ============================================
+# ADMIN TESTS
+# ============================================
+
+@skipUnless(apps.is_installed('django.contrib.admin'), "admin is not installed (backend.settings_api)")
+class TaskAdminTest(TestCase):
+    """Test the large-table task admin"""
+    
+    def setUp(self):
+        from django.contrib.auth.models import User
+        self.client = Client()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        today = date.today()
+        self.overdue = Task.objects.create(title="Overdue", due_date=today - timedelta(days=3), importance=9,
+                                           dependencies=[1, 2])
+        self.soon = Task.objects.create(title="Soon", due_date=today + timedelta(days=2), importance=5)
+        self.later = Task.objects.create(title="Later", due_date=today + timedelta(days=60), importance=2)
+        self.url = '/admin/tasks/task/'
+    
+    def test_changelist_never_counts_whole_table(self):
+        """Test counts are bounded and list rows skip the dependencies JSON"""
+        with capture_queries() as log:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        counts = [sql for sql in log.queries if 'COUNT(' in sql]
+        self.assertTrue(counts)
+        self.assertTrue(all('LIMIT' in sql for sql in counts))
+        rows = [sql for sql in log.queries if sql.startswith('SELECT "tasks_task"."id"')]
+        self.assertTrue(rows)
+        self.assertTrue(all('"dependencies"' not in sql for sql in rows))
+    
+    def test_filters(self):
+        """Test due-date and importance buckets"""
+        response = self.client.get(self.url, {'due': 'overdue'})
+        self.assertEqual([task.title for task in response.context['cl'].result_list], ["Overdue"])
+        response = self.client.get(self.url, {'due': 'week', 'importance': 'medium'})
+        self.assertEqual([task.title for task in response.context['cl'].result_list], ["Soon"])
+        response = self.client.get(self.url, {'due': 'later', 'importance': 'high'})
+        self.assertEqual(list(response.context['cl'].result_list), [])
+    
+    def test_estimated_count_paginator(self):
+        """Test exact counts below the limit and estimates above it"""
+        from .admin import EstimatedCountPaginator
+        with self.settings(TASKS_ADMIN_EXACT_COUNT_LIMIT=10):
+            self.assertEqual(EstimatedCountPaginator(Task.objects.order_by("id"), 100).count, 3)
+        with self.settings(TASKS_ADMIN_EXACT_COUNT_LIMIT=1):
+            # Unfiltered: MAX(id) - MIN(id) + 1 on SQLite
+            self.assertEqual(EstimatedCountPaginator(Task.objects.order_by("id"), 100).count,
+                             self.later.id - self.overdue.id + 1)
+            # Filtered: limit + 1
+            self.assertEqual(EstimatedCountPaginator(Task.objects.filter(importance__gt=1).order_by("id"), 100).count, 2)
+    
+    def action(self, name, tasks):
+        return self.client.post(self.url, {'action': name, '_selected_action': [task.id for task in tasks]},
+                                follow=True)
+    
+    def test_archive_action(self):
+        """Test archiving copies rows into the archive and removes them"""
+        self.action('archive_selected', [self.overdue, self.soon])
+        self.assertEqual(list(Task.objects.values_list('title', flat=True)), ["Later"])
+        archived = ArchivedTask.objects.get(original_id=self.overdue.id)
+        self.assertEqual((archived.title, archived.importance, archived.dependencies), ("Overdue", 9, [1, 2]))
+        self.assertIsNotNone(archived.archived_at)
+        self.assertEqual(ArchivedTask.objects.count(), 2)
+    
+    def test_complete_action(self):
+        """Test completing in one UPDATE and only invalidating the selection's workspaces"""
+        acme = Workspace.objects.create(slug='acme', name="Acme")
+        acme_version = current_version(acme.id)
+        with capture_queries() as log:
+            self.action('complete_selected', [self.overdue, self.soon])
+        self.assertEqual(sum(1 for sql in log.queries if sql.startswith('UPDATE "tasks_task"')), 1)
+        self.assertEqual(Task.objects.filter(completed=True).count(), 2)
+        self.assertEqual(current_version(acme.id), acme_version)
+
+
+# ============================================
+# SEARCH TESTS
+# ============================================
+
+class SearchTest(TestCase):
+    """Test full-text title search"""
+    
+    def setUp(self):
+        self.client = Client()
+        today = date.today()
+        self.login = Task.objects.create(title="Fix login bug", due_date=today, importance=9)
+        self.logout = Task.objects.create(title="Fix logout redirect after login timeout", due_date=today,
+                                          importance=3)
+        self.docs = Task.objects.create(title="Write API docs", due_date=today + timedelta(days=30), importance=5)
+        self.done = Task.objects.create(title="Fix login styling", due_date=today, completed=True)
+    
+    def search(self, **params):
+        response = self.client.get('/api/tasks/search/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+    
+    def ids(self, **params):
+        return [task['id'] for task in self.search(**params)['tasks']]
+    
+    def test_ranked_prefix_search(self):
+        """Test prefix matching and bm25 ranking"""
+        data = self.search(q="log")
+        self.assertTrue(data['ranked'])
+        self.assertEqual(set(self.ids(q="log")), {self.login.id, self.logout.id})
+        # The shorter, denser title ranks first
+        self.assertEqual(self.ids(q="fix login"), [self.login.id, self.logout.id])
+        self.assertGreater(data['tasks'][0]['relevance'], 0)
+        self.assertEqual(self.ids(q="log", prefix="0"), [])
+        self.assertEqual(self.ids(q="LOGIN BUG"), [self.login.id])
+    
+    def test_filters_scores_and_completed(self):
+        """Test search combines with filters and inline scores"""
+        self.assertEqual(self.ids(q="fix", min_importance="5"), [self.login.id])
+        self.assertEqual(self.ids(q="a", due_from=str(date.today() + timedelta(days=1))), [self.docs.id])
+        self.assertIn(self.done.id, self.ids(q="styling", include_completed="1"))
+        self.assertEqual(self.ids(q="styling"), [])
+        task = self.search(q="bug", scores="1")['tasks'][0]
+        self.assertEqual(task['score'], calculate_task_score({
+            'due_date': self.login.due_date, 'importance': 9, 'estimated_hours': 1, 'dependencies': []
+        }))
+    
+    def test_index_follows_writes(self):
+        """Test the FTS index tracks inserts, title updates, deletes and raw SQL"""
+        Task.objects.filter(id=self.docs.id).update(title="Write onboarding guide")
+        self.assertEqual(self.ids(q="docs"), [])
+        self.assertEqual(self.ids(q="onboard"), [self.docs.id])
+        self.login.delete()
+        self.assertEqual(self.ids(q="bug"), [])
+        from django.db import connection
+        with connection.cursor() as cursor:
+            cursor.execute(task_insert_sql(['title', 'due_date', 'importance', 'estimated_hours',
+                                            'dependencies', 'completed', 'workspace']),
+                           ['Imported bug', str(date.today()), 5, 1, '[]', False, DEFAULT_WORKSPACE_ID])
+        self.assertEqual(self.search(q="bug")['count'], 1)
+
+    def test_index_rebuilt_after_suspended_triggers(self):
+        """Test writes made while the triggers are suspended are indexed afterwards"""
+        from django.db import connection
+        with triggers_suspended(connection):
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")
+                self.assertEqual(cursor.fetchone()[0], 0)
+                cursor.execute(task_insert_sql(['title', 'due_date', 'importance', 'estimated_hours',
+                                                'dependencies', 'completed', 'workspace']),
+                               ['Bulk onboarding', str(date.today()), 5, 1, '[]', False, DEFAULT_WORKSPACE_ID])
+            Task.objects.filter(id=self.docs.id).update(title="Write release notes")
+            self.login.delete()
+        self.assertEqual(self.search(q="onboard")['count'], 1)
+        self.assertEqual(self.ids(q="release"), [self.docs.id])
+        self.assertEqual(self.ids(q="bug"), [])
+        # Later writes go through the reinstalled triggers again
+        Task.objects.create(title="Fix signup bug", due_date=date.today())
+        self.assertEqual(self.search(q="signup")['count'], 1)
+
+    def test_fallback_without_fts(self):
+        """Test LIKE matching when the FTS index is unavailable"""
+        from django.db import connection
+        key = connection.settings_dict['NAME']
+        search_module._fts_available[key] = False
+        try:
+            data = self.search(q="fix login")
+        finally:
+            search_module._fts_available.pop(key)
+        self.assertFalse(data['ranked'])
+        self.assertEqual([task['id'] for task in data['tasks']], [self.login.id, self.logout.id])
+        self.assertIsNone(data['tasks'][0]['relevance'])
+    
+    def test_invalid_requests(self):
+        """Test missing queries and bad parameters"""
+        for params in ({}, {'q': '!!'}, {'q': 'fix', 'limit': '0'}, {'q': 'fix', 'due_from': 'soon'}):
+            response = self.client.get('/api/tasks/search/', params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# ============================================
+# DUPLICATE DETECTION TESTS
+# ============================================
+
+class DedupeTest(TestCase):
+    """Test server-side duplicate detection"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.due = date.today() + timedelta(days=3)
+        self.stored = Task.objects.create(title="Fix login bug", due_date=self.due, importance=7)
+    
+    def task(self, title, due=None):
+        return {"title": title, "due_date": str(due or self.due), "importance": 5, "estimated_hours": 2,
+                "dependencies": []}
+    
+    def post(self, url, payload):
+        return self.client.post(url, payload, content_type='application/json')
+    
+    def test_normalized_key(self):
+        """Test case, accents, punctuation and spacing are ignored"""
+        self.assertEqual(normalize_title("  Fix   LOGIN bug!! "), "fix login bug")
+        self.assertEqual(normalize_title("Straße  ÉTÉ-plan"), "strasse ete plan")
+        self.assertEqual(title_key("Café  review"), title_key("cafe review."))
+        self.assertNotEqual(title_key("Fix login bug"), title_key("Fix logout bug"))
+        self.assertEqual(self.stored.title_key, title_key("fix login bug"))
+    
+    def test_find_duplicates(self):
+        """Test exact and near matches in a batch and against stored tasks"""
+        other_day = self.due + timedelta(days=1)
+        matches = find_duplicates([
+            ("fix login bug.", self.due),
+            ("Write API docs", self.due),
+            ("write api docs", self.due),
+            ("Fix login bug", other_day),
+            ("Write the API docs", self.due),
+        ])
+        self.assertEqual(matches[:4], [{"id": self.stored.id, "similarity": 1.0}, None,
+                                       {"index": 1, "similarity": 1.0}, None])
+        self.assertIsNone(matches[4])
+        
+        near = find_duplicates([("Fix login bugs", self.due), ("Write API docs", self.due),
+                                ("Write API doc", self.due)], near=True)
+        self.assertEqual(near[0]["id"], self.stored.id)
+        self.assertLess(near[0]["similarity"], 1)
+        self.assertIsNone(near[1])
+        self.assertEqual(near[2]["index"], 1)
+        self.assertEqual(find_duplicates([("Fix login bugs", self.due)], near=True, threshold=0.99), [None])
+    
+    def test_many_titles_and_days(self):
+        """Test stored lookups stay under SQLite's historical 999-variable limit"""
+        import sqlite3
+        from django.db import connection
+        connection.ensure_connection()
+        previous = connection.connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+        self.addCleanup(connection.connection.setlimit, sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, previous)
+        items = [(f"Task {i}", self.due + timedelta(days=i)) for i in range(1500)] + [("fix login bug", self.due)]
+        for near in (False, True):
+            matches = find_duplicates(items, near=near)
+            self.assertEqual(matches[-1]["id"], self.stored.id)
+            self.assertEqual(matches[:-1], [None] * 1500)
+    
+    def test_analyze_flag_and_merge(self):
+        """Test /analyze/ marks duplicates, or merges them with dedupe=merge"""
+        tasks = [self.task("Fix login bug"), self.task("Write docs"), self.task("write docs!")]
+        data = self.post('/api/tasks/analyze/', {"tasks": tasks}).json()
+        self.assertNotIn("duplicates", data)
+        self.assertEqual(len(data['tasks']), 3)
+        
+        data = self.post('/api/tasks/analyze/', {"tasks": tasks, "dedupe": "flag"}).json()
+        self.assertEqual(len(data['tasks']), 3)
+        flagged = {task['title']: task.get('duplicate_of') for task in data['tasks']}
+        self.assertEqual(flagged["Fix login bug"], {"id": self.stored.id, "similarity": 1.0})
+        self.assertEqual(flagged["write docs!"], {"index": 1, "similarity": 1.0})
+        self.assertIsNone(flagged["Write docs"])
+        self.assertEqual(len(data['duplicates']), 2)
+        
+        data = self.post('/api/tasks/analyze/', {"tasks": tasks, "dedupe": "merge"}).json()
+        self.assertEqual(sorted(task['title'] for task in data['tasks']), ["Fix login bug", "Write docs"])
+        merged = next(task for task in data['tasks'] if task['title'] == "Fix login bug")
+        self.assertEqual(merged['id'], self.stored.id)
+        
+        response = self.post('/api/tasks/analyze/', {"tasks": tasks, "dedupe": "squash"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_save_flags_by_default(self):
+        """Test /save-analysis/ keeps and reports duplicates unless asked to merge"""
+        tasks = [self.task("fix login bug"), self.task("Write docs"), self.task("Write docs")]
+        response = self.post('/api/tasks/save-analysis/', {"tasks": tasks})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual((data['saved'], data['skipped']), (3, 0))
+        self.assertEqual(len(data['duplicates']), 2)
+        self.assertEqual(Task.objects.count(), 4)
+        
+        # Merge skips every duplicate: nothing saved, but not an error
+        response = self.post('/api/tasks/save-analysis/', {"tasks": tasks, "dedupe": "merge"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['skipped'], 3)
+        self.assertEqual(Task.objects.count(), 4)
+        
+        response = self.post('/api/tasks/save-analysis/', {"tasks": tasks[:1], "dedupe": "off"})
+        self.assertIsNone(response.json()['duplicates'])
+        self.assertEqual(Task.objects.count(), 5)
+        
+        self.post('/api/tasks/save-analysis/', {"tasks": [self.task("Fix login bugs")], "dedupe": "merge",
+                                                "near_duplicates": True})
+        self.assertEqual(Task.objects.count(), 5)
+        
+        with self.settings(TASKS_DEDUPE_ON_SAVE="merge"):
+            response = self.post('/api/tasks/save-analysis/', {"tasks": tasks[:1]})
+        self.assertEqual(response.json()['skipped'], 1)
+        self.assertEqual(Task.objects.count(), 5)
+    
+    def test_duplicates_report(self):
+        """Test /duplicates/ groups stored duplicates"""
+        copy = Task.objects.create(title="fix LOGIN bug", due_date=self.due)
+        Task.objects.create(title="Fix login bug", due_date=self.due + timedelta(days=1))
+        near = Task.objects.create(title="Fix login bugs", due_date=self.due)
+        Task.objects.create(title="Fix login bug", due_date=self.due, completed=True)
+        
+        data = self.client.get('/api/tasks/duplicates/').json()
+        self.assertEqual(data['group_count'], 1)
+        self.assertEqual(data['duplicate_count'], 1)
+        group = data['groups'][0]
+        self.assertEqual(group['keep'], self.stored.id)
+        self.assertEqual([task['id'] for task in group['tasks']], [self.stored.id, copy.id])
+        
+        data = self.client.get('/api/tasks/duplicates/', {"near": "1"}).json()
+        self.assertEqual([task['id'] for task in data['groups'][0]['tasks']], [self.stored.id, copy.id, near.id])
+        data = self.client.get('/api/tasks/duplicates/', {"include_completed": "1"}).json()
+        self.assertEqual(data['duplicate_count'], 2)
+        response = self.client.get('/api/tasks/duplicates/', {"threshold": "2"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_title_key_maintained(self):
+        """Test every write path keeps title_key in step with the title"""
+        self.stored.title = "Renamed"
+        self.stored.save(update_fields=['title'])
+        self.stored.refresh_from_db()
+        self.assertEqual(self.stored.title_key, title_key("Renamed"))
+        
+        Task.objects.filter(id=self.stored.id).update(title="Updated")
+        self.assertEqual(Task.objects.get(id=self.stored.id).title_key, title_key("Updated"))
+        
+        created = Task.objects.bulk_create([Task(title="Bulk", due_date=self.due)])
+        self.assertEqual(Task.objects.get(id=created[0].id).title_key, title_key("Bulk"))
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'tasks.ndjson'
+            path.write_text(json.dumps(self.task("Imported task")) + "\n")
+            call_command('import_tasks', str(path), stderr=StringIO(), stdout=StringIO())
+        self.assertEqual(Task.objects.get(title="Imported task").title_key, title_key("Imported task"))
+
+
+# ============================================
+# DASHBOARD COUNTER TESTS
+# ============================================
+
+class DashboardCountersTest(TestCase):
+    """Test incrementally maintained dashboard counters"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.today = date.today()
+        Task.objects.create(title="Overdue", due_date=self.today - timedelta(days=2), estimated_hours=1)
+        Task.objects.create(title="Soon", due_date=self.today + timedelta(days=2), estimated_hours=4,
+                            dependencies=[1])
+        Task.objects.create(title="Next week", due_date=self.today + timedelta(days=6), estimated_hours=3)
+        Task.objects.create(title="Done", due_date=self.today, completed=True)
+        # Counters exist from the first read on
+        dashboard_counters()
+    
+    def assertCountersCorrect(self, today=None):
+        today = today or self.today
+        self.assertEqual(dashboard_counters(today=today), {'as_of': today, **compute_counters(today=today)})
+    
+    def test_counts(self):
+        """Test the buckets and the /stats/ endpoint"""
+        response = self.client.get('/api/tasks/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {
+            'as_of': str(self.today), 'total': 3, 'overdue': 1, 'due_3_days': 1, 'due_7_days': 2,
+            'quick_wins': 1, 'blocked': 1,
+        })
+    
+    def test_maintained_on_every_write_path(self):
+        """Test saves, updates, deletes, archiving and imports keep the counters exact"""
+        task = Task.objects.get(title="Soon")
+        task.dependencies = []
+        task.estimated_hours = 1
+        task.save()
+        self.assertCountersCorrect()
+        Task.objects.filter(title="Next week").update(due_date=self.today - timedelta(days=10))
+        self.assertCountersCorrect()
+        Task.objects.filter(title="Overdue").update(completed=True)
+        self.assertCountersCorrect()
+        Task.objects.filter(title="Done").update(completed=False)
+        self.assertCountersCorrect()
+        task.delete()
+        self.assertCountersCorrect()
+        Task.objects.bulk_create([Task(title=f"Bulk {i}", due_date=self.today, dependencies=[i])
+                                  for i in range(5)])
+        self.assertCountersCorrect()
+        archive_queryset(Task.objects.filter(title__startswith="Bulk"))
+        self.assertCountersCorrect()
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'tasks.ndjson'
+            path.write_text(json.dumps({"title": "Imported", "due_date": str(self.today), "importance": 5,
+                                        "estimated_hours": 1, "dependencies": []}) + "\n")
+            call_command('import_tasks', str(path), stderr=StringIO(), stdout=StringIO())
+        self.assertEqual(dashboard_counters()['total'], Task.objects.active().count())
+        self.assertCountersCorrect()
+
+    def test_rebuilt_after_bulk_generation(self):
+        """Test generate_tasks rebuilds the counters once, or keeps the triggers on request"""
+        call_command('generate_tasks', '200', '--seed', '3', stdout=StringIO(), stderr=StringIO())
+        self.assertFalse(TaskCounters.objects.exists())
+        self.assertEqual(dashboard_counters()['total'], 203)
+        self.assertCountersCorrect()
+
+        call_command('generate_tasks', '50', '--seed', '4', '--keep-triggers', stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(TaskCounters.objects.get().total, 253)
+        self.assertCountersCorrect()
+        self.assertEqual(TaskDependency.objects.count(), sum(
+            len(set(task.dependencies)) for task in Task.objects.all()
+        ))
+
+    def test_rolls_over_to_a_new_day(self):
+        """Test a later (or earlier) day re-buckets without a full recompute"""
+        for days in (1, 3, 5, 30, -4):
+            later = self.today + timedelta(days=days)
+            # Three due-date range counts, no pass over the whole table
+            with assert_max_queries(9):
+                counters = dashboard_counters(today=later)
+            self.assertEqual(counters, {'as_of': later, **compute_counters(today=later)})
+        self.assertEqual(TaskCounters.objects.get().as_of, self.today - timedelta(days=4))
+    
+    def test_verify_and_repair(self):
+        """Test verify_counters reports and repairs drift"""
+        out = StringIO()
+        call_command('verify_counters', '--check', stdout=out)
+        self.assertIn("All counters are correct", out.getvalue())
+        
+        TaskCounters.objects.update(overdue=40, blocked=0)
+        with self.assertRaises(CommandError):
+            call_command('verify_counters', '--check', stdout=StringIO())
+        self.assertCountersCorrect()
+        
+        TaskCounters.objects.update(total=0)
+        out = StringIO()
+        call_command('verify_counters', stdout=out)
+        self.assertIn("total: 3 (was 0)", out.getvalue())
+        self.assertEqual(dashboard_counters()['total'], 3)
+    
+    def test_rebuilt_after_missing_triggers(self):
+        """Test a lost counters row is recomputed on the next read"""
+        TaskCounters.objects.all().delete()
+        Task.objects.create(title="Unseen", due_date=self.today)
+        self.assertCountersCorrect()
+        self.assertEqual(dashboard_counters()['total'], 4)
+
+
+# ============================================
+# WORKSPACE TESTS
+# ============================================
+
+class WorkspaceTest(TestCase):
+    """Test tasks are partitioned by workspace"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.today = date.today()
+        self.acme = Workspace.objects.create(slug='acme', name="Acme")
+        self.home = Task.objects.create(title="Default task", due_date=self.today, estimated_hours=1)
+        self.ours = Task.objects.create(title="Acme task", due_date=self.today, estimated_hours=1,
+                                        workspace=self.acme)
+        self.blocked = Task.objects.create(title="Acme blocked", due_date=self.today + timedelta(days=20),
+                                           dependencies=[self.ours.id], workspace=self.acme)
+    
+    def titles(self, response):
+        return sorted(task['title'] for task in response.json())
+    
+    def test_header_and_query_parameter(self):
+        """Test the X-Workspace header and ?workspace= select the workspace; none means default"""
+        self.assertEqual(self.titles(self.client.get('/api/tasks/list/')), ["Default task"])
+        self.assertEqual(self.titles(self.client.get('/api/tasks/list/', HTTP_X_WORKSPACE='acme')),
+                         ["Acme blocked", "Acme task"])
+        self.assertEqual(self.titles(self.client.get('/api/tasks/list/?workspace=acme')),
+                         ["Acme blocked", "Acme task"])
+        # The header wins over the query parameter
+        self.assertEqual(self.titles(self.client.get('/api/tasks/list/?workspace=acme', HTTP_X_WORKSPACE='default')),
+                         ["Default task"])
+    
+    def test_reused_slug_resolves_to_the_new_workspace(self):
+        """Test a renamed slug stops resolving and a reused one reaches its new workspace"""
+        self.assertEqual(self.titles(self.client.get('/api/tasks/list/', HTTP_X_WORKSPACE='acme')),
+                         ["Acme blocked", "Acme task"])
+        # As another process would: no signals reach this one
+        Workspace.objects.filter(pk=self.acme.pk).update(slug='acme-old')
+        response = self.client.get('/api/tasks/list/', HTTP_X_WORKSPACE='acme')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        reused = Workspace.objects.create(slug='acme', name="New Acme")
+        Task.objects.create(title="New Acme task", due_date=self.today, workspace=reused)
+        self.assertEqual(self.titles(self.client.get('/api/tasks/list/', HTTP_X_WORKSPACE='acme')),
+                         ["New Acme task"])
+        self.assertEqual(self.titles(self.client.get('/api/tasks/list/', HTTP_X_WORKSPACE='acme-old')),
+                         ["Acme blocked", "Acme task"])
+
+    def test_unknown_workspace(self):
+        """Test an unknown slug is a 404 on every scoped endpoint"""
+        for path in ('/api/tasks/list/', '/api/tasks/suggest/', '/api/tasks/stats/', '/api/tasks/export/'):
+            response = self.client.get(path, HTTP_X_WORKSPACE='nope')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(response.json(), {"error": "Workspace 'nope' not found"})
+    
+    def test_reads_are_scoped(self):
+        """Test suggest, stored analysis, export and stats only see the workspace's tasks"""
+        response = self.client.get('/api/tasks/suggest/', HTTP_X_WORKSPACE='acme')
+        self.assertEqual({task['title'] for task in response.json()['top_tasks']}, {"Acme task", "Acme blocked"})
+        
+        response = self.client.post('/api/tasks/analyze/', {"ids": [self.home.id, self.ours.id]},
+                                    content_type='application/json', HTTP_X_WORKSPACE='acme')
+        self.assertEqual([task['id'] for task in response.json()['tasks']], [self.ours.id])
+        self.assertEqual(response.json()['missing_ids'], [self.home.id])
+        
+        response = self.client.get('/api/tasks/export/?format=ndjson', HTTP_X_WORKSPACE='acme')
+        body = b''.join(response.streaming_content).decode()
+        self.assertEqual(sorted(json.loads(line)['title'] for line in body.splitlines()),
+                         ["Acme blocked", "Acme task"])
+        
+        self.assertEqual(self.client.get('/api/tasks/stats/').json()['total'], 1)
+        stats = self.client.get('/api/tasks/stats/', HTTP_X_WORKSPACE='acme').json()
+        self.assertEqual((stats['total'], stats['blocked']), (2, 1))
+    
+    def test_writes_are_scoped(self):
+        """Test saves land in the workspace and other workspaces' tasks are out of reach"""
+        response = self.client.post('/api/tasks/save/', {"title": "New", "due_date": str(self.today)},
+                                    content_type='application/json', HTTP_X_WORKSPACE='acme')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.get(title="New").workspace_id, self.acme.id)
+        
+        for method, path in (('post', f'/api/tasks/complete/{self.ours.id}/'),
+                             ('delete', f'/api/tasks/delete/{self.ours.id}/')):
+            response = getattr(self.client, method)(path)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+        response = self.client.post('/api/tasks/bulk-delete/', {"ids": [self.home.id, self.ours.id]},
+                                    content_type='application/json', HTTP_X_WORKSPACE='acme')
+        self.assertEqual(response.json()['deleted_ids'], [self.ours.id])
+        self.assertTrue(Task.objects.filter(id=self.home.id).exists())
+        self.blocked.refresh_from_db()
+        self.assertEqual(self.blocked.dependencies, [])
+    
+    def test_versions_and_counters_are_per_workspace(self):
+        """Test a write in one workspace leaves the other's snapshot and counters alone"""
+        default_version = current_version(DEFAULT_WORKSPACE_ID)
+        self.client.get('/api/tasks/suggest/')
+        Task.objects.create(title="Acme later", due_date=self.today, workspace=self.acme)
+        self.assertEqual(current_version(DEFAULT_WORKSPACE_ID), default_version)
+        self.assertEqual(snapshots.get(DEFAULT_WORKSPACE_ID).version, default_version)
+        
+        self.assertEqual(dashboard_counters(DEFAULT_WORKSPACE_ID)['total'], 1)
+        self.assertEqual(dashboard_counters(self.acme.id)['total'], 3)
+        Task.objects.filter(id=self.ours.id).update(workspace=DEFAULT_WORKSPACE_ID)
+        self.assertEqual(dashboard_counters(DEFAULT_WORKSPACE_ID), {'as_of': self.today, **compute_counters()})
+        self.assertEqual(dashboard_counters(self.acme.id)['total'], 2)
+    
+    def test_commands_take_a_workspace(self):
+        """Test import_tasks and generate_tasks write into the named workspace"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'tasks.ndjson'
+            path.write_text(json.dumps({"title": "Imported", "due_date": str(self.today)}) + "\n")
+            call_command('import_tasks', str(path), '--workspace', 'acme', stdout=StringIO(), stderr=StringIO())
+            with self.assertRaises(CommandError):
+                call_command('import_tasks', str(path), '--workspace', 'nope', stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(Task.objects.get(title="Imported").workspace_id, self.acme.id)
+        
+        call_command('generate_tasks', '4', '--workspace', 'acme', '--clear', stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(Task.objects.filter(workspace=self.acme).count(), 4)
+        self.assertTrue(Task.objects.filter(id=self.home.id).exists())
+        
+        out = StringIO()
+        call_command('verify_counters', '--check', stdout=out)
+        self.assertIn("[acme]", out.getvalue())
+        self.assertIn("All counters are correct", out.getvalue())
@@ -0,0 +1,200 @@
+"""
+SQLite triggers that keep derived tables in sync with tasks_task.
+
+Triggers belong to their table, and SQLite alters a column by rebuilding the
+table, which silently drops them. So rather than trusting the migration that
+first created them, `install_triggers()` runs after every `migrate` (see
+apps.py): it recreates any missing trigger and rebuilds that derived table
+from tasks_task, since writes made without the trigger were never indexed.
+
+Bulk loads reuse that: `triggers_suspended()` drops the triggers for the
+duration of the load and reinstalls them afterwards, so each derived table
+is rebuilt once with set-based statements instead of row by row.
+"""
+from contextlib import contextmanager
+
+from django.db import transaction
+
+# Integer IDs from a task's dependencies array (anything else is ignored, as in scoring)
+_DEPENDENCY_IDS = """
+    SELECT DISTINCT {task}, value FROM json_each({dependencies})
+    WHERE json_type({dependencies}) = 'array' AND type = 'integer'
+"""
+
+# Dashboard counter -> condition on an open task row, relative to the counters'
+# own as_of day; must agree with tasks.counters.counter_filters()
+_COUNTER_CONDITIONS = {
+    'total': "1",
+    'overdue': "{row}.due_date < as_of",
+    'due_3_days': "{row}.due_date BETWEEN as_of AND date(as_of, '+3 days')",
+    'due_7_days': "{row}.due_date BETWEEN as_of AND date(as_of, '+7 days')",
+    'quick_wins': "{row}.estimated_hours < 2",
+    'blocked': "json_type({row}.dependencies, '$[0]') IS NOT NULL",
+}
+
+
+def _counter_delta(sign, row):
+    """SET clause adding (+) or removing (-) one row's contribution to every counter."""
+    return ', '.join(
+        f"{name} = {name} {sign} (NOT {row}.completed AND {condition.format(row=row)})"
+        for name, condition in _COUNTER_CONDITIONS.items()
+    )
+
+
+# Derived table -> (triggers by name, statements that rebuild it from scratch)
+DERIVED_TABLES = {
+    'tasks_taskdependency': (
+        {
+            'tasks_task_dependencies_insert': f"""
+                CREATE TRIGGER tasks_task_dependencies_insert AFTER INSERT ON tasks_task
+                BEGIN
+                    INSERT OR IGNORE INTO tasks_taskdependency (task_id, depends_on_id)
+                    {_DEPENDENCY_IDS.format(task='NEW.id', dependencies='NEW.dependencies')};
+                END
+            """,
+            'tasks_task_dependencies_update': f"""
+                CREATE TRIGGER tasks_task_dependencies_update AFTER UPDATE OF dependencies ON tasks_task
+                BEGIN
+                    DELETE FROM tasks_taskdependency WHERE task_id = OLD.id;
+                    INSERT OR IGNORE INTO tasks_taskdependency (task_id, depends_on_id)
+                    {_DEPENDENCY_IDS.format(task='NEW.id', dependencies='NEW.dependencies')};
+                END
+            """,
+            'tasks_task_dependencies_delete': """
+                CREATE TRIGGER tasks_task_dependencies_delete AFTER DELETE ON tasks_task
+                BEGIN
+                    DELETE FROM tasks_taskdependency WHERE task_id = OLD.id;
+                END
+            """,
+        },
+        [
+            "DELETE FROM tasks_taskdependency",
+            "INSERT OR IGNORE INTO tasks_taskdependency (task_id, depends_on_id) "
+            "SELECT tasks_task.id, value FROM tasks_task, json_each(tasks_task.dependencies) "
+            "WHERE json_type(tasks_task.dependencies) = 'array' AND type = 'integer'",
+        ],
+    ),
+    # External-content FTS5 index over titles (created in migration 0005)
+    'tasks_task_fts': (
+        {
+            'tasks_task_fts_insert': """
+                CREATE TRIGGER tasks_task_fts_insert AFTER INSERT ON tasks_task
+                BEGIN
+                    INSERT INTO tasks_task_fts (rowid, title) VALUES (NEW.id, NEW.title);
+                END
+            """,
+            'tasks_task_fts_update': """
+                CREATE TRIGGER tasks_task_fts_update AFTER UPDATE OF title ON tasks_task
+                BEGIN
+                    INSERT INTO tasks_task_fts (tasks_task_fts, rowid, title) VALUES ('delete', OLD.id, OLD.title);
+                    INSERT INTO tasks_task_fts (rowid, title) VALUES (NEW.id, NEW.title);
+                END
+            """,
+            'tasks_task_fts_delete': """
+                CREATE TRIGGER tasks_task_fts_delete AFTER DELETE ON tasks_task
+                BEGIN
+                    INSERT INTO tasks_task_fts (tasks_task_fts, rowid, title) VALUES ('delete', OLD.id, OLD.title);
+                END
+            """,
+        },
+        [
+            "INSERT INTO tasks_task_fts (tasks_task_fts) VALUES ('rebuild')",
+        ],
+    ),
+    # Dashboard counters, one row per workspace (see tasks.counters)
+    'tasks_taskcounters': (
+        {
+            'tasks_task_counters_insert': f"""
+                CREATE TRIGGER tasks_task_counters_insert AFTER INSERT ON tasks_task
+                BEGIN
+                    UPDATE tasks_taskcounters SET {_counter_delta('+', 'NEW')}
+                    WHERE workspace_id = NEW.workspace_id;
+                END
+            """,
+            'tasks_task_counters_update': f"""
+                CREATE TRIGGER tasks_task_counters_update
+                AFTER UPDATE OF due_date, estimated_hours, dependencies, completed, workspace_id ON tasks_task
+                BEGIN
+                    UPDATE tasks_taskcounters SET {_counter_delta('-', 'OLD')}
+                    WHERE workspace_id = OLD.workspace_id;
+                    UPDATE tasks_taskcounters SET {_counter_delta('+', 'NEW')}
+                    WHERE workspace_id = NEW.workspace_id;
+                END
+            """,
+            'tasks_task_counters_delete': f"""
+                CREATE TRIGGER tasks_task_counters_delete AFTER DELETE ON tasks_task
+                BEGIN
+                    UPDATE tasks_taskcounters SET {_counter_delta('-', 'OLD')}
+                    WHERE workspace_id = OLD.workspace_id;
+                END
+            """,
+        },
+        [
+            # The next read recomputes the counters from tasks_task
+            "DELETE FROM tasks_taskcounters",
+        ],
+    ),
+}
+
+
+def install_triggers(connection):
+    """
+    Creates missing triggers and rebuilds the derived tables they feed.
+    No-op on other backends and before the tables exist.
+
+    Returns:
+        list: Names of the derived tables that were rebuilt
+    """
+    if connection.vendor != 'sqlite':
+        return []
+    tables = set(connection.introspection.table_names())
+    if 'tasks_task' not in tables:
+        return []
+
+    rebuilt = []
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {name for (name,) in cursor.fetchall()}
+        for table, (triggers, rebuild) in DERIVED_TABLES.items():
+            if table not in tables or existing.issuperset(triggers):
+                continue
+            for name, sql in triggers.items():
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+                cursor.execute(sql)
+            for sql in rebuild:
+                cursor.execute(sql)
+            rebuilt.append(table)
+    return rebuilt
+
+
+def drop_triggers(connection):
+    """
+    Drops every derived-table trigger; `install_triggers()` puts them back and
+    rebuilds the tables. No-op on other backends.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for triggers, _rebuild in DERIVED_TABLES.values():
+            for name in triggers:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+@contextmanager
+def triggers_suspended(connection):
+    """
+    Runs the block without the derived-table triggers, then reinstalls them,
+    rebuilding the dependency index, the FTS index and the dashboard counters
+    from tasks_task (also if the block raised).
+
+    The rebuild reads the whole table, so this pays off for loads that are
+    large next to the table; a few hundred rows are cheaper with the triggers.
+    Until the block ends, search, dependents and counters don't reflect any
+    write, including other processes'. If the process dies in between, the
+    next `migrate` or suspended load reinstalls the triggers.
+    """
+    drop_triggers(connection)
+    try:
+        yield
+    finally:
+        install_triggers(connection)
@@ -7,7 +7,17 @@ urlpatterns = [
     path('list/', views.get_task_list, name='task_list'),
     path('analyze/', views.analyze, name='analyze'),
     path('suggest/', views.suggest, name='suggest'),
+    path('plan/', views.plan, name='plan'),
+    path('search/', views.search, name='search'),
+    path('duplicates/', views.duplicates, name='duplicates'),
+    path('stats/', views.stats, name='stats'),
     path('save/', views.save_task, name='save_task'),
     path('save-analysis/', views.save_tasks_from_analysis, name='save_analysis'),
     path('delete/<int:task_id>/', views.delete_task, name='delete_task'),
+    path('bulk-delete/', views.bulk_delete, name='bulk_delete'),
+    path('complete/<int:task_id>/', views.complete_task, name='complete_task'),
+    path('batch/', views.batch, name='batch'),
+    path('export/', views.export_tasks, name='export'),
+    path('profiles/', views.list_profiles, name='list_profiles'),
+    path('profiles/<str:name>/', views.download_profile, name='download_profile'),
 ]
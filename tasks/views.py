@@ -1,22 +1,284 @@
 from django.shortcuts import render
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, parser_classes, renderer_classes
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Task
-from .serializers import TaskSerializer
-from .scoring import calculate_task_score
+from rest_framework.settings import api_settings
+from .models import Task, ArchivedTask
+from .serializers import TaskSerializer, ArchivedTaskSerializer
+from .filters import parse_task_filter
+from .scoring import calculate_task_score, calculate_scores_batch
+from .signals import tasks_changed
+from .bulk import chunked, delete_tasks
+from .snapshot import TaskSnapshot, snapshots
+from .metrics import phase, registry
+from .export import export_chunks, export_columns, stream_csv, stream_ndjson
+from .planner import plan_tasks
+from .counters import dashboard_counters
+from .dedupe import DEDUPE_ACTIONS, duplicate_groups, find_duplicates
+from .search import SEARCH_FIELDS, fts_available, search_terms, search_tasks
+from .binary import ColumnarParser, ColumnarRenderer, ScoredColumns, TaskColumns, rank
+from . import profiling
+from .workspaces import workspace_scoped
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from django.conf import settings
+from django.db import transaction
 from datetime import date
 
+
+def _query_flag(request, name):
+    """Reads a boolean query parameter such as ?include_archived=1."""
+    params = getattr(request, 'query_params', request.GET)
+    return params.get(name, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def _task_list(workspace_id, include_archived=False):
+    """Serializes a workspace's live tasks, plus its archive when include_archived is set."""
+    with phase('db'):
+        tasks = list(Task.objects.filter(workspace_id=workspace_id))
+        archived = list(ArchivedTask.objects.filter(workspace_id=workspace_id)) if include_archived else []
+    with phase('render'):
+        data = TaskSerializer(tasks, many=True).data
+        if archived:
+            data = list(data) + list(ArchivedTaskSerializer(archived, many=True).data)
+    return Response(data)
+
+
 # Create your views here.
 @api_view(['GET'])
-def get_task_list(request):
-    tasks = Task.objects.all()
-    serializer = TaskSerializer(tasks, many=True)
-    return Response(serializer.data)
+@workspace_scoped
+def get_task_list(request, workspace_id):
+    """
+    Endpoint: /list/
+
+    Returns every task in the workspace's live table. Pass ?include_archived=1
+    to append tasks that were moved to the archive (flagged with "archived": true).
+    """
+    return _task_list(workspace_id, _query_flag(request, 'include_archived'))
+
+
+STORED_TASK_FIELDS = ('id', 'title', 'due_date', 'importance', 'estimated_hours', 'dependencies')
+
+
+def _analyze_stored(data, workspace_id):
+    """
+    Scores stored tasks selected by ID or by filter (stored mode of /analyze/).
+    
+    Uses a single projected query and the batch scorer, so no model instances
+    are built and the client never has to send the task data back.
+    """
+    if 'ids' in data:
+        ids = data['ids']
+        if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            return Response(
+                {"error": "Invalid request. 'ids' must be a list of task IDs."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = None
+    else:
+        task_filter = data['filter']
+        if not isinstance(task_filter, dict):
+            return Response(
+                {"error": "Invalid request. 'filter' must be an object."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            queryset = Task.objects.active().filter(workspace_id=workspace_id, **parse_task_filter(task_filter))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    with phase('db'):
+        if queryset is None:
+            # One IN (...) per ID_CHUNK_SIZE IDs; the chunks are ascending, so rows stay in ID order
+            rows = [
+                row for chunk in chunked(sorted(set(ids)))
+                for row in Task.objects.filter(workspace_id=workspace_id, id__in=chunk)
+                .order_by('id').values_list(*STORED_TASK_FIELDS)
+            ]
+        else:
+            rows = list(queryset.order_by('id').values_list(*STORED_TASK_FIELDS))
+    
+    with phase('score'):
+        scores = calculate_scores_batch(
+            [row[2].toordinal() for row in rows],
+            [row[3] for row in rows],
+            [row[4] for row in rows],
+            [len(row[5]) if isinstance(row[5], list) else 0 for row in rows],
+        )
+        scored_tasks = [
+            dict(zip(STORED_TASK_FIELDS, row), score=score)
+            for row, score in zip(rows, scores)
+        ]
+    
+    with phase('sort'):
+        sorted_tasks = sorted(scored_tasks, key=lambda x: x['score'], reverse=True)
+    
+    response = {
+        "count": len(sorted_tasks),
+        "tasks": sorted_tasks
+    }
+    if 'ids' in data:
+        found = {task['id'] for task in sorted_tasks}
+        response["missing_ids"] = [i for i in data['ids'] if i not in found]
+    return Response(response, status=status.HTTP_200_OK)
+
+
+def _analyze_columns(request, columns):
+    """
+    Scores a columnar binary payload (see tasks.binary) with the batch scorer.
+    
+    Answers in the same binary format when the client accepts it, otherwise
+    with the usual JSON response.
+    """
+    if not len(columns):
+        return Response(
+            {"error": "Tasks list is empty. Please provide at least one task."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    with phase('score'):
+        scores = calculate_scores_batch(
+            columns.due_ordinals, columns.importances, columns.estimated_hours, columns.dependency_counts()
+        )
+    with phase('sort'):
+        ranks = rank(scores)
+    
+    if isinstance(request.accepted_renderer, ColumnarRenderer):
+        return Response(ScoredColumns(columns.ids, scores, ranks), status=status.HTTP_200_OK)
+    
+    with phase('render'):
+        order = sorted(range(len(scores)), key=ranks.__getitem__)
+        sorted_tasks = [
+            {
+                'id': columns.ids[i],
+                'title': columns.title(i),
+                'due_date': date.fromordinal(columns.due_ordinals[i]),
+                'importance': columns.importances[i],
+                'estimated_hours': columns.estimated_hours[i],
+                'dependencies': columns.dependencies(i),
+                'score': scores[i],
+            }
+            for i in order
+        ]
+    return Response({
+        "count": len(sorted_tasks),
+        "tasks": sorted_tasks
+    }, status=status.HTTP_200_OK)
+
+
+def _prepare_tasks(tasks_data):
+    """
+    Normalizes posted tasks in place for scoring: default title, parsed
+    due_date and default importance/estimated_hours/dependencies.
+    
+    Returns:
+        str | None: An error message naming the first bad task, or None
+    """
+    for idx, task in enumerate(tasks_data):
+        try:
+            # Validate required fields
+            if not task.get('title'):
+                task['title'] = f'Untitled Task {idx + 1}'
+            
+            # Convert due_date string to date object if needed
+            if isinstance(task.get('due_date'), str):
+                task['due_date'] = date.fromisoformat(task['due_date'])
+            
+            # Apply defaults for missing fields
+            if 'importance' not in task:
+                task['importance'] = 5
+            if 'estimated_hours' not in task:
+                task['estimated_hours'] = 1
+            if 'dependencies' not in task:
+                task['dependencies'] = []
+        
+        except ValueError as e:
+            # Handle invalid date format
+            return f"Task {idx + 1}: Invalid date format. Use YYYY-MM-DD format. Details: {str(e)}"
+        except Exception as e:
+            # Handle other parsing errors
+            return f"Task {idx + 1}: Error processing task. Details: {str(e)}"
+    return None
+
+
+def _number_or(value, default):
+    # Same normalization calculate_task_score applies to importance and hours
+    return value if isinstance(value, (int, float)) else default
+
+
+def _analyze_batches(batches):
+    """
+    Scores many independent task lists in one pass (batch mode of /analyze/).
+    
+    Every valid task from every batch goes into one set of columns tagged with
+    its batch's segment ID, is scored by a single calculate_scores_batch()
+    call and sorted once by (segment, score); the sorted run is then split
+    back into batches. A bad batch gets an entry in "errors" and doesn't stop
+    the others.
+    """
+    if not isinstance(batches, dict) or not batches:
+        return Response(
+            {"error": "Invalid request. 'batches' must be a non-empty object of task lists."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    errors = {}
+    names = []
+    flat_tasks = []
+    segments = []
+    with phase('validate'):
+        for name, tasks_data in batches.items():
+            if not isinstance(tasks_data, list):
+                errors[name] = "Batch must be a list of tasks."
+                continue
+            if not tasks_data:
+                errors[name] = "Tasks list is empty. Please provide at least one task."
+                continue
+            error = _prepare_tasks(tasks_data)
+            if error is None:
+                for idx, task in enumerate(tasks_data):
+                    if task.get('due_date') is not None and not isinstance(task['due_date'], date):
+                        error = f"Task {idx + 1}: Invalid date format. Use YYYY-MM-DD format."
+                        break
+            if error:
+                errors[name] = error
+                continue
+            segment = len(names)
+            names.append(name)
+            flat_tasks.extend(tasks_data)
+            segments.extend([segment] * len(tasks_data))
+    
+    with phase('score'):
+        scores = calculate_scores_batch(
+            [task['due_date'].toordinal() if task.get('due_date') is not None else None for task in flat_tasks],
+            [_number_or(task['importance'], 5) for task in flat_tasks],
+            [_number_or(task['estimated_hours'], 1) for task in flat_tasks],
+            [len(task['dependencies']) if isinstance(task['dependencies'], list) else 0 for task in flat_tasks],
+        )
+        for task, score in zip(flat_tasks, scores):
+            task['score'] = score
+    
+    with phase('sort'):
+        # Stable sort: equal scores keep request order, as in single-list mode
+        order = sorted(range(len(flat_tasks)), key=lambda i: (segments[i], -scores[i]))
+        results = {name: {"count": 0, "tasks": []} for name in names}
+        for i in order:
+            results[names[segments[i]]]["tasks"].append(flat_tasks[i])
+        for result in results.values():
+            result["count"] = len(result["tasks"])
+    
+    return Response({
+        "count": len(flat_tasks),
+        "batches": results,
+        "errors": errors
+    }, status=status.HTTP_200_OK if results else status.HTTP_400_BAD_REQUEST)
 
 
 @api_view(['POST'])
-def analyze(request):
+@parser_classes(api_settings.DEFAULT_PARSER_CLASSES + [ColumnarParser])
+@renderer_classes(api_settings.DEFAULT_RENDERER_CLASSES + [ColumnarRenderer])
+@workspace_scoped
+def analyze(request, workspace_id):
     """
     Endpoint: /analyze/
     
@@ -38,6 +300,32 @@ def analyze(request):
         ]
     }
     
+    Stored mode: instead of "tasks", send either
+        {"ids": [1, 2, 3]}
+    or
+        {"filter": {"due_from": "2025-12-01", "due_to": "2025-12-31", "min_importance": 7}}
+    to score tasks already in the database (the filter only matches open tasks).
+    The response has the same shape; "missing_ids" lists requested IDs that
+    were not found. Any number of IDs is accepted: they are looked up
+    ID_CHUNK_SIZE at a time, under SQLite's bound-parameter limit.
+    
+    Batch mode: score many independent lists in one call with
+        {"batches": {"project-a": [...tasks...], "project-b": [...]}}
+    The response has {"count", "batches": {name: {"count", "tasks"}}, "errors":
+    {name: message}}; a bad batch is reported in "errors" without failing the
+    others (400 only when every batch fails).
+    
+    Dedupe: add "dedupe": "flag" to mark tasks that duplicate a stored task
+    or an earlier task in the list with "duplicate_of": {"id" | "index",
+    "similarity"}, or "dedupe": "merge" to also drop in-list duplicates and
+    give stored duplicates the stored task's "id". The response then has a
+    "duplicates" report; "near_duplicates": true and "similarity_threshold"
+    work as in /save-analysis/.
+    
+    Binary mode: send Content-Type application/vnd.task-analyzer.columns (packed
+    columns, see tasks.binary) and/or Accept the same type to get scores and
+    ranks back as packed columns.
+    
     Edge cases handled:
     - Missing importance: defaults to 5
     - Missing estimated_hours: defaults to 1
@@ -46,64 +334,13 @@ def analyze(request):
     - Non-array tasks: returns 400 error
     """
     try:
-        tasks_data = request.data.get('tasks', [])
-        
-        if not isinstance(tasks_data, list):
-            return Response(
-                {"error": "Invalid request. 'tasks' must be a list."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        with phase('parse'):
+            data = request.data
         
-        if len(tasks_data) == 0:
-            return Response(
-                {"error": "Tasks list is empty. Please provide at least one task."},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        if isinstance(data, TaskColumns):
+            return _analyze_columns(request, data)
         
-        # Score each task
-        scored_tasks = []
-        for idx, task in enumerate(tasks_data):
-            try:
-                # Validate required fields
-                if not task.get('title'):
-                    task['title'] = f'Untitled Task {idx + 1}'
-                
-                # Convert due_date string to date object if needed
-                if isinstance(task.get('due_date'), str):
-                    task['due_date'] = date.fromisoformat(task['due_date'])
-                
-                # Apply defaults for missing fields
-                if 'importance' not in task:
-                    task['importance'] = 5
-                if 'estimated_hours' not in task:
-                    task['estimated_hours'] = 1
-                if 'dependencies' not in task:
-                    task['dependencies'] = []
-                
-                score = calculate_task_score(task)
-                task['score'] = score
-                scored_tasks.append(task)
-            
-            except ValueError as e:
-                # Handle invalid date format
-                return Response(
-                    {"error": f"Task {idx + 1}: Invalid date format. Use YYYY-MM-DD format. Details: {str(e)}"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            except Exception as e:
-                # Handle other parsing errors
-                return Response(
-                    {"error": f"Task {idx + 1}: Error processing task. Details: {str(e)}"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        
-        # Sort by score (highest first)
-        sorted_tasks = sorted(scored_tasks, key=lambda x: x.get('score', 0), reverse=True)
-        
-        return Response({
-            "count": len(sorted_tasks),
-            "tasks": sorted_tasks
-        }, status=status.HTTP_200_OK)
+        return _analyze_data(data, workspace_id, columnar=isinstance(request.accepted_renderer, ColumnarRenderer))
     
     except Exception as e:
         return Response(
@@ -112,8 +349,139 @@ def analyze(request):
         )
 
 
+def _dedupe_options(data, default):
+    """
+    Reads the dedupe options of an /analyze/ or /save-analysis/ body.
+    
+    Returns:
+        tuple: (action, near, threshold)
+    
+    Raises:
+        ValueError: On an unknown action or a threshold outside (0, 1]
+    """
+    action = data.get('dedupe', default)
+    if action not in DEDUPE_ACTIONS:
+        raise ValueError(f"'dedupe' must be one of {', '.join(DEDUPE_ACTIONS)}.")
+    threshold = data.get('similarity_threshold')
+    if threshold is not None and (isinstance(threshold, bool) or not isinstance(threshold, (int, float))
+                                  or not 0 < threshold <= 1):
+        raise ValueError("'similarity_threshold' must be a number between 0 and 1.")
+    return action, bool(data.get('near_duplicates')), threshold
+
+
+def _duplicate_entries(matches, indexes=None):
+    """Turns find_duplicates() results into report entries keyed by request index."""
+    entries = []
+    for position, match in enumerate(matches):
+        if match is None:
+            continue
+        idx = indexes[position] if indexes is not None else position
+        if 'id' in match:
+            entries.append({"task_index": idx, "duplicate_of_id": match['id'], "similarity": match['similarity']})
+        else:
+            original = indexes[match['index']] if indexes is not None else match['index']
+            entries.append({"task_index": idx, "duplicate_of_index": original, "similarity": match['similarity']})
+    return entries
+
+
+def _analyze_data(data, workspace_id, columnar=False):
+    """
+    Scores a JSON /analyze/ body: batch mode, stored mode or a task list.
+    Stored mode and dedupe only see the tasks of `workspace_id`.
+    
+    With columnar=True a task list is answered with ScoredColumns instead of
+    the sorted JSON list (and dedupe options are ignored).
+    """
+    if 'batches' in data and 'tasks' not in data:
+        return _analyze_batches(data['batches'])
+    
+    if 'tasks' not in data and ('ids' in data or 'filter' in data):
+        return _analyze_stored(data, workspace_id)
+    
+    tasks_data = data.get('tasks', [])
+    
+    if not isinstance(tasks_data, list):
+        return Response(
+            {"error": "Invalid request. 'tasks' must be a list."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if len(tasks_data) == 0:
+        return Response(
+            {"error": "Tasks list is empty. Please provide at least one task."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Validate each task
+    with phase('validate'):
+        error = _prepare_tasks(tasks_data)
+        try:
+            action, near, threshold = _dedupe_options(data, 'off')
+        except ValueError as e:
+            error = str(e)
+    if error:
+        return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+    
+    duplicates = None
+    if action != 'off' and not columnar:
+        with phase('db'):
+            matches = find_duplicates(
+                [(task.get('title'), task['due_date'] if isinstance(task.get('due_date'), date) else None)
+                 for task in tasks_data],
+                near=near, threshold=threshold, workspace_id=workspace_id,
+            )
+        duplicates = _duplicate_entries(matches)
+        for entry in duplicates:
+            task = tasks_data[entry['task_index']]
+            if 'duplicate_of_id' in entry:
+                task['duplicate_of'] = {"id": entry['duplicate_of_id'], "similarity": entry['similarity']}
+                if action == 'merge':
+                    # The task already exists: answer with the stored task's ID
+                    task['id'] = entry['duplicate_of_id']
+            else:
+                task['duplicate_of'] = {"index": entry['duplicate_of_index'], "similarity": entry['similarity']}
+        if action == 'merge':
+            dropped = {entry['task_index'] for entry in duplicates if 'duplicate_of_index' in entry}
+            tasks_data = [task for i, task in enumerate(tasks_data) if i not in dropped]
+    
+    # Score each task
+    with phase('score'):
+        for task in tasks_data:
+            task['score'] = calculate_task_score(task)
+    
+    if columnar:
+        scores = [task['score'] for task in tasks_data]
+        ids = [task['id'] if isinstance(task.get('id'), int) else 0 for task in tasks_data]
+        return Response(ScoredColumns(ids, scores, rank(scores)), status=status.HTTP_200_OK)
+    
+    # Sort by score (highest first)
+    with phase('sort'):
+        sorted_tasks = sorted(tasks_data, key=lambda x: x.get('score', 0), reverse=True)
+    
+    response = {
+        "count": len(sorted_tasks),
+        "tasks": sorted_tasks
+    }
+    if duplicates is not None:
+        response["duplicates"] = duplicates
+    return Response(response, status=status.HTTP_200_OK)
+
+
+def _save_task(data, workspace_id):
+    """Validates and saves one task in the workspace; 201 with the task, or 400 with the errors."""
+    serializer = TaskSerializer(data=data)
+    with phase('validate'):
+        valid = serializer.is_valid()
+    if valid:
+        with phase('db'):
+            serializer.save(workspace_id=workspace_id)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(['POST'])
-def save_task(request):
+@workspace_scoped
+def save_task(request, workspace_id):
     """
     Endpoint: /save/
     
@@ -129,11 +497,9 @@ def save_task(request):
     }
     """
     try:
-        serializer = TaskSerializer(data=request.data)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        with phase('parse'):
+            data = request.data
+        return _save_task(data, workspace_id)
     except Exception as e:
         return Response(
             {"error": f"Failed to save task: {str(e)}"},
@@ -141,8 +507,79 @@ def save_task(request):
         )
 
 
+def _save_tasks(tasks_data, workspace_id, options=None):
+    """
+    Validates a list of tasks and inserts the valid ones into the workspace
+    with one bulk_create.
+    
+    `options` may hold the dedupe settings (see _dedupe_options); by default
+    tasks that duplicate a stored task or an earlier task in the list are
+    saved and reported (TASKS_DEDUPE_ON_SAVE = "flag").
+    
+    Returns 200 with per-task errors if at least one task was saved or
+    skipped as a duplicate, else 400.
+    """
+    if not isinstance(tasks_data, list):
+        return Response(
+            {"error": "'tasks' must be a list"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        action, near, threshold = _dedupe_options(options or {}, getattr(settings, 'TASKS_DEDUPE_ON_SAVE', 'flag'))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    new_tasks = []
+    indexes = []
+    errors = []
+    
+    for idx, task_data in enumerate(tasks_data):
+        try:
+            # Remove score field if present (not a model field)
+            if 'score' in task_data:
+                del task_data['score']
+            
+            serializer = TaskSerializer(data=task_data)
+            with phase('validate'):
+                valid = serializer.is_valid()
+            if valid:
+                new_tasks.append(Task(**serializer.validated_data, workspace_id=workspace_id))
+                indexes.append(idx)
+            else:
+                errors.append({"task_index": idx, "errors": serializer.errors})
+        except Exception as e:
+            errors.append({"task_index": idx, "error": str(e)})
+    
+    duplicates = []
+    if action != 'off' and new_tasks:
+        with phase('db'):
+            matches = find_duplicates([(task.title, task.due_date) for task in new_tasks],
+                                      near=near, threshold=threshold, workspace_id=workspace_id)
+        duplicates = _duplicate_entries(matches, indexes)
+        if action == 'merge':
+            new_tasks = [task for task, match in zip(new_tasks, matches) if match is None]
+    
+    # Insert all valid tasks at once instead of one query per task
+    with phase('db'):
+        Task.objects.bulk_create(new_tasks)
+    if new_tasks:
+        tasks_changed(workspace_id)
+    saved_tasks = TaskSerializer(new_tasks, many=True).data
+    skipped = len(duplicates) if action == 'merge' else 0
+    
+    return Response({
+        "saved": len(saved_tasks),
+        "failed": len(errors),
+        "skipped": skipped,
+        "saved_tasks": saved_tasks,
+        "errors": errors if errors else None,
+        "duplicates": duplicates if duplicates else None
+    }, status=status.HTTP_200_OK if saved_tasks or skipped else status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(['POST'])
-def save_tasks_from_analysis(request):
+@workspace_scoped
+def save_tasks_from_analysis(request, workspace_id):
     """
     Endpoint: /save-analysis/
     
@@ -161,40 +598,17 @@ def save_tasks_from_analysis(request):
             ...
         ]
     }
+    
+    Duplicates (same due date and normalized title as a stored task or an
+    earlier task in the list) are saved and listed in "duplicates". Pass
+    "dedupe": "merge" to skip them instead (counted in "skipped"), or "off";
+    "near_duplicates": true also matches similar titles (trigram Jaccard at
+    least "similarity_threshold", default TASKS_DEDUPE_THRESHOLD).
     """
     try:
-        tasks_data = request.data.get('tasks', [])
-        
-        if not isinstance(tasks_data, list):
-            return Response(
-                {"error": "'tasks' must be a list"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        saved_tasks = []
-        errors = []
-        
-        for idx, task_data in enumerate(tasks_data):
-            try:
-                # Remove score field if present (not a model field)
-                if 'score' in task_data:
-                    del task_data['score']
-                
-                serializer = TaskSerializer(data=task_data)
-                if serializer.is_valid():
-                    saved_task = serializer.save()
-                    saved_tasks.append(serializer.data)
-                else:
-                    errors.append({"task_index": idx, "errors": serializer.errors})
-            except Exception as e:
-                errors.append({"task_index": idx, "error": str(e)})
-        
-        return Response({
-            "saved": len(saved_tasks),
-            "failed": len(errors),
-            "saved_tasks": saved_tasks,
-            "errors": errors if errors else None
-        }, status=status.HTTP_200_OK if saved_tasks else status.HTTP_400_BAD_REQUEST)
+        with phase('parse'):
+            tasks_data = request.data.get('tasks', [])
+        return _save_tasks(tasks_data, workspace_id, request.data)
     
     except Exception as e:
         return Response(
@@ -203,107 +617,671 @@ def save_tasks_from_analysis(request):
         )
 
 
+def _delete_task(task_id, workspace_id):
+    with phase('db'):
+        result = delete_tasks([task_id], workspace_id)
+    if not result['deleted_ids']:
+        return Response(
+            {"error": f"Task {task_id} not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return Response(
+        {
+            "message": f"Task {task_id} deleted successfully",
+            "references_repaired": result['references_repaired']
+        },
+        status=status.HTTP_200_OK
+    )
+
+
 @api_view(['DELETE'])
-def delete_task(request, task_id):
+@workspace_scoped
+def delete_task(request, task_id, workspace_id):
     """
     Endpoint: /delete/<task_id>/
     
-    Deletes a task from the database.
+    Deletes a task from the database and removes its ID from the
+    dependencies of any task that referenced it.
     """
     try:
-        task = Task.objects.get(id=task_id)
-        task.delete()
+        return _delete_task(task_id, workspace_id)
+    except Exception as e:
         return Response(
-            {"message": f"Task {task_id} deleted successfully"},
-            status=status.HTTP_200_OK
+            {"error": f"Failed to delete task: {str(e)}"},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
-    except Task.DoesNotExist:
+
+
+def _delete_tasks(ids, workspace_id):
+    limit = getattr(settings, 'TASKS_BULK_DELETE_MAX_IDS', 10000)
+    if not isinstance(ids, list) or not ids or \
+            not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
         return Response(
-            {"error": f"Task {task_id} not found"},
-            status=status.HTTP_404_NOT_FOUND
+            {"error": "Invalid request. 'ids' must be a non-empty list of task IDs."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(ids) > limit:
+        return Response(
+            {"error": f"Too many IDs: {len(ids)} (at most {limit})."},
+            status=status.HTTP_400_BAD_REQUEST
         )
+    with phase('db'):
+        result = delete_tasks(ids, workspace_id)
+    deleted = set(result['deleted_ids'])
+    return Response({
+        "deleted": len(deleted),
+        "deleted_ids": result['deleted_ids'],
+        "missing_ids": [i for i in dict.fromkeys(ids) if i not in deleted],
+        "tasks_repaired": result['tasks_repaired'],
+        "references_repaired": result['references_repaired']
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@workspace_scoped
+def bulk_delete(request, workspace_id):
+    """
+    Endpoint: /bulk-delete/
+    
+    Deletes many tasks in one transaction and strips their IDs from the
+    dependencies of the tasks that referenced them, so dangling IDs don't keep
+    costing those tasks the per-dependency score penalty.
+    
+    Expected request body:
+    {
+        "ids": [4, 8, 15]
+    }
+    
+    Response:
+    {
+        "deleted": 2,
+        "deleted_ids": [4, 8],
+        "missing_ids": [15],
+        "tasks_repaired": 3,
+        "references_repaired": 4
+    }
+    
+    Referencing tasks are found through the TaskDependency reverse index, not
+    by scanning every task's JSON. At most TASKS_BULK_DELETE_MAX_IDS IDs
+    (default 10000) per request.
+    """
+    try:
+        with phase('parse'):
+            ids = request.data.get('ids')
+        return _delete_tasks(ids, workspace_id)
     except Exception as e:
         return Response(
-            {"error": f"Failed to delete task: {str(e)}"},
+            {"error": f"Failed to delete tasks: {str(e)}"},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
 
-@api_view(['GET'])
-def suggest(request):
+def _complete_task(task_id, workspace_id):
+    with phase('db'):
+        updated = Task.objects.filter(workspace_id=workspace_id, id=task_id).update(completed=True)
+    if not updated:
+        return Response(
+            {"error": f"Task {task_id} not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    tasks_changed(workspace_id)
+    return Response(
+        {"message": f"Task {task_id} marked as completed"},
+        status=status.HTTP_200_OK
+    )
+
+
+@api_view(['POST'])
+@workspace_scoped
+def complete_task(request, task_id, workspace_id):
     """
-    Endpoint: /suggest/
+    Endpoint: /complete/<task_id>/
     
-    Returns the top 3 tasks for "today" with a text explanation.
-    Fetches all tasks from the database, scores them, and returns the top 3
-    with reasoning for why they are recommended.
+    Marks a task as completed. Completed tasks drop out of suggestions and are
+    moved to the archive by `manage.py archive_tasks`.
     """
-    try:
-        # Get all tasks from the database
-        all_tasks = Task.objects.all()
-        
-        # Convert to dict format for scoring
-        tasks_data = []
-        for task in all_tasks:
-            task_dict = {
-                'id': task.id,
-                'title': task.title,
-                'due_date': task.due_date,
-                'importance': task.importance,
-                'estimated_hours': task.estimated_hours,
-                'dependencies': task.dependencies
-            }
-            score = calculate_task_score(task_dict)
-            tasks_data.append({
-                'task': task_dict,
-                'score': score
-            })
+    return _complete_task(task_id, workspace_id)
+
+
+def _suggestions(source, today):
+    """
+    Builds the /suggest/ body from the top 3 tasks of `source`, an up-to-date
+    TaskSnapshot.
+    """
+    with phase('score'):
+        sorted_tasks = source.top(3, today=today)
+    
+    # Build response with explanations
+    suggestions = []
+    
+    for task in sorted_tasks:
+        score = task['score']
         
-        # Sort by score (highest first) and get top 3
-        sorted_tasks = sorted(tasks_data, key=lambda x: x['score'], reverse=True)[:3]
+        # Generate explanation
+        explanation = ""
+        days_until_due = (task['due_date'] - today).days
         
-        # Build response with explanations
-        suggestions = []
-        today = date.today()
+        if days_until_due < 0:
+            explanation = f"OVERDUE by {abs(days_until_due)} days! This task needs immediate attention."
+        elif days_until_due == 0:
+            explanation = "Due TODAY! This is your most urgent task."
+        elif days_until_due <= 3:
+            explanation = f"Due in {days_until_due} day(s). High urgency."
+        else:
+            explanation = f"Due in {days_until_due} days. Important with high priority score."
         
-        for item in sorted_tasks:
-            task = item['task']
-            score = item['score']
-            
-            # Generate explanation
-            explanation = ""
-            days_until_due = (task['due_date'] - today).days
-            
-            if days_until_due < 0:
-                explanation = f"OVERDUE by {abs(days_until_due)} days! This task needs immediate attention."
-            elif days_until_due == 0:
-                explanation = "Due TODAY! This is your most urgent task."
-            elif days_until_due <= 3:
-                explanation = f"Due in {days_until_due} day(s). High urgency."
-            else:
-                explanation = f"Due in {days_until_due} days. Important with high priority score."
-            
-            if task['estimated_hours'] < 2:
-                explanation += " Quick win - can be completed in under 2 hours."
-            
-            suggestions.append({
-                'id': task['id'],
-                'title': task['title'],
-                'due_date': str(task['due_date']),
-                'importance': task['importance'],
-                'estimated_hours': task['estimated_hours'],
-                'priority_score': score,
-                'explanation': explanation
-            })
+        if task['estimated_hours'] < 2:
+            explanation += " Quick win - can be completed in under 2 hours."
         
-        return Response({
-            "count": len(suggestions),
-            "today": str(today),
-            "top_tasks": suggestions
-        }, status=status.HTTP_200_OK)
+        suggestions.append({
+            'id': task['id'],
+            'title': task['title'],
+            'due_date': str(task['due_date']),
+            'importance': task['importance'],
+            'estimated_hours': task['estimated_hours'],
+            'priority_score': score,
+            'explanation': explanation
+        })
+    
+    return {
+        "count": len(suggestions),
+        "today": str(today),
+        "top_tasks": suggestions
+    }
+
+
+@api_view(['GET'])
+@workspace_scoped
+def suggest(request, workspace_id):
+    """
+    Endpoint: /suggest/
+    
+    Returns the top 3 tasks for "today" with a text explanation.
+    Scores all open tasks from the workspace's per-worker snapshot and returns
+    the top 3 with reasoning for why they are recommended.
+    """
+    try:
+        # Score the in-memory snapshot of open tasks (no SQL unless the workspace changed)
+        with phase('db'):
+            snapshot = snapshots.get(workspace_id).refresh()
+        return Response(_suggestions(snapshot, date.today()), status=status.HTTP_200_OK)
     
     except Exception as e:
         return Response(
             {"error": str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+BATCH_OPERATIONS = ('save', 'delete', 'complete', 'analyze', 'list', 'suggest')
+BATCH_WRITES = ('save', 'delete', 'complete')
+
+
+class _BatchAborted(Exception):
+    pass
+
+
+def _task_id(operation):
+    task_id = operation.get('id')
+    if not isinstance(task_id, int) or isinstance(task_id, bool):
+        return None
+    return task_id
+
+
+def _run_operation(operation, source, workspace_id):
+    """Runs one /batch/ operation in the workspace and returns its Response."""
+    op = operation['op']
+    if op == 'save':
+        if 'tasks' in operation:
+            return _save_tasks(operation['tasks'], workspace_id, operation)
+        return _save_task(operation.get('task'), workspace_id)
+    if op == 'delete' and 'ids' in operation:
+        return _delete_tasks(operation['ids'], workspace_id)
+    if op in ('delete', 'complete'):
+        task_id = _task_id(operation)
+        if task_id is None:
+            return Response(
+                {"error": f"'{op}' needs an integer 'id'."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return _delete_task(task_id, workspace_id) if op == 'delete' else _complete_task(task_id, workspace_id)
+    if op == 'analyze':
+        return _analyze_data(operation, workspace_id)
+    if op == 'list':
+        return _task_list(workspace_id, bool(operation.get('include_archived')))
+    return Response(_suggestions(source(), date.today()), status=status.HTTP_200_OK)
+
+
+@api_view(['POST'])
+@workspace_scoped
+def batch(request, workspace_id):
+    """
+    Endpoint: /batch/
+    
+    Runs an ordered list of operations in one request and one transaction, so
+    a client can save, delete or complete tasks and read the resulting list or
+    suggestions without a round trip per step.
+    
+    Expected request body:
+    {
+        "operations": [
+            {"op": "save", "task": {...}},          // or "tasks": [...] like /save-analysis/
+            {"op": "delete", "id": 3},              // or "ids": [...] like /bulk-delete/
+            {"op": "complete", "id": 4},
+            {"op": "analyze", "tasks": [...]},      // or "ids" / "filter" / "batches"
+            {"op": "list", "include_archived": false},
+            {"op": "suggest"}
+        ],
+        "atomic": true
+    }
+    
+    Operations run in order and each one sees the writes before it, so a
+    trailing "list" or "suggest" reflects the final state. The response has
+    {"atomic", "committed", "results"}, with one {"op", "status", "body"} per
+    operation; "body" is what the matching single endpoint would return.
+    
+    - atomic (default true): the first operation that fails rolls back every
+      write in the batch; the remaining operations are reported with
+      "status": null and "skipped": true, and the response is 400.
+    - atomic false: each operation runs in its own savepoint, so a failure only
+      undoes that operation and the rest carry on.
+    
+    At most TASKS_BATCH_MAX_OPERATIONS operations (default 100) per request.
+    """
+    with phase('parse'):
+        data = request.data
+    operations = data.get('operations') if isinstance(data, dict) else None
+    atomic = data.get('atomic', True) if isinstance(data, dict) else True
+    
+    with phase('validate'):
+        limit = getattr(settings, 'TASKS_BATCH_MAX_OPERATIONS', 100)
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {"error": "Invalid request. 'operations' must be a non-empty list."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(operations) > limit:
+            return Response(
+                {"error": f"Too many operations: {len(operations)} (at most {limit})."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not isinstance(atomic, bool):
+            return Response(
+                {"error": "Invalid request. 'atomic' must be true or false."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        for idx, operation in enumerate(operations):
+            if not isinstance(operation, dict) or operation.get('op') not in BATCH_OPERATIONS:
+                return Response(
+                    {"error": f"Operation {idx + 1}: 'op' must be one of {', '.join(BATCH_OPERATIONS)}."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+    
+    results = []
+    wrote = False
+    
+    def source():
+        # Once this batch has written, score its own view of the table: the
+        # shared snapshot must never hold rows that may still be rolled back
+        if not wrote:
+            return snapshots.get(workspace_id).refresh()
+        private = TaskSnapshot(workspace_id)
+        private.load(None)
+        return private
+    
+    try:
+        with transaction.atomic():
+            for operation in operations:
+                try:
+                    with transaction.atomic():
+                        response = _run_operation(operation, source, workspace_id)
+                        if response.status_code >= 400:
+                            transaction.set_rollback(True)
+                except Exception as e:
+                    response = Response(
+                        {"error": f"Server error: {str(e)}"},
+                        status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                    )
+                results.append({"op": operation['op'], "status": response.status_code, "body": response.data})
+                if response.status_code >= 400:
+                    if atomic:
+                        raise _BatchAborted
+                elif operation['op'] in BATCH_WRITES:
+                    wrote = True
+    except _BatchAborted:
+        # Rolled-back writes may already have invalidated readers; make them reload again
+        if wrote:
+            tasks_changed(workspace_id)
+        results.extend(
+            {"op": operation['op'], "status": None, "skipped": True}
+            for operation in operations[len(results):]
+        )
+        return Response({
+            "atomic": atomic,
+            "committed": False,
+            "results": results
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        "atomic": atomic,
+        "committed": True,
+        "results": results
+    }, status=status.HTTP_200_OK)
+
+
+def _bounded_number(params, name, default, cast, low, high):
+    """Reads a numeric query parameter, raising ValueError outside [low, high]."""
+    value = params.get(name)
+    if value in (None, ''):
+        return default if default is None else cast(default)
+    try:
+        value = cast(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be a number.")
+    if not low <= value <= high:
+        raise ValueError(f"'{name}' must be between {low} and {high}.")
+    return value
+
+
+@api_view(['GET'])
+@workspace_scoped
+def plan(request, workspace_id):
+    """
+    Endpoint: /plan/
+    
+    Schedules open tasks into days of limited capacity, respecting
+    dependencies: a task is only planned once everything it depends on is
+    planned (earlier, or earlier the same day). Each day is filled with the
+    highest-scoring tasks that still fit.
+    
+    Query parameters:
+        - capacity: hours of work per day (default 8)
+        - days: planning horizon in days, starting today (default 7)
+        - limit: maximum unscheduled tasks listed (default 100)
+    
+    Unscheduled tasks carry a reason: dependency_cycle, exceeds_capacity,
+    blocked (depends on a cyclic or oversized task) or beyond_horizon.
+    Results are cached until a task in the workspace changes.
+    """
+    try:
+        capacity = _bounded_number(request.query_params, 'capacity', 8, float, 0.5, 24)
+        days = _bounded_number(request.query_params, 'days', 7, int, 1, 365)
+        limit = _bounded_number(request.query_params, 'limit', 100, int, 0, 100000)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if capacity.is_integer():
+        capacity = int(capacity)
+    
+    today = date.today()
+    with phase('score'):
+        result = plan_tasks(capacity, days, today=today, workspace_id=workspace_id)
+    
+    with phase('render'):
+        unscheduled = result['unscheduled']
+        reasons = {}
+        for _, reason in unscheduled:
+            reasons[reason] = reasons.get(reason, 0) + 1
+        return Response({
+            "today": str(today),
+            "capacity_hours": capacity,
+            "horizon_days": days,
+            "scheduled_count": sum(len(day['tasks']) for day in result['days']),
+            "days": result['days'],
+            "unscheduled_count": len(unscheduled),
+            "unscheduled_by_reason": reasons,
+            "unscheduled": [{"id": task_id, "reason": reason} for task_id, reason in unscheduled[:limit]],
+        }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@workspace_scoped
+def search(request, workspace_id):
+    """
+    Endpoint: /search/
+    
+    Full-text search over task titles, best match first.
+    
+    Query parameters:
+        - q: search words; every word must appear in the title (required)
+        - prefix: let the last word match as a prefix, for autocomplete
+          (default 1; pass 0 for whole words only)
+        - limit: maximum results (default 20, at most 100)
+        - due_from, due_to, min_importance: same filters as /analyze/
+        - include_completed: also search completed tasks (default: open only)
+        - scores: add each task's priority score
+    
+    Response:
+    {
+        "query": "fix log",
+        "ranked": true,
+        "count": 2,
+        "tasks": [{"id", "title", "due_date", ..., "relevance": 4.36, "score": 120}, ...]
+    }
+    
+    Backed by the SQLite FTS5 index tasks_task_fts and ranked with bm25
+    ("relevance", higher is better). Without FTS5 it falls back to LIKE
+    matching with "ranked": false and "relevance": null.
+    """
+    params = request.query_params
+    terms = search_terms(params.get('q'))
+    if not terms:
+        return Response(
+            {"error": "'q' must contain at least one word."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        limit = _bounded_number(params, 'limit', 20, int, 1, 100)
+        lookups = parse_task_filter(params)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    prefix = params.get('prefix', '1').lower() not in ('0', 'false', 'no', 'off')
+    
+    queryset = Task.objects.all() if _query_flag(request, 'include_completed') else Task.objects.active()
+    with phase('db'):
+        matches = search_tasks(terms, queryset.filter(workspace_id=workspace_id, **lookups), prefix=prefix,
+                               limit=limit)
+    
+    tasks = [dict(zip(SEARCH_FIELDS, row), relevance=relevance) for row, relevance in matches]
+    if _query_flag(request, 'scores'):
+        with phase('score'):
+            scores = calculate_scores_batch(
+                [task['due_date'].toordinal() for task in tasks],
+                [task['importance'] for task in tasks],
+                [task['estimated_hours'] for task in tasks],
+                [len(task['dependencies']) if isinstance(task['dependencies'], list) else 0 for task in tasks],
+            )
+            for task, score in zip(tasks, scores):
+                task['score'] = score
+    
+    return Response({
+        "query": ' '.join(terms),
+        "ranked": fts_available(),
+        "count": len(tasks),
+        "tasks": tasks
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@workspace_scoped
+def duplicates(request, workspace_id):
+    """
+    Endpoint: /duplicates/
+    
+    Reports groups of stored tasks that duplicate each other: same due date
+    and same normalized title, or with ?near=1 titles whose trigram Jaccard
+    similarity is at least ?threshold= (default TASKS_DEDUPE_THRESHOLD).
+    
+    Query parameters:
+        - near: also group near-duplicate titles
+        - threshold: similarity for near mode, between 0 and 1
+        - include_completed: also check completed tasks (default: open only)
+        - limit: maximum groups listed (default 100)
+    
+    Response:
+    {
+        "near": false,
+        "group_count": 1,
+        "duplicate_count": 2,
+        "groups": [{"due_date": "2025-12-01", "keep": 4, "tasks": [{"id": 4, "title": "..."}, ...]}]
+    }
+    
+    "keep" is the oldest task of the group; "duplicate_count" counts the
+    other tasks in every group.
+    """
+    params = request.query_params
+    try:
+        threshold = _bounded_number(params, 'threshold', None, float, 0.01, 1)
+        limit = _bounded_number(params, 'limit', 100, int, 0, 10000)
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    near = _query_flag(request, 'near')
+    
+    queryset = Task.objects.all() if _query_flag(request, 'include_completed') else Task.objects.active()
+    with phase('db'):
+        groups = duplicate_groups(queryset.filter(workspace_id=workspace_id), near=near, threshold=threshold)
+    
+    with phase('render'):
+        return Response({
+            "near": near,
+            "group_count": len(groups),
+            "duplicate_count": sum(len(group) - 1 for group in groups),
+            "groups": [
+                {
+                    "due_date": str(group[0][2]),
+                    "keep": group[0][0],
+                    "tasks": [{"id": task_id, "title": title} for task_id, title, _ in group],
+                }
+                for group in groups[:limit]
+            ],
+        }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@workspace_scoped
+def stats(request, workspace_id):
+    """
+    Endpoint: /stats/
+    
+    Dashboard totals over the workspace's open tasks, read from counters
+    that every write keeps up to date (see tasks.counters), so the cost does
+    not grow with the table.
+    
+    Response:
+    {
+        "as_of": "2025-11-30",
+        "total": 120,
+        "overdue": 4,
+        "due_3_days": 9,      // due today through 3 days from now
+        "due_7_days": 15,     // due today through 7 days from now (includes due_3_days)
+        "quick_wins": 40,     // estimated under 2 hours
+        "blocked": 12         // has dependencies
+    }
+    """
+    with phase('db'):
+        counters = dashboard_counters(workspace_id)
+    return Response(counters, status=status.HTTP_200_OK)
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv; charset=utf-8'),
+    'ndjson': (stream_ndjson, 'application/x-ndjson'),
+}
+
+
+@require_GET
+@workspace_scoped
+def export_tasks(request, workspace_id):
+    """
+    Endpoint: /export/
+    
+    Streams every task of the workspace as CSV (default) or NDJSON without
+    building the whole response in memory, so multi-million row tables export
+    in constant memory.
+    
+    Query parameters:
+        - format: csv or ndjson
+        - scores=1: add a "score" column, computed per chunk with the batch scorer
+        - include_archived=1: append archived tasks (adds "archived" and "archived_at")
+        - due_from, due_to, min_importance: same filters as /analyze/ stored mode
+    
+    This is a plain Django view: DRF reserves ?format= for its own renderer
+    negotiation.
+    """
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse(
+            {"error": f"Invalid format. Choose one of: {', '.join(EXPORT_FORMATS)}."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        lookups = {**parse_task_filter(request.GET), 'workspace_id': workspace_id}
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    include_archived = _query_flag(request, 'include_archived')
+    scores = _query_flag(request, 'scores')
+    encode, content_type = EXPORT_FORMATS[export_format]
+    columns = export_columns(include_archived=include_archived, scores=scores)
+    chunks = export_chunks(lookups, include_archived=include_archived, scores=scores)
+    
+    response = StreamingHttpResponse(encode(columns, chunks), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="tasks-{date.today()}.{export_format}"'
+    return response
+
+
+def metrics(request):
+    """
+    Endpoint: /metrics
+
+    Exposes this worker's request histograms and counters (including how often
+    calculate_task_score fell back to the neutral score of 50) in the
+    Prometheus text format.
+
+    Only served to the addresses in TASKS_METRICS_ALLOWED_IPS (default:
+    localhost); 404 while TASKS_METRICS_ENABLED is off, 403 for anyone else.
+    """
+    if not getattr(settings, 'TASKS_METRICS_ENABLED', False):
+        return HttpResponse(status=404)
+    if request.META.get('REMOTE_ADDR') not in getattr(settings, 'TASKS_METRICS_ALLOWED_IPS', ('127.0.0.1', '::1')):
+        return HttpResponse(status=403)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@api_view(['GET'])
+def list_profiles(request):
+    """
+    Endpoint: /profiles/
+    
+    Lists stored request profiles (newest first). Requires the
+    X-Profile-Token header to match TASKS_PROFILING_TOKEN.
+    """
+    if not profiling.is_authorized(request.META.get('HTTP_X_PROFILE_TOKEN')):
+        return Response(
+            {"error": "A valid X-Profile-Token header is required."},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    captures = profiling.list_captures()
+    return Response({
+        "count": len(captures),
+        "captures": captures
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+def download_profile(request, name):
+    """
+    Endpoint: /profiles/<name>/
+    
+    Downloads one stored profile (same token rules as /profiles/).
+    """
+    if not profiling.is_authorized(request.META.get('HTTP_X_PROFILE_TOKEN')):
+        return Response(
+            {"error": "A valid X-Profile-Token header is required."},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    if name not in {capture['name'] for capture in profiling.list_captures()}:
+        return Response(
+            {"error": f"Profile {name} not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    return FileResponse(open(profiling.profile_dir() / name, 'rb'), as_attachment=True, filename=name)
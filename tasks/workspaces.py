@@ -0,0 +1,63 @@
+"""
+Workspace resolution for API requests.
+
+A request names its workspace by slug, in the X-Workspace header or the
+?workspace= query parameter (the header wins); requests that name none use
+the default workspace, so single-team deployments need no changes. Slugs
+are resolved against the database on every request (one lookup on the
+unique slug index): a per-process cache would keep sending a renamed or
+deleted slug to its old workspace, and a reused slug into another tenant.
+"""
+from functools import wraps
+
+from django.http import JsonResponse
+
+from .models import DEFAULT_WORKSPACE_ID, Workspace
+
+WORKSPACE_HEADER = 'HTTP_X_WORKSPACE'
+WORKSPACE_PARAM = 'workspace'
+
+
+def workspace_id_for(slug):
+    """Returns the ID of the workspace with this slug, or None if there is none."""
+    return Workspace.objects.filter(slug=slug).values_list('id', flat=True).first()
+
+
+def command_workspace_id(slug):
+    """
+    Workspace ID for a management command's --workspace option: the default
+    workspace when no slug is given.
+
+    Raises:
+        CommandError: If no workspace has the slug
+    """
+    from django.core.management.base import CommandError
+
+    if slug is None:
+        return DEFAULT_WORKSPACE_ID
+    workspace_id = workspace_id_for(slug)
+    if workspace_id is None:
+        raise CommandError(f"Workspace '{slug}' does not exist.")
+    return workspace_id
+
+
+def requested_slug(request):
+    """The workspace slug a request names, or None."""
+    return request.META.get(WORKSPACE_HEADER) or request.GET.get(WORKSPACE_PARAM) or None
+
+
+def workspace_scoped(view):
+    """
+    Resolves the request's workspace and passes its ID to the view as
+    `workspace_id`; answers 404 for an unknown slug. Goes below @api_view, or
+    directly on a plain Django view.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        slug = requested_slug(request)
+        workspace_id = DEFAULT_WORKSPACE_ID if slug is None else workspace_id_for(slug)
+        if workspace_id is None:
+            return JsonResponse({"error": f"Workspace '{slug}' not found"}, status=404)
+        return view(request, *args, workspace_id=workspace_id, **kwargs)
+    return wrapper
+